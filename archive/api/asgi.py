@@ -0,0 +1,15 @@
+"""ASGI entry point for running under an ASGI server.
+
+Run from the archive directory::
+
+    hypercorn api.asgi:asgi_app --worker-class uvloop
+
+The handlers stay synchronous; ``WsgiToAsgi`` runs each one on a worker
+thread, so request concurrency comes from the server's event loop plus that
+thread pool (compare ``gunicorn.conf.py``'s gthread workers).
+"""
+from asgiref.wsgi import WsgiToAsgi
+
+from api.index import app
+
+asgi_app = WsgiToAsgi(app)
@@ -1,26 +1,91 @@
+import functools
+import hashlib
 import os
-import json
-from flask import Flask, render_template, request, send_from_directory
+from collections import deque
+from types import MappingProxyType
+from urllib.parse import parse_qsl
+
+import orjson
+from flask import Flask, abort, g, request, send_from_directory
+from flask.json.provider import DefaultJSONProvider
+from werkzeug.exceptions import BadRequestKeyError
 
 _PUBLIC_DIR = os.path.join(os.path.dirname(__file__), '..', 'public')
 
+# Hidden form fields carry scenario state as JSON; decode with orjson.
+_loads = orjson.loads
+
+
+class _OrjsonProvider(DefaultJSONProvider):
+    """JSON provider backed by orjson (used by ``tojson`` and ``jsonify``)."""
+
+    def dumps(self, obj, **kwargs):
+        option = orjson.OPT_NON_STR_KEYS
+        if kwargs.get('sort_keys', self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=self.default, option=option).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
 app = Flask(
     __name__,
     template_folder=os.path.join(os.path.dirname(__file__), '..', 'templates'),
 )
+app.json = _OrjsonProvider(app)
 
 import random as _random
 from engine.scenarios import (
-    generate_preflop, generate_postflop, generate_play_scenario,
-    compute_street_data,
+    pooled_preflop, pooled_postflop, generate_play_scenario,
+    compute_street_data, warm_pools,
 )
+from engine.cards import first_cards, unpack_cards
 from engine.evaluator import evaluate_preflop, evaluate_postflop
 from engine.simulate import (
-    generate_sim_hand, villain_preflop_act, villain_postflop_act,
+    SimState, generate_sim_hand, villain_preflop_act, villain_postflop_act,
     resolve_showdown, get_hero_gto_action, compute_deviation,
-    compute_session_review, apply_bet_amount, OPEN_RAISE, THREE_BET,
+    compute_session_review, log_hand, apply_bet_amount, OPEN_RAISE, THREE_BET,
 )
 
+# Import-time warm-up (scenario pools, template compilation) is the bulk of
+# startup. Long-lived servers want it up front (gunicorn preloads it before
+# forking); serverless cold starts can set LIVEGTO_LAZY_WARMUP=1 to build each
+# pool and template on first use instead.
+_LAZY_WARMUP = os.environ.get('LIVEGTO_LAZY_WARMUP') == '1'
+
+
+class _TemplateTable(dict):
+    """Compiled templates by name, compiling any missing one on first use."""
+
+    def __missing__(self, name):
+        template = self[name] = app.jinja_env.get_template(name)
+        return template
+
+
+# With auto-reload off and an unbounded cache, requests never stat template
+# files or recompile them.
+app.config['TEMPLATES_AUTO_RELOAD'] = False
+app.jinja_env.auto_reload = False
+app.jinja_env.cache = {}
+_TEMPLATES = _TemplateTable()
+
+if not _LAZY_WARMUP:
+    warm_pools()
+    for _name in app.jinja_env.list_templates():
+        _TEMPLATES[_name]
+
+
+# Every view returns HTML; build the Response directly rather than letting
+# Flask's make_response coerce a str or generator return value.
+_html_response = functools.partial(app.response_class, mimetype='text/html')
+
+
+def _render(template_name, **context):
+    """Render a precompiled template, skipping ``render_template``'s lookup."""
+    app.update_template_context(context)
+    return _html_response(_TEMPLATES[template_name].render(context))
+
 
 # Bet sizing labels for chip display
 _BET_LABELS = {
@@ -31,27 +96,243 @@ _BET_LABELS = {
     'call': 'Call',
 }
 
-
-def _build_bets(seats, user_action, facing_bet=False):
-    """Build bet chip dict for poker table display based on user's action."""
+# Chip labels for the villain's bet when the hero faces one, drawn in bulk so
+# the hot path is usually a list pop with no RNG call. The buffer starts empty
+# and is redrawn whenever it runs out, so each (forked) worker draws its own
+# labels and no fixed sequence repeats.
+_VILLAIN_BET_LABELS = ('3 BB', '4 BB', '5 BB', '6 BB', '7 BB')
+_VILLAIN_BET_BATCH = 4096
+_villain_bets = []
+
+
+def _next_villain_bet():
+    """Pop the next villain bet label, refilling the buffer when it is empty."""
+    try:
+        return _villain_bets.pop()
+    except IndexError:
+        # Draw locally so concurrent threads never pop an empty list
+        batch = _random.choices(_VILLAIN_BET_LABELS, k=_VILLAIN_BET_BATCH)
+        label = batch.pop()
+        _villain_bets.extend(batch)
+        return label
+
+
+# --- Form parsers ---
+# Each answer handler rebuilds its scenario from a fixed schema of form fields.
+# Schema entries are (key, kind, source[, default]): kind 'str'/'int' read the
+# form field ``source``, 'json' reads it from the decoded ``_state`` object,
+# 'g' reads the field already parsed onto ``g`` by the before_request hook and
+# 'const' uses ``source`` itself. Entries without a default are required.
+# _compile_parser turns a schema into one straight-line function at import.
+
+def _state_field(state, key):
+    """Required ``_state`` field; missing is a 400, like a missing form field."""
+    try:
+        return state[key]
+    except KeyError:
+        raise BadRequestKeyError(key) from None
+
+
+def _compile_parser(name, schema):
+    """Generate ``name(f, state, out=None) -> dict`` specialised to ``schema``.
+
+    Fields are written into ``out`` when given (e.g. a recycled dict from
+    ``_scenario_dict``), otherwise into a new dict.
+    """
+    lines = [f'def {name}(f, state, out=None):',
+             '    if out is None:', '        out = {}']
+    for key, kind, source, *default in schema:
+        if kind == 'const':
+            expr = repr(source)
+        elif kind == 'g':
+            expr = f'g.{source}'
+        else:
+            src = 'state' if kind == 'json' else 'f'
+            if default:
+                expr = f'{src}.get({source!r}, {default[0]!r})'
+            elif kind == 'json':
+                expr = f'_state_field(state, {source!r})'
+            else:
+                expr = f'{src}[{source!r}]'
+            if kind == 'int':
+                expr = f'int({expr})'
+        lines.append(f'    out[{key!r}] = {expr}')
+    lines.append('    return out')
+    ns = {'g': g, '_state_field': _state_field}
+    exec('\n'.join(lines), ns)
+    return ns[name]
+
+
+_parse_preflop = _compile_parser('_parse_preflop', (
+    ('type', 'str', 'type'),
+    ('position', 'str', 'position'),
+    ('hand_key', 'str', 'hand_key'),
+    ('correct_action', 'str', 'correct_action'),
+    ('range', 'json', 'range', []),
+    ('range_size', 'int', 'range_size', 0),
+    ('opener', 'str', 'opener', ''),
+    ('raise_range', 'json', 'raise_range', None),
+    ('call_range', 'json', 'call_range', None),
+))
+
+_parse_play_preflop = _compile_parser('_parse_play_preflop', (
+    ('type', 'str', 'preflop_type'),
+    ('position', 'str', 'position'),
+    ('hand_key', 'str', 'hand_key'),
+    ('correct_action', 'str', 'preflop_correct'),
+    ('range', 'json', 'preflop_range', []),
+    ('range_size', 'int', 'preflop_range_size', 0),
+    ('opener', 'str', 'preflop_opener', ''),
+    ('raise_range', 'json', 'preflop_raise_range', None),
+    ('call_range', 'json', 'preflop_call_range', None),
+))
+
+_parse_postflop = _compile_parser('_parse_postflop', (
+    ('type', 'const', 'postflop'),
+    ('position', 'str', 'position'),
+    ('hand_key', 'str', 'hand_key'),
+    ('bucket', 'str', 'bucket'),
+    ('bucket_label', 'str', 'bucket_label'),
+    ('texture', 'str', 'texture'),
+    ('texture_label', 'str', 'texture_label'),
+    ('strategy', 'json', 'strategy'),
+    ('correct_actions', 'json', 'correct_actions'),
+    ('action_labels', 'json', 'action_labels', {}),
+    ('range_breakdown', 'json', 'range_breakdown', {}),
+))
+
+_parse_play_postflop = _compile_parser('_parse_play_postflop', (
+    ('type', 'const', 'postflop'),
+    ('position', 'str', 'postflop_position'),
+    ('hand_key', 'str', 'hand_key'),
+    ('bucket', 'str', 'bucket'),
+    ('bucket_label', 'str', 'bucket_label'),
+    ('texture', 'str', 'texture'),
+    ('texture_label', 'str', 'texture_label'),
+    ('strategy', 'json', 'strategy'),
+    ('correct_actions', 'json', 'correct_actions'),
+    ('action_labels', 'json', 'postflop_action_labels', {}),
+    ('range_breakdown', 'json', 'range_breakdown', {}),
+))
+
+
+# Table fields shared by every play-mode re-render
+_parse_play_table = _compile_parser('_parse_play_table', (
+    ('hand_packed', 'int', 'hand', 0),
+    ('hand_key', 'str', 'hand_key'),
+    ('position', 'str', 'position', ''),
+    ('seats', 'json', 'seats', []),
+    ('dealer_seat', 'g', 'dealer_seat'),
+    ('villain_idx', 'g', 'villain_idx'),
+    ('pot', 'str', 'pot', '10'),
+))
+
+
+# Freelist of per-request scenario dicts. Only dicts that do not outlive the
+# handler may be recycled: never pooled/cached scenarios, and never anything
+# handed to a streamed template, which renders after the handler returns.
+# deque.append/pop are atomic, so the list is safe to share across threads.
+_free_scenarios = deque(maxlen=64)
+
+
+def _scenario_dict():
+    """Return an empty dict from the freelist, or a new one."""
+    try:
+        return _free_scenarios.pop()
+    except IndexError:
+        return {}
+
+
+def _recycle(*dicts):
+    """Clear per-request dicts and return them to the freelist."""
+    for d in dicts:
+        d.clear()
+        _free_scenarios.append(d)
+
+
+# Scenario booleans round-trip as bits of the hidden ``flags`` int field
+FLAG_FACING_BET = 1 << 0
+
+
+# Board cards visible on each street (play mode)
+_STREET_CARDS = {'flop': 3, 'turn': 4, 'river': 5}
+
+
+def _stream_partial(template_name, **context):
+    """Stream a partial in buffered chunks instead of rendering it up front.
+
+    These partials only read their own context, so unlike
+    ``flask.stream_template`` the stream does not hold the request context open.
+    """
+    app.update_template_context(context)
+    stream = _TEMPLATES[template_name].stream(context)
+    stream.enable_buffering(64)
+    return _html_response(stream)
+
+
+# Shared read-only result for an absent or empty ``_state`` field
+_EMPTY_STATE = MappingProxyType({})
+
+
+def _form_state(f):
+    """Decode the ``_state`` hidden field that batches every JSON-valued field."""
+    raw = f.get('_state')
+    if not raw or raw == '{}':
+        return _EMPTY_STATE
+    return _loads(raw)
+
+
+def _build_bets(villain_idx, user_action, facing_bet=False):
+    """Build bet chip dict for poker table display based on user's action.
+
+    ``villain_idx`` is the villain's seat index as stamped on the scenario at
+    generation time (-1 if unknown); the hero always sits in seat 0.
+    """
     bets = {}
-    hero_idx = next((i for i, s in enumerate(seats) if s.get('is_hero')), 0)
-    villain_idx = next(
-        (i for i, s in enumerate(seats) if s.get('is_active') and not s.get('is_hero')),
-        None
-    )
 
     # Show villain's bet if facing a bet
-    if facing_bet and villain_idx is not None:
-        bet_size = _random.choice([3, 4, 5, 6, 7])
-        bets[villain_idx] = f'{bet_size} BB'
+    if facing_bet and villain_idx >= 0:
+        bets[villain_idx] = _next_villain_bet()
 
     # Show hero's bet/raise/call
-    if user_action in ('bet_s', 'bet_m', 'bet_l', 'raise', 'call'):
-        label = _BET_LABELS.get(user_action, user_action)
-        bets[hero_idx] = label
+    label = _BET_LABELS.get(user_action)
+    if label:
+        bets[0] = label
+
+    return bets or None
+
+
+class _Form(dict):
+    """Decoded POST fields; a missing required field is a 400, as with
+    ``request.form``, rather than a bare ``KeyError`` (500)."""
+
+    __slots__ = ()
+
+    def __missing__(self, key):
+        raise BadRequestKeyError(key)
 
-    return bets if bets else None
+
+@app.before_request
+def _parse_common_fields():
+    """Decode the POST body into ``g.form`` and parse the shared integer fields.
+
+    Our forms are small and flat, so a single ``parse_qsl`` pass over the raw
+    body is cheaper than building Werkzeug's ``MultiDict`` via ``request.form``.
+    """
+    if request.method != 'POST':
+        return
+    body = request.get_data(cache=False)
+    try:
+        form = g.form = _Form(parse_qsl(body.decode('latin-1'), max_num_fields=32))
+    except ValueError:
+        abort(400)
+    try:
+        g.streak = int(form.get('streak', 0))
+        g.dealer_seat = int(form.get('dealer_seat', 0))
+        g.villain_idx = int(form.get('villain_idx', -1))
+        g.flags = int(form.get('flags', 0))
+    except ValueError:
+        abort(400)
 
 
 @app.route('/public/<path:filename>')
@@ -70,9 +351,17 @@ def service_worker():
                               mimetype='application/javascript')
 
 
+# The landing page has no per-request context: render it once and let
+# browsers revalidate it by ETag.
+_HOME_HTML = _TEMPLATES['home.html'].render()
+_HOME_ETAG = hashlib.blake2b(_HOME_HTML.encode(), digest_size=8).hexdigest()
+
+
 @app.route('/')
 def home():
-    return render_template('home.html')
+    response = _html_response(_HOME_HTML)
+    response.set_etag(_HOME_ETAG)
+    return response.make_conditional(request)
 
 
 # --- PREFLOP ---
@@ -80,56 +369,38 @@ def home():
 @app.route('/preflop')
 def preflop():
     fp = request.args.get('position', None)
-    scenario = generate_preflop(position=fp)
-    return render_template('preflop.html', scenario=scenario, streak=0, filter_position=fp)
+    scenario = pooled_preflop(position=fp)
+    return _render('preflop.html', scenario=scenario, streak=0, filter_position=fp)
 
 
 @app.route('/api/preflop/answer', methods=['POST'])
 def preflop_answer():
-    user_action = request.form['action']
-    streak = int(request.form.get('streak', 0))
+    f = g.form
+    user_action = f['action']
+    streak = g.streak
+    state = _form_state(f)
 
     # Reconstruct scenario from hidden fields
-    scenario = {
-        'type': request.form['type'],
-        'position': request.form['position'],
-        'hand_key': request.form['hand_key'],
-        'correct_action': request.form['correct_action'],
-        'range': json.loads(request.form.get('range', '[]')),
-        'range_size': int(request.form.get('range_size', 0)),
-        'opener': request.form.get('opener', ''),
-        'raise_range': json.loads(request.form.get('raise_range', 'null')),
-        'call_range': json.loads(request.form.get('call_range', 'null')),
-    }
+    scenario = _parse_preflop(f, state, _scenario_dict())
 
     feedback = evaluate_preflop(user_action, scenario)
     streak = streak + 1 if feedback['is_correct'] else 0
+    _recycle(scenario)
 
-    # Reconstruct full scenario for re-rendering with poker table
-    full_scenario = {
-        **scenario,
-        'hand': json.loads(request.form.get('hand', '[]')),
-        'board': json.loads(request.form.get('board', '[]')),
-        'seats': json.loads(request.form.get('seats', '[]')),
-        'dealer_seat': int(request.form.get('dealer_seat', 0)),
-        'situation': request.form.get('situation', ''),
-        'actions': [],
-        'action_labels': {},
-    }
-
-    fp = request.form.get('filter_position', None)
-    return render_template('partials/scenario_preflop.html',
-                          scenario=full_scenario, feedback=feedback, streak=streak,
-                          filter_position=fp)
+    # The table is unchanged by a preflop answer; only swap the feedback in
+    fp = f.get('filter_position', None)
+    return _render('partials/feedback_preflop.html',
+                  feedback=feedback, streak=streak, filter_position=fp)
 
 
 @app.route('/api/preflop/next', methods=['POST'])
 def preflop_next():
-    streak = int(request.form.get('streak', 0))
-    fp = request.form.get('filter_position', None)
-    scenario = generate_preflop(position=fp)
-    return render_template('partials/scenario_preflop.html',
-                          scenario=scenario, streak=streak, filter_position=fp)
+    f = g.form
+    streak = g.streak
+    fp = f.get('filter_position', None)
+    scenario = pooled_preflop(position=fp)
+    return _render('partials/scenario_preflop.html',
+                  scenario=scenario, streak=streak, filter_position=fp)
 
 
 # --- POSTFLOP ---
@@ -138,63 +409,56 @@ def preflop_next():
 def postflop():
     fp = request.args.get('position', None)
     ft = request.args.get('texture', None)
-    scenario = generate_postflop(position=fp, texture=ft)
-    return render_template('postflop.html', scenario=scenario, streak=0,
-                          filter_position=fp, filter_texture=ft)
+    scenario = pooled_postflop(position=fp, texture=ft)
+    return _render('postflop.html', scenario=scenario, streak=0,
+                  filter_position=fp, filter_texture=ft)
 
 
 @app.route('/api/postflop/answer', methods=['POST'])
 def postflop_answer():
-    user_action = request.form['action']
-    streak = int(request.form.get('streak', 0))
-
-    scenario = {
-        'type': 'postflop',
-        'position': request.form['position'],
-        'hand_key': request.form['hand_key'],
-        'bucket': request.form['bucket'],
-        'bucket_label': request.form['bucket_label'],
-        'texture': request.form['texture'],
-        'texture_label': request.form['texture_label'],
-        'strategy': json.loads(request.form['strategy']),
-        'correct_actions': json.loads(request.form['correct_actions']),
-        'action_labels': json.loads(request.form.get('action_labels', '{}')),
-        'range_breakdown': json.loads(request.form.get('range_breakdown', '{}')),
-    }
+    f = g.form
+    user_action = f['action']
+    streak = g.streak
+    state = _form_state(f)
+
+    scenario = _parse_postflop(f, state)
 
     feedback = evaluate_postflop(user_action, scenario)
     streak = streak + 1 if feedback['is_correct'] else 0
 
-    # Reconstruct full scenario for re-rendering with poker table
-    seats = json.loads(request.form.get('seats', '[]'))
-    is_facing_bet = request.form.get('facing_bet', '') == 'True'
-    full_scenario = {
-        **scenario,
-        'hand': json.loads(request.form.get('hand', '[]')),
-        'board': json.loads(request.form.get('board', '[]')),
+    # Extend the (freshly parsed) scenario in place for re-rendering with poker table
+    seats = state.get('seats', [])
+    villain_idx = g.villain_idx
+    is_facing_bet = bool(g.flags & FLAG_FACING_BET)
+    full_scenario = scenario
+    full_scenario.update({
+        'hand': state.get('hand', []),
+        'board': state.get('board', []),
         'seats': seats,
-        'dealer_seat': int(request.form.get('dealer_seat', 0)),
-        'pot': request.form.get('pot', '10'),
-        'situation': request.form.get('situation', ''),
+        'dealer_seat': g.dealer_seat,
+        'villain_idx': g.villain_idx,
+        'pot': f.get('pot', '10'),
+        'situation': f.get('situation', ''),
         'facing_bet': is_facing_bet,
         'actions': [],
-        'bets': _build_bets(seats, user_action, facing_bet=is_facing_bet),
-    }
+        'bets': _build_bets(villain_idx, user_action, facing_bet=is_facing_bet),
+    })
 
-    fp = request.form.get('filter_position', None)
-    ft = request.form.get('filter_texture', None)
-    return render_template('partials/scenario_postflop.html',
+    fp = f.get('filter_position', None)
+    ft = f.get('filter_texture', None)
+    return _stream_partial('partials/scenario_postflop.html',
                           scenario=full_scenario, feedback=feedback, streak=streak,
                           filter_position=fp, filter_texture=ft)
 
 
 @app.route('/api/postflop/next', methods=['POST'])
 def postflop_next():
-    streak = int(request.form.get('streak', 0))
-    fp = request.form.get('filter_position', None)
-    ft = request.form.get('filter_texture', None)
-    scenario = generate_postflop(position=fp, texture=ft)
-    return render_template('partials/scenario_postflop.html',
+    f = g.form
+    streak = g.streak
+    fp = f.get('filter_position', None)
+    ft = f.get('filter_texture', None)
+    scenario = pooled_postflop(position=fp, texture=ft)
+    return _stream_partial('partials/scenario_postflop.html',
                           scenario=scenario, streak=streak,
                           filter_position=fp, filter_texture=ft)
 
@@ -205,124 +469,94 @@ def postflop_next():
 def play():
     fp = request.args.get('position', None)
     scenario = generate_play_scenario(position=fp)
-    return render_template('play.html', scenario=scenario, streak=0, filter_position=fp)
+    return _render('play.html', scenario=scenario, streak=0, filter_position=fp)
 
 
 @app.route('/api/play/preflop', methods=['POST'])
 def play_preflop_answer():
     """Evaluate preflop action in play mode."""
-    user_action = request.form['action']
-    streak = int(request.form.get('streak', 0))
-
-    preflop_scenario = {
-        'type': request.form['preflop_type'],
-        'position': request.form['position'],
-        'hand_key': request.form['hand_key'],
-        'correct_action': request.form['preflop_correct'],
-        'range': json.loads(request.form.get('preflop_range', '[]')),
-        'range_size': int(request.form.get('preflop_range_size', 0)),
-        'opener': request.form.get('preflop_opener', ''),
-        'raise_range': json.loads(request.form.get('preflop_raise_range', 'null')),
-        'call_range': json.loads(request.form.get('preflop_call_range', 'null')),
-    }
+    f = g.form
+    user_action = f['action']
+    streak = g.streak
+    state = _form_state(f)
+
+    preflop_scenario = _parse_play_preflop(f, state, _scenario_dict())
 
     feedback = evaluate_preflop(user_action, preflop_scenario)
     streak = streak + 1 if feedback['is_correct'] else 0
 
     # Determine if we should continue to postflop
-    show_flop = (request.form['preflop_correct'] != 'fold')
-
-    # Reconstruct full scenario for re-rendering
-    full_scenario = {
-        'hand': json.loads(request.form.get('hand', '[]')),
-        'hand_key': request.form['hand_key'],
-        'board': json.loads(request.form.get('board', '[]')),
-        'position': request.form['position'],
-        'seats': json.loads(request.form.get('seats', '[]')),
-        'dealer_seat': int(request.form.get('dealer_seat', 0)),
-        'pot': request.form.get('pot', '10'),
-        'preflop_situation': request.form.get('preflop_situation', ''),
+    show_flop = (f['preflop_correct'] != 'fold')
+
+    # Reconstruct full scenario for re-rendering (reusing the parsed dict)
+    preflop_scenario.clear()
+    full_scenario = _parse_play_table(f, state, preflop_scenario)
+    full_scenario.update({
+        'board_packed': int(f.get('board', 0)),
+        'preflop_situation': f.get('preflop_situation', ''),
         'preflop_actions': [],
         'preflop_action_labels': {},
-        'postflop_position': request.form.get('postflop_position', ''),
-        'facing_bet': request.form.get('facing_bet', 'False'),
-    }
-
-    fp = request.form.get('filter_position', None)
-    return render_template('partials/scenario_play_preflop.html',
-                          scenario=full_scenario, feedback=feedback,
-                          show_flop=show_flop, streak=streak, filter_position=fp)
+        'postflop_position': f.get('postflop_position', ''),
+        'facing_bet': bool(g.flags & FLAG_FACING_BET),
+    })
 
+    fp = f.get('filter_position', None)
+    response = _render('partials/scenario_play_preflop.html',
+                       scenario=full_scenario, feedback=feedback,
+                       show_flop=show_flop, streak=streak, filter_position=fp)
+    _recycle(full_scenario)
+    return response
 
-@app.route('/api/play/postflop', methods=['POST'])
-def play_show_postflop():
-    """Show the postflop decision (board revealed) — flop entry point."""
-    streak = int(request.form.get('streak', 0))
 
-    hand = json.loads(request.form['hand'])
-    board_full = json.loads(request.form['board_full'])
-    seats = json.loads(request.form['seats'])
-    dealer_seat = int(request.form['dealer_seat'])
-    pot = request.form.get('pot', '10')
-    position = request.form.get('position', '')
-    postflop_position = request.form['postflop_position']
+def _render_play_street(f, street):
+    """Deal the given street from the packed board and render its decision."""
+    streak = g.streak
+    state = _form_state(f)
 
-    # Flop = first 3 cards
-    board_visible = board_full[:3]
+    board_packed = int(f['board_full'])
+    villain_idx = g.villain_idx
+    postflop_position = f['postflop_position']
+    if postflop_position not in ('OOP', 'IP'):
+        abort(400)
 
-    # Compute strategy for this street
-    street_data = compute_street_data(hand, board_visible, postflop_position)
+    # Compute strategy for the visible board on this street
+    visible_packed = first_cards(board_packed, _STREET_CARDS[street])
+    street_data = compute_street_data(int(f['hand']), visible_packed, postflop_position)
 
     # Build bet chips if facing a bet
     bets = None
-    if street_data.get('bets_info'):
-        # Find villain seat (first active non-hero)
-        villain_idx = next(
-            (i for i, s in enumerate(seats) if s.get('is_active') and not s.get('is_hero')),
-            None
-        )
-        if villain_idx is not None:
-            bets = {villain_idx: f"{street_data['bets_info']['bet_size']} BB"}
+    if street_data.get('bets_info') and villain_idx >= 0:
+        bets = {villain_idx: f"{street_data['bets_info']['bet_size']} BB"}
 
-    scenario = {
-        'hand': hand,
-        'hand_key': request.form['hand_key'],
-        'position': position,
-        'seats': seats,
-        'dealer_seat': dealer_seat,
-        'pot': pot,
-        'postflop_position': postflop_position,
-        'bets': bets,
-        **street_data,
-    }
-
-    fp = request.form.get('filter_position', None)
-    return render_template('partials/scenario_play_postflop.html',
+    # compute_street_data returns a fresh dict; extend it in place
+    scenario = _parse_play_table(f, state, street_data)
+    scenario['postflop_position'] = postflop_position
+    scenario['bets'] = bets
+
+    fp = f.get('filter_position', None)
+    return _stream_partial('partials/scenario_play_postflop.html',
                           scenario=scenario, streak=streak,
-                          board_visible=board_visible, board_full=board_full,
-                          street='flop', filter_position=fp)
+                          board_visible=unpack_cards(visible_packed),
+                          board_packed=board_packed,
+                          street=street, filter_position=fp)
+
+
+@app.route('/api/play/postflop', methods=['POST'])
+def play_show_postflop():
+    """Show the postflop decision (board revealed) — flop entry point."""
+    return _render_play_street(g.form, 'flop')
 
 
 @app.route('/api/play/postflop_answer', methods=['POST'])
 def play_postflop_answer():
     """Evaluate postflop action in play mode."""
-    user_action = request.form['action']
-    streak = int(request.form.get('streak', 0))
-    street = request.form.get('street', 'flop')
-
-    scenario = {
-        'type': 'postflop',
-        'position': request.form['postflop_position'],
-        'hand_key': request.form['hand_key'],
-        'bucket': request.form['bucket'],
-        'bucket_label': request.form['bucket_label'],
-        'texture': request.form['texture'],
-        'texture_label': request.form['texture_label'],
-        'strategy': json.loads(request.form['strategy']),
-        'correct_actions': json.loads(request.form['correct_actions']),
-        'action_labels': json.loads(request.form.get('postflop_action_labels', '{}')),
-        'range_breakdown': json.loads(request.form.get('range_breakdown', '{}')),
-    }
+    f = g.form
+    user_action = f['action']
+    streak = g.streak
+    street = f.get('street', 'flop')
+    state = _form_state(f)
+
+    scenario = _parse_play_postflop(f, state)
 
     feedback = evaluate_postflop(user_action, scenario)
     streak = streak + 1 if feedback['is_correct'] else 0
@@ -331,36 +565,31 @@ def play_postflop_answer():
     has_next_street = street in ('flop', 'turn')
 
     # Reconstruct full scenario for re-rendering
-    board_full = json.loads(request.form.get('board_full', '[]'))
-    board_visible = json.loads(request.form.get('board_visible', '[]'))
-    seats = json.loads(request.form.get('seats', '[]'))
-    is_facing_bet = request.form.get('facing_bet', '') == 'True'
-
-    full_scenario = {
-        'hand': json.loads(request.form.get('hand', '[]')),
-        'hand_key': request.form['hand_key'],
-        'position': request.form.get('position', ''),
-        'postflop_position': request.form['postflop_position'],
-        'seats': seats,
-        'dealer_seat': int(request.form.get('dealer_seat', 0)),
-        'pot': request.form.get('pot', '10'),
-        'postflop_situation': request.form.get('postflop_situation', ''),
-        'bucket': request.form['bucket'],
-        'bucket_label': request.form['bucket_label'],
-        'texture': request.form['texture'],
-        'texture_label': request.form['texture_label'],
+    board_packed = int(f.get('board_full', 0))
+    board_visible = unpack_cards(first_cards(board_packed, _STREET_CARDS.get(street, 3)))
+    villain_idx = g.villain_idx
+    is_facing_bet = bool(g.flags & FLAG_FACING_BET)
+
+    full_scenario = _parse_play_table(f, state)
+    full_scenario.update({
+        'postflop_position': f['postflop_position'],
+        'postflop_situation': f.get('postflop_situation', ''),
+        'bucket': f['bucket'],
+        'bucket_label': f['bucket_label'],
+        'texture': f['texture'],
+        'texture_label': f['texture_label'],
         'postflop_actions': [],
         'postflop_action_labels': {},
-        'strategy': json.loads(request.form['strategy']),
-        'correct_actions': json.loads(request.form['correct_actions']),
-        'range_breakdown': json.loads(request.form.get('range_breakdown', '{}')),
-        'bets': _build_bets(seats, user_action, facing_bet=is_facing_bet),
-    }
-
-    fp = request.form.get('filter_position', None)
-    return render_template('partials/scenario_play_postflop.html',
+        'strategy': scenario['strategy'],
+        'correct_actions': scenario['correct_actions'],
+        'range_breakdown': scenario['range_breakdown'],
+        'bets': _build_bets(villain_idx, user_action, facing_bet=is_facing_bet),
+    })
+
+    fp = f.get('filter_position', None)
+    return _stream_partial('partials/scenario_play_postflop.html',
                           scenario=full_scenario, feedback=feedback, streak=streak,
-                          board_visible=board_visible, board_full=board_full,
+                          board_visible=board_visible, board_packed=board_packed,
                           street=street, has_next_street=has_next_street,
                           filter_position=fp)
 
@@ -368,205 +597,170 @@ def play_postflop_answer():
 @app.route('/api/play/next_street', methods=['POST'])
 def play_next_street():
     """Advance to the next street (turn or river)."""
-    streak = int(request.form.get('streak', 0))
-    current_street = request.form['street']
-
-    hand = json.loads(request.form['hand'])
-    board_full = json.loads(request.form['board_full'])
-    seats = json.loads(request.form['seats'])
-    dealer_seat = int(request.form['dealer_seat'])
-    pot = request.form.get('pot', '10')
-    position = request.form.get('position', '')
-    postflop_position = request.form['postflop_position']
-
-    # Determine next street and visible board
-    if current_street == 'flop':
-        next_street = 'turn'
-        board_visible = board_full[:4]
-    else:
-        next_street = 'river'
-        board_visible = board_full[:5]
-
-    # Re-compute strategy for the new board
-    street_data = compute_street_data(hand, board_visible, postflop_position)
-
-    # Build bet chips if facing a bet
-    bets = None
-    if street_data.get('bets_info'):
-        villain_idx = next(
-            (i for i, s in enumerate(seats) if s.get('is_active') and not s.get('is_hero')),
-            None
-        )
-        if villain_idx is not None:
-            bets = {villain_idx: f"{street_data['bets_info']['bet_size']} BB"}
-
-    scenario = {
-        'hand': hand,
-        'hand_key': request.form['hand_key'],
-        'position': position,
-        'seats': seats,
-        'dealer_seat': dealer_seat,
-        'pot': pot,
-        'postflop_position': postflop_position,
-        'bets': bets,
-        **street_data,
-    }
-
-    fp = request.form.get('filter_position', None)
-    return render_template('partials/scenario_play_postflop.html',
-                          scenario=scenario, streak=streak,
-                          board_visible=board_visible, board_full=board_full,
-                          street=next_street, filter_position=fp)
+    f = g.form
+    next_street = 'turn' if f['street'] == 'flop' else 'river'
+    return _render_play_street(f, next_street)
 
 
 @app.route('/api/play/next', methods=['POST'])
 def play_next():
-    streak = int(request.form.get('streak', 0))
-    fp = request.form.get('filter_position', None)
+    f = g.form
+    streak = g.streak
+    fp = f.get('filter_position', None)
     scenario = generate_play_scenario(position=fp)
-    return render_template('partials/scenario_play_preflop.html',
-                          scenario=scenario, streak=streak, filter_position=fp)
+    return _render('partials/scenario_play_preflop.html',
+                  scenario=scenario, streak=streak, filter_position=fp)
 
 
 # --- SIMULATE MODE ---
 
+def _load_sim_state(f):
+    """Decode the ``sim_state`` blob the sim forms post back."""
+    return SimState(**_loads(f['sim_state']))
+
+
+# Villain actions that leave the hero facing a bet
+_VILLAIN_AGGRESSION = frozenset({'raise', 'bet_s', 'bet_m', 'bet_l'})
+
+# Hero's options keyed by (is_preflop, villain_last_action); shared tuples
+_PREFLOP_OPEN = ('raise', 'fold')
+_PREFLOP_FACING = ('raise', 'call', 'fold')
+_POSTFLOP_OPEN = ('check', 'bet_s', 'bet_m', 'bet_l')
+_POSTFLOP_FACING = ('fold', 'call', 'raise')
+_SIM_ACTIONS = {
+    (True, None): _PREFLOP_OPEN,
+    (True, 'call'): _PREFLOP_OPEN,
+    (True, 'raise'): _PREFLOP_FACING,
+    (False, None): _POSTFLOP_OPEN,
+    (False, 'check'): _POSTFLOP_OPEN,
+}
+
+
 def _sim_available_actions(sim_state):
     """Determine available actions for hero based on current state."""
-    if sim_state['street'] == 'preflop':
-        villain_acted = sim_state.get('villain_last_action')
-        if villain_acted == 'raise':
-            return ['raise', 'call', 'fold']  # facing raise
-        elif villain_acted == 'call' or villain_acted is None:
-            return ['raise', 'fold']  # open action
-        return ['raise', 'call', 'fold']
+    preflop = sim_state.street == 'preflop'
+    actions = _SIM_ACTIONS.get((preflop, sim_state.villain_last_action))
+    if actions is None:
+        # Facing a bet/raise
+        actions = _PREFLOP_FACING if preflop else _POSTFLOP_FACING
+    return actions
+
+
+def _invest_to(sim_state, actor, target):
+    """Raise ``actor``'s ('hero'/'villain') street investment to ``target``.
+
+    The chips move from the actor's stack into the pot, capped at the stack
+    (all-in).
+    """
+    if actor == 'hero':
+        amount = min(target - sim_state.hero_street_invested, sim_state.hero_stack)
+        sim_state.hero_stack -= amount
+        sim_state.hero_total_invested += amount
+        sim_state.hero_street_invested += amount
     else:
-        # Postflop
-        villain_acted = sim_state.get('villain_last_action')
-        if villain_acted and villain_acted not in ('check',):
-            # Facing a bet/raise
-            return ['fold', 'call', 'raise']
-        else:
-            return ['check', 'bet_s', 'bet_m', 'bet_l']
+        amount = min(target - sim_state.villain_street_invested, sim_state.villain_stack)
+        sim_state.villain_stack -= amount
+        sim_state.villain_total_invested += amount
+        sim_state.villain_street_invested += amount
+    sim_state.pot += amount
+
+
+# Street dealt next and the board cards visible on it
+_NEXT_STREET = {'preflop': ('flop', 3), 'flop': ('turn', 4), 'turn': ('river', 5)}
 
 
 def _advance_street(sim_state):
     """Advance to the next street, reset street-level tracking."""
-    current = sim_state['street']
-    if current == 'preflop':
-        sim_state['street'] = 'flop'
-        sim_state['board_visible'] = 3
-    elif current == 'flop':
-        sim_state['street'] = 'turn'
-        sim_state['board_visible'] = 4
-    elif current == 'turn':
-        sim_state['street'] = 'river'
-        sim_state['board_visible'] = 5
-
-    sim_state['street_bet'] = 0.0
-    sim_state['hero_street_invested'] = 0.0
-    sim_state['villain_street_invested'] = 0.0
-    sim_state['villain_last_action'] = None
+    sim_state.street, sim_state.board_visible = _NEXT_STREET[sim_state.street]
+    # Slice the visible board once per street, not on every action
+    sim_state.visible_board_strs = sim_state.board_strs[:sim_state.board_visible]
+
+    sim_state.street_bet = 0.0
+    sim_state.hero_street_invested = 0.0
+    sim_state.villain_street_invested = 0.0
+    sim_state.villain_last_action = None
 
     # Postflop: OOP acts first (BB in heads-up)
     # In HU: SB = BTN = IP, BB = OOP
-    if sim_state['hero_is_sb']:
+    if sim_state.hero_is_sb:
         # Hero is SB/BTN = IP, villain is BB = OOP → villain acts first
-        sim_state['street_to_act'] = 'villain'
+        sim_state.street_to_act = 'villain'
     else:
         # Hero is BB = OOP → hero acts first
-        sim_state['street_to_act'] = 'hero'
+        sim_state.street_to_act = 'hero'
 
     return sim_state
 
 
 def _end_hand(sim_state, winner, fold=False):
     """Finalize hand, update stacks, log result."""
-    sim_state['hand_over'] = True
-    sim_state['winner'] = winner
+    sim_state.hand_over = True
+    sim_state.winner = winner
 
     if winner == 'hero':
-        win_amount = sim_state['pot'] - sim_state['hero_total_invested']
-        sim_state['hero_stack'] += sim_state['pot']
+        win_amount = sim_state.pot - sim_state.hero_total_invested
+        sim_state.hero_stack += sim_state.pot
     elif winner == 'villain':
-        win_amount = -sim_state['hero_total_invested']
-        sim_state['villain_stack'] += sim_state['pot']
+        win_amount = -sim_state.hero_total_invested
+        sim_state.villain_stack += sim_state.pot
     else:
         # Split
-        half = sim_state['pot'] / 2
-        win_amount = half - sim_state['hero_total_invested']
-        sim_state['hero_stack'] += half
-        sim_state['villain_stack'] += half
+        half = sim_state.pot / 2
+        win_amount = half - sim_state.hero_total_invested
+        sim_state.hero_stack += half
+        sim_state.villain_stack += half
 
-    sim_state['sim_phase'] = 'hand_over' if fold else 'showdown'
+    sim_state.sim_phase = 'hand_over' if fold else 'showdown'
 
     # Log this hand
-    sim_state['session_log'].append({
-        'hand_num': sim_state['hand_number'],
-        'hero_hand_key': sim_state['hero_hand_key'],
-        'result_bb': round(win_amount, 1),
-        'actions': sim_state['current_hand_actions'],
-    })
+    log_hand(sim_state, round(win_amount, 1))
 
     return sim_state
 
 
+def _close_street(sim_state):
+    """Betting on this street is closed: showdown on the river, else deal on."""
+    if sim_state.street == 'river':
+        winner = resolve_showdown(
+            sim_state.hero_hand_strs, sim_state.villain_hand_strs,
+            sim_state.board_strs
+        )
+        return _end_hand(sim_state, winner)
+    return _process_new_street(_advance_street(sim_state))
+
+
 def _run_villain_turn(sim_state):
     """Process villain's action when it's their turn."""
-    street = sim_state['street']
-    facing_bet = sim_state['hero_street_invested'] > sim_state['villain_street_invested']
+    street = sim_state.street
+    facing_bet = sim_state.hero_street_invested > sim_state.villain_street_invested
 
     if street == 'preflop':
         v_action = villain_preflop_act(
-            sim_state['villain_hand_key'],
-            sim_state['villain_position'],
+            sim_state.villain_hand_key,
+            sim_state.villain_position,
             facing_raise=facing_bet,
         )
     else:
-        board_vis = sim_state['board_strs'][:sim_state['board_visible']]
-        v_pos = 'OOP' if not sim_state['hero_is_sb'] else 'IP'  # Villain is opposite of hero
-        # Actually: hero_is_sb means hero=IP, villain=OOP
-        if sim_state['hero_is_sb']:
-            v_pos = 'OOP'
-        else:
-            v_pos = 'IP'
         v_action = villain_postflop_act(
-            sim_state['villain_hand_strs'], board_vis,
-            v_pos, facing_bet=facing_bet,
+            sim_state.villain_hand_strs, sim_state.visible_board_strs,
+            sim_state.villain_postflop_position, facing_bet=facing_bet,
         )
 
     # Apply villain's action
     if v_action == 'fold':
         return _end_hand(sim_state, 'hero', fold=True)
     elif v_action == 'call':
-        call_amount = sim_state['hero_street_invested'] - sim_state['villain_street_invested']
-        call_amount = min(call_amount, sim_state['villain_stack'])
-        sim_state['villain_stack'] -= call_amount
-        sim_state['villain_total_invested'] += call_amount
-        sim_state['villain_street_invested'] += call_amount
-        sim_state['pot'] += call_amount
-        sim_state['villain_last_action'] = 'call'
-
-        # After a call, check if we need to advance street or showdown
-        if street == 'preflop' and sim_state['hero_street_invested'] > 0:
-            # Both have acted preflop, advance to flop
-            sim_state = _advance_street(sim_state)
-            return _process_new_street(sim_state)
-        elif sim_state['street'] == 'river':
-            # Showdown
-            winner = resolve_showdown(
-                sim_state['hero_hand_strs'], sim_state['villain_hand_strs'],
-                sim_state['board_strs']
-            )
-            return _end_hand(sim_state, winner)
-        else:
-            sim_state = _advance_street(sim_state)
-            return _process_new_street(sim_state)
+        _invest_to(sim_state, 'villain', sim_state.hero_street_invested)
+        sim_state.villain_last_action = 'call'
+
+        # After a call, advance street or showdown
+        return _close_street(sim_state)
 
     elif v_action == 'check':
-        sim_state['villain_last_action'] = 'check'
-        sim_state['street_to_act'] = 'hero'
+        sim_state.villain_last_action = 'check'
+        sim_state.street_to_act = 'hero'
         if street != 'preflop':
-            sim_state['sim_phase'] = 'postflop_decision'
+            sim_state.sim_phase = 'postflop_decision'
         return sim_state
 
     else:
@@ -574,30 +768,25 @@ def _run_villain_turn(sim_state):
         if street == 'preflop':
             bet_amount = OPEN_RAISE if not facing_bet else THREE_BET
         else:
-            bet_amount = apply_bet_amount(sim_state['pot'], v_action)
-
-        additional = bet_amount - sim_state['villain_street_invested']
-        additional = min(additional, sim_state['villain_stack'])
-        sim_state['villain_stack'] -= additional
-        sim_state['villain_total_invested'] += additional
-        sim_state['villain_street_invested'] += additional
-        sim_state['pot'] += additional
-        sim_state['street_bet'] = sim_state['villain_street_invested']
-        sim_state['villain_last_action'] = v_action if 'bet' in v_action else 'raise'
-        sim_state['street_to_act'] = 'hero'
+            bet_amount = apply_bet_amount(sim_state.pot, v_action)
+
+        _invest_to(sim_state, 'villain', bet_amount)
+        sim_state.street_bet = sim_state.villain_street_invested
+        sim_state.villain_last_action = v_action if 'bet' in v_action else 'raise'
+        sim_state.street_to_act = 'hero'
         if street == 'preflop':
-            sim_state['sim_phase'] = 'preflop_decision'
+            sim_state.sim_phase = 'preflop_decision'
         else:
-            sim_state['sim_phase'] = 'postflop_decision'
+            sim_state.sim_phase = 'postflop_decision'
         return sim_state
 
 
 def _process_new_street(sim_state):
     """Process a new street — check if villain or hero acts first."""
-    if sim_state['street_to_act'] == 'villain':
+    if sim_state.street_to_act == 'villain':
         return _run_villain_turn(sim_state)
     else:
-        sim_state['sim_phase'] = 'postflop_decision'
+        sim_state.sim_phase = 'postflop_decision'
         return sim_state
 
 
@@ -606,31 +795,32 @@ def simulate():
     sim_state = generate_sim_hand(100.0, 100.0, 1, hero_is_sb=True)
 
     # If villain is first to act preflop (hero is BB), run villain's action
-    if sim_state['street_to_act'] == 'villain':
+    if sim_state.street_to_act == 'villain':
         sim_state = _run_villain_turn(sim_state)
 
     available_actions = _sim_available_actions(sim_state)
-    return render_template('simulate.html', sim_state=sim_state,
-                          available_actions=available_actions)
+    return _render('simulate.html', sim_state=sim_state,
+                  available_actions=available_actions)
 
 
 @app.route('/api/sim/action', methods=['POST'])
 def sim_action():
     """Process hero's action in simulate mode."""
-    sim_state = json.loads(request.form['sim_state'])
-    hero_action = request.form['action']
-    street = sim_state['street']
+    f = g.form
+    sim_state = _load_sim_state(f)
+    hero_action = f['action']
+    street = sim_state.street
 
     # Track GTO deviation
-    facing_bet = sim_state.get('villain_last_action') in ('raise', 'bet_s', 'bet_m', 'bet_l')
-    board_vis = sim_state['board_strs'][:sim_state['board_visible']] if sim_state['board_visible'] > 0 else None
+    facing_bet = sim_state.villain_last_action in _VILLAIN_AGGRESSION
+    board_vis = sim_state.visible_board_strs or None
     gto_action = get_hero_gto_action(
-        sim_state['hero_hand_key'], sim_state['hero_position'],
-        street, hand_strs=sim_state['hero_hand_strs'],
+        sim_state.hero_hand_key, sim_state.hero_position,
+        street, hand_strs=sim_state.hero_hand_strs,
         board_strs=board_vis, facing_bet=facing_bet,
     )
     dev = compute_deviation(hero_action, gto_action)
-    sim_state['current_hand_actions'].append({
+    sim_state.current_hand_actions.append({
         'street': street,
         'action': hero_action,
         'gto_action': gto_action,
@@ -641,44 +831,20 @@ def sim_action():
     if hero_action == 'fold':
         sim_state = _end_hand(sim_state, 'villain', fold=True)
     elif hero_action == 'call':
-        call_amount = sim_state['villain_street_invested'] - sim_state['hero_street_invested']
-        call_amount = min(call_amount, sim_state['hero_stack'])
-        sim_state['hero_stack'] -= call_amount
-        sim_state['hero_total_invested'] += call_amount
-        sim_state['hero_street_invested'] += call_amount
-        sim_state['pot'] += call_amount
+        _invest_to(sim_state, 'hero', sim_state.villain_street_invested)
 
         # After call, advance street or showdown
-        if sim_state['street'] == 'river':
-            winner = resolve_showdown(
-                sim_state['hero_hand_strs'], sim_state['villain_hand_strs'],
-                sim_state['board_strs']
-            )
-            sim_state = _end_hand(sim_state, winner)
-        elif street == 'preflop':
-            sim_state = _advance_street(sim_state)
-            sim_state = _process_new_street(sim_state)
-        else:
-            sim_state = _advance_street(sim_state)
-            sim_state = _process_new_street(sim_state)
+        sim_state = _close_street(sim_state)
 
     elif hero_action == 'check':
-        sim_state['villain_last_action'] = None
+        sim_state.villain_last_action = None
         # After hero checks
-        if sim_state['hero_is_sb'] and street != 'preflop':
+        if sim_state.hero_is_sb and street != 'preflop':
             # Hero is IP, checked back → advance street or showdown
-            if sim_state['street'] == 'river':
-                winner = resolve_showdown(
-                    sim_state['hero_hand_strs'], sim_state['villain_hand_strs'],
-                    sim_state['board_strs']
-                )
-                sim_state = _end_hand(sim_state, winner)
-            else:
-                sim_state = _advance_street(sim_state)
-                sim_state = _process_new_street(sim_state)
+            sim_state = _close_street(sim_state)
         else:
             # Hero is OOP, checked → villain acts
-            sim_state['street_to_act'] = 'villain'
+            sim_state.street_to_act = 'villain'
             sim_state = _run_villain_turn(sim_state)
 
     else:
@@ -686,51 +852,48 @@ def sim_action():
         if street == 'preflop':
             bet_amount = OPEN_RAISE if not facing_bet else THREE_BET
         else:
-            bet_amount = apply_bet_amount(sim_state['pot'], hero_action)
+            bet_amount = apply_bet_amount(sim_state.pot, hero_action)
 
-        additional = bet_amount - sim_state['hero_street_invested']
-        additional = min(additional, sim_state['hero_stack'])
-        sim_state['hero_stack'] -= additional
-        sim_state['hero_total_invested'] += additional
-        sim_state['hero_street_invested'] += additional
-        sim_state['pot'] += additional
-        sim_state['street_bet'] = sim_state['hero_street_invested']
+        _invest_to(sim_state, 'hero', bet_amount)
+        sim_state.street_bet = sim_state.hero_street_invested
 
         # Villain responds
-        sim_state['street_to_act'] = 'villain'
+        sim_state.street_to_act = 'villain'
         sim_state = _run_villain_turn(sim_state)
 
-    available_actions = _sim_available_actions(sim_state) if not sim_state.get('hand_over') else []
-    return render_template('partials/sim_hand.html', sim_state=sim_state,
-                          available_actions=available_actions)
+    available_actions = _sim_available_actions(sim_state) if not sim_state.hand_over else []
+    return _render('partials/sim_hand.html', sim_state=sim_state,
+                  available_actions=available_actions)
 
 
 @app.route('/api/sim/next_hand', methods=['POST'])
 def sim_next_hand():
     """Deal next hand, alternate positions."""
-    sim_state = json.loads(request.form['sim_state'])
+    f = g.form
+    sim_state = _load_sim_state(f)
 
-    hero_stack = sim_state['hero_stack']
-    villain_stack = sim_state['villain_stack']
-    hand_number = sim_state['hand_number'] + 1
-    hero_is_sb = not sim_state['hero_is_sb']  # Alternate
-    session_log = sim_state['session_log']
+    hero_stack = sim_state.hero_stack
+    villain_stack = sim_state.villain_stack
+    hand_number = sim_state.hand_number + 1
+    hero_is_sb = not sim_state.hero_is_sb  # Alternate
 
     new_state = generate_sim_hand(hero_stack, villain_stack, hand_number, hero_is_sb)
-    new_state['session_log'] = session_log
+    new_state.session_stats = sim_state.session_stats
+    new_state.session_mistakes = sim_state.session_mistakes
 
     # If villain acts first preflop, run their action
-    if new_state['street_to_act'] == 'villain':
+    if new_state.street_to_act == 'villain':
         new_state = _run_villain_turn(new_state)
 
-    available_actions = _sim_available_actions(new_state) if not new_state.get('hand_over') else []
-    return render_template('partials/sim_hand.html', sim_state=new_state,
-                          available_actions=available_actions)
+    available_actions = _sim_available_actions(new_state) if not new_state.hand_over else []
+    return _render('partials/sim_hand.html', sim_state=new_state,
+                  available_actions=available_actions)
 
 
 @app.route('/api/sim/quit', methods=['POST'])
 def sim_quit():
     """End session and show review."""
-    sim_state = json.loads(request.form['sim_state'])
-    review = compute_session_review(sim_state['session_log'])
-    return render_template('partials/sim_review.html', review=review)
+    f = g.form
+    sim_state = _load_sim_state(f)
+    review = compute_session_review(sim_state.session_stats, sim_state.session_mistakes)
+    return _render('partials/sim_review.html', review=review)
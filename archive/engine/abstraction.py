@@ -1,8 +1,9 @@
 """Context-aware hand bucketing using treys evaluator + board texture."""
 
-from collections import Counter
-from treys import Card
-from engine.cards import EVALUATOR
+from functools import lru_cache
+from typing import NamedTuple
+
+from engine.cards import EVALUATOR, RANK_OF, SUIT_OF
 
 # 9 buckets — ordered strongest to weakest
 PREMIUM = 'premium'
@@ -42,69 +43,91 @@ BUCKET_EXAMPLES = {
 }
 
 
-def classify_hand(hand, board, texture=None):
-    """
-    Classify hand into one of 9 buckets.
-    Texture-aware: the same hand ranks differently on different boards.
-    """
-    if texture is None:
-        from engine.postflop import classify_texture
-        texture = classify_texture(board)
+class BoardCtx(NamedTuple):
+    """Board-level features shared by every hand classified on one board."""
+    cards: tuple        # sorted board ints
+    ranks: tuple        # board ranks, highest first
+    top: int
+    second: int         # -1 when the board is shorter
+    third: int
+    rank_mask: int      # bit r set for each board rank r
+    suit_counts: tuple  # see _suit_counts
+    max_suit: int       # most board cards of one suit
+    texture: str
+    is_scary: bool      # wet or monotone
 
-    score = EVALUATOR.evaluate(board, hand)
-    rank_class = EVALUATOR.get_rank_class(score)
-    # 0=Royal Flush, 1=Straight Flush, 2=Four of a Kind, 3=Full House,
-    # 4=Flush, 5=Straight, 6=Three of a Kind, 7=Two Pair, 8=Pair, 9=High Card
 
-    # --- Unbeatable / near-unbeatable ---
-    if rank_class <= 1:  # Royal flush, straight flush
-        return PREMIUM
-    if rank_class == 2:  # Quads
-        return PREMIUM
-    if rank_class == 3:  # Full house
-        return PREMIUM
+def make_board_ctx(board, texture=None):
+    """Build (or fetch) the BoardCtx for a board; computes texture if not given."""
+    return _board_ctx(tuple(sorted(board)), texture)
 
-    # --- Flush: depends on how high ---
-    if rank_class == 4:
-        return _classify_flush(hand, board, texture)
 
-    # --- Straight: depends on board texture and nut-ness ---
-    if rank_class == 5:
-        return _classify_straight(hand, board, texture)
+@lru_cache(maxsize=1 << 12)
+def _board_ctx(board, texture):
+    if texture is None:
+        from engine.postflop import classify_texture
+        texture = classify_texture(list(board))
+    ranks = tuple(sorted([RANK_OF[c] for c in board], reverse=True))
+    suit_counts = tuple(_suit_counts(board))
+    return BoardCtx(
+        cards=board,
+        ranks=ranks,
+        top=ranks[0],
+        second=ranks[1] if len(ranks) > 1 else -1,
+        third=ranks[2] if len(ranks) > 2 else -1,
+        rank_mask=_rank_mask(ranks),
+        suit_counts=suit_counts,
+        max_suit=max(suit_counts),
+        texture=texture,
+        is_scary=texture in ('wet', 'monotone'),
+    )
+
+
+def classify_hand(hand, board, texture=None, board_ctx=None):
+    """
+    Classify hand into one of 9 buckets.
+    Texture-aware: the same hand ranks differently on different boards.
+
+    Memoized on the sorted cards: simulate mode re-classifies the same hand on
+    the same board for every action of a street. Pass ``board_ctx`` from
+    make_board_ctx to skip the per-call board lookup.
+    """
+    if board_ctx is None:
+        board_ctx = _board_ctx(tuple(sorted(board)), texture)
+    a, b = hand
+    return _classify_cached((a, b) if a <= b else (b, a), board_ctx)
 
-    # --- Three of a kind (set or trips): heavily texture-dependent ---
-    if rank_class == 6:
-        return _classify_trips(hand, board, texture)
 
-    # --- Two pair ---
-    if rank_class == 7:
-        return _classify_two_pair(hand, board, texture)
+@lru_cache(maxsize=1 << 17)
+def _classify_cached(hand, ctx):
+    """classify_hand keyed on the sorted hand and the board's BoardCtx."""
+    score = EVALUATOR.evaluate(list(ctx.cards), list(hand))
+    return _DISPATCH[EVALUATOR.get_rank_class(score)](hand, ctx)
 
-    # --- One pair ---
-    if rank_class == 8:
-        return _classify_pair(hand, board, texture)
 
-    # --- High card: check for draws ---
-    return _classify_unmade(hand, board, texture)
+classify_hand.cache_clear = _classify_cached.cache_clear
 
 
 # ================================================================
 # Made hand sub-classifiers
 # ================================================================
 
-def _classify_flush(hand, board, texture):
+def _classify_premium(hand, ctx):
+    """Unbeatable / near-unbeatable: full house or better."""
+    return PREMIUM
+
+
+def _classify_flush(hand, ctx):
     """Nut flush vs non-nut flush."""
     # Find the flush suit
-    all_cards = hand + board
-    suits = [Card.get_suit_int(c) for c in all_cards]
-    suit_counts = Counter(suits)
-    flush_suit = max(suit_counts, key=suit_counts.get)
+    suit_counts = _suit_counts(hand, ctx.suit_counts)
+    flush_suit = suit_counts.index(max(suit_counts))
 
     # Get ranks of our hole cards in the flush suit
     hero_flush_ranks = []
     for c in hand:
-        if Card.get_suit_int(c) == flush_suit:
-            hero_flush_ranks.append(Card.get_rank_int(c))
+        if SUIT_OF[c] == flush_suit:
+            hero_flush_ranks.append(RANK_OF[c])
 
     if not hero_flush_ranks:
         # Board flush — we don't really "have" it, treat as the board's hand
@@ -118,16 +141,14 @@ def _classify_flush(hand, board, texture):
     return STRONG  # Low flush — vulnerable to higher flushes
 
 
-def _classify_straight(hand, board, texture):
+def _classify_straight(hand, ctx):
     """Nut straight vs non-nut, texture-aware."""
-    hand_ranks = sorted([Card.get_rank_int(c) for c in hand], reverse=True)
-    board_ranks = sorted([Card.get_rank_int(c) for c in board], reverse=True)
+    hand_ranks = [RANK_OF[c] for c in hand]
 
     # Check if we're using both hole cards (stronger) or just one
-    all_ranks = sorted([Card.get_rank_int(c) for c in hand + board], reverse=True)
-    uses_both = _straight_uses_both(hand_ranks, board_ranks)
+    uses_both = _straight_uses_both(hand_ranks, ctx.rank_mask)
 
-    is_wet = texture in ('wet', 'monotone')
+    is_wet = ctx.is_scary
 
     if uses_both:
         # Two-card straight with both hole cards — strong
@@ -141,40 +162,28 @@ def _classify_straight(hand, board, texture):
         return STRONG
 
 
-def _straight_uses_both(hand_ranks, board_ranks):
+def _straight_uses_both(hand_ranks, board_rank_mask):
     """Heuristic: if both hole cards are needed for the straight."""
     # If either hole card is also a board rank, we only "need" one
-    return not any(hr in board_ranks for hr in hand_ranks)
+    h0, h1 = hand_ranks
+    return not ((board_rank_mask >> h0) | (board_rank_mask >> h1)) & 1
 
 
-def _classify_trips(hand, board, texture):
+def _classify_trips(hand, ctx):
     """
     Set vs trips, top vs bottom, texture-aware.
     Set = pocket pair + board match. Trips = one in hand + board pair.
     """
-    hand_ranks = [Card.get_rank_int(c) for c in hand]
-    board_ranks = sorted([Card.get_rank_int(c) for c in board], reverse=True)
-    top_board = board_ranks[0]
+    hand_ranks = [RANK_OF[c] for c in hand]
+    top_board = ctx.top
 
     is_set = hand_ranks[0] == hand_ranks[1]  # Pocket pair
-    trip_rank = hand_ranks[0] if is_set else None
-    if not is_set:
-        # Find which rank makes trips
-        board_rank_counts = Counter(board_ranks)
-        for r, cnt in board_rank_counts.items():
-            if cnt >= 2 and r in hand_ranks:
-                trip_rank = r
-                break
-            if cnt >= 2:
-                # Board trips, we don't have it
-                trip_rank = r
-                break
-
-    is_scary = texture in ('wet', 'monotone')
+
+    is_scary = ctx.is_scary
 
     if is_set:
         # Sets are hidden and strong
-        if trip_rank == top_board:
+        if hand_ranks[0] == top_board:
             # Top set
             if is_scary:
                 return NUT  # Top set on wet — great but draws are out there
@@ -191,19 +200,18 @@ def _classify_trips(hand, board, texture):
         return STRONG
 
 
-def _classify_two_pair(hand, board, texture):
+def _classify_two_pair(hand, ctx):
     """Top two vs bottom two, texture-aware."""
-    hand_ranks = sorted([Card.get_rank_int(c) for c in hand], reverse=True)
-    board_ranks = sorted([Card.get_rank_int(c) for c in board], reverse=True)
-    top_board = board_ranks[0]
-    second_board = board_ranks[1] if len(board_ranks) > 1 else 0
+    hand_ranks = _ranks_desc(hand)
+    top_board = ctx.top
+    second_board = ctx.second
 
-    is_scary = texture in ('wet', 'monotone')
+    is_scary = ctx.is_scary
 
     # Check if both hole cards pair board cards
-    hero_paired = [hr for hr in hand_ranks if hr in board_ranks]
+    both_paired = (ctx.rank_mask >> hand_ranks[0]) & (ctx.rank_mask >> hand_ranks[1]) & 1
 
-    if len(hero_paired) >= 2:
+    if both_paired:
         # True two pair using both hole cards
         if hand_ranks[0] == top_board and hand_ranks[1] == second_board:
             # Top two pair
@@ -227,15 +235,14 @@ def _classify_two_pair(hand, board, texture):
         return STRONG
 
 
-def _classify_pair(hand, board, texture):
+def _classify_pair(hand, ctx):
     """Overpair / top pair / middle pair / bottom pair — very granular."""
-    hand_ranks = sorted([Card.get_rank_int(c) for c in hand], reverse=True)
-    board_ranks = sorted([Card.get_rank_int(c) for c in board], reverse=True)
-    top_board = board_ranks[0]
-    second_board = board_ranks[1] if len(board_ranks) > 1 else -1
-    third_board = board_ranks[2] if len(board_ranks) > 2 else -1
+    hand_ranks = _ranks_desc(hand)
+    top_board = ctx.top
+    second_board = ctx.second
+    third_board = ctx.third
 
-    is_scary = texture in ('wet', 'monotone')
+    is_scary = ctx.is_scary
 
     # --- Overpair: pocket pair above all board cards ---
     if hand_ranks[0] == hand_ranks[1] and hand_ranks[0] > top_board:
@@ -268,7 +275,7 @@ def _classify_pair(hand, board, texture):
     # --- Middle pair ---
     if hand_ranks[0] == second_board or hand_ranks[1] == second_board:
         # Check for draws to upgrade
-        draw = _check_draws(hand, board)
+        draw = _check_draws(hand, ctx)
         if draw == DRAW:
             return DRAW  # Middle pair + flush draw plays as a draw
         return MEDIUM if not is_scary else WEAK_MADE
@@ -284,7 +291,7 @@ def _classify_pair(hand, board, texture):
         return WEAK_MADE
 
     # Small pair with a draw
-    draw = _check_draws(hand, board)
+    draw = _check_draws(hand, ctx)
     if draw:
         return draw
     return WEAK_MADE
@@ -294,32 +301,51 @@ def _classify_pair(hand, board, texture):
 # Draw classifiers
 # ================================================================
 
-def _classify_unmade(hand, board, texture):
+def _classify_unmade(hand, ctx):
     """For unpaired hands: check draws, then overcards, then air."""
-    draw = _check_draws(hand, board)
+    draw = _check_draws(hand, ctx)
     if draw:
         return draw
 
     # Overcards (A or K high, unpaired) — very marginal but not pure air
-    hand_ranks = sorted([Card.get_rank_int(c) for c in hand], reverse=True)
-    board_ranks = sorted([Card.get_rank_int(c) for c in board], reverse=True)
-    if hand_ranks[0] > board_ranks[0]:
+    hand_ranks = _ranks_desc(hand)
+    if hand_ranks[0] > ctx.top:
         # We have an overcard — slight equity
         return WEAK_DRAW if hand_ranks[0] >= 11 else AIR  # K+ overcards
 
     return AIR
 
 
-def _check_draws(hand, board):
-    """Detect flush draws, straight draws, combo draws."""
-    all_cards = hand + board
-    suits = [Card.get_suit_int(c) for c in all_cards]
-    ranks = sorted(set(Card.get_rank_int(c) for c in all_cards))
+# Sub-classifier per treys rank class.
+_DISPATCH = (
+    _classify_premium,   # 0 Royal flush
+    _classify_premium,   # 1 Straight flush
+    _classify_premium,   # 2 Quads
+    _classify_premium,   # 3 Full house
+    _classify_flush,     # 4 Flush: depends on how high
+    _classify_straight,  # 5 Straight: depends on board texture and nut-ness
+    _classify_trips,     # 6 Set or trips: heavily texture-dependent
+    _classify_two_pair,  # 7 Two pair
+    _classify_pair,      # 8 One pair
+    _classify_unmade,    # 9 High card: check for draws
+)
 
-    suit_counts = Counter(suits)
-    has_flush_draw = any(count == 4 for count in suit_counts.values())
-    has_oesd = _has_open_ended(ranks)
-    has_gutshot = _has_gutshot(ranks)
+
+def _check_draws(hand, ctx):
+    """Detect flush draws, straight draws, combo draws."""
+    rank_mask = ctx.rank_mask
+    for c in hand:
+        rank_mask |= 1 << RANK_OF[c]
+
+    # Suit totals for the hole cards' suits, read off the board counts. A
+    # 4-suited board only matters when we hold none of that suit (holding one
+    # is a made flush, which never reaches here); likewise a monotone flop.
+    s0, s1 = SUIT_OF[hand[0]], SUIT_OF[hand[1]]
+    paired = s0 == s1
+    t0 = ctx.suit_counts[s0] + 1 + paired
+    t1 = ctx.suit_counts[s1] + 1 + paired
+    has_flush_draw = t0 == 4 or t1 == 4 or ctx.max_suit == 4
+    has_oesd, has_gutshot = _straight_draws(rank_mask)
 
     # Combo draw — flush draw + straight draw
     if has_flush_draw and (has_oesd or has_gutshot):
@@ -332,13 +358,47 @@ def _check_draws(hand, board):
         return WEAK_DRAW
 
     # Backdoor flush (flop only)
-    if len(board) == 3:
-        if any(count == 3 for count in suit_counts.values()):
+    if len(ctx.ranks) == 3:
+        if t0 == 3 or t1 == 3 or ctx.max_suit == 3:
             return WEAK_DRAW
 
     return None
 
 
+def _ranks_desc(hand):
+    """Hole-card ranks, highest first: a two-element sort without sorted()."""
+    a, b = RANK_OF[hand[0]], RANK_OF[hand[1]]
+    return (a, b) if a >= b else (b, a)
+
+
+def _suit_counts(cards, base=None):
+    """Cards per suit, indexed by treys suit bit (1, 2, 4, 8) read off the int.
+
+    ``base`` seeds the counts, e.g. with a BoardCtx's board counts.
+    """
+    counts = list(base) if base else [0] * 9
+    for c in cards:
+        counts[(c >> 12) & 0xF] += 1
+    return counts
+
+
+def _rank_mask(ranks):
+    mask = 0
+    for r in ranks:
+        mask |= 1 << r
+    return mask
+
+
+@lru_cache(maxsize=None)
+def _straight_draws(rank_mask):
+    """(open-ended, gutshot) for a 13-bit rank mask.
+
+    At most 7 of 13 ranks, so a few thousand keys cover every input.
+    """
+    ranks = [r for r in range(13) if rank_mask >> r & 1]
+    return _has_open_ended(ranks), _has_gutshot(ranks)
+
+
 def _has_open_ended(sorted_ranks):
     """4 consecutive ranks, open on both ends."""
     extended = sorted_ranks[:]
@@ -1,3 +1,5 @@
+import sys
+
 from treys import Card, Deck, Evaluator
 
 EVALUATOR = Evaluator()
@@ -8,11 +10,16 @@ SUIT_MAP = {1: 's', 2: 'h', 4: 'd', 8: 'c'}
 SUIT_SYMBOLS = {1: '\u2660', 2: '\u2665', 4: '\u2666', 8: '\u2663'}
 SUIT_COLORS = {1: 'black', 2: 'red', 4: 'red', 8: 'black'}
 
+# Rank (0-12) and suit bit (1, 2, 4, 8) per treys card int; a dict lookup is
+# cheaper than the Card.get_*_int calls in the classifier hot paths.
+RANK_OF = {c: Card.get_rank_int(c) for c in Deck.GetFullDeck()}
+SUIT_OF = {c: Card.get_suit_int(c) for c in Deck.GetFullDeck()}
 
-def card_to_dict(card_int):
-    """Convert treys card int to display dict for templates."""
-    rank_int = Card.get_rank_int(card_int)
-    suit_int = Card.get_suit_int(card_int)
+
+def _card_dict(card_int):
+    """Build the template display dict for a treys card int."""
+    rank_int = RANK_OF[card_int]
+    suit_int = SUIT_OF[card_int]
     return {
         'rank': RANK_MAP[rank_int],
         'suit': SUIT_MAP[suit_int],
@@ -22,12 +29,24 @@ def card_to_dict(card_int):
     }
 
 
-def hand_to_key(card1_int, card2_int):
-    """Convert two hole cards to canonical preflop key like 'AKs', 'QJo', '88'."""
-    r1 = Card.get_rank_int(card1_int)
-    r2 = Card.get_rank_int(card2_int)
-    s1 = Card.get_suit_int(card1_int)
-    s2 = Card.get_suit_int(card2_int)
+# Per-card tables over the 52 treys ints; DICT_OF entries are shared, so
+# treat them as read-only.
+STR_OF = {c: Card.int_to_str(c) for c in Deck.GetFullDeck()}
+INT_OF = {s: c for c, s in STR_OF.items()}
+DICT_OF = {c: _card_dict(c) for c in STR_OF}
+
+
+def card_to_dict(card_int):
+    """Convert treys card int to display dict for templates (shared, read-only)."""
+    return DICT_OF[card_int]
+
+
+def _hand_key(card1_int, card2_int):
+    """Canonical preflop key for two hole cards, built from their ranks/suits."""
+    r1 = RANK_OF[card1_int]
+    r2 = RANK_OF[card2_int]
+    s1 = SUIT_OF[card1_int]
+    s2 = SUIT_OF[card2_int]
     high, low = max(r1, r2), min(r1, r2)
     high_c = RANK_MAP[high]
     low_c = RANK_MAP[low]
@@ -39,6 +58,68 @@ def hand_to_key(card1_int, card2_int):
         return f"{high_c}{low_c}o"
 
 
+# Preflop key for every ordered pair of card ints (52 * 52 entries)
+_HAND_KEY = {(c1, c2): sys.intern(_hand_key(c1, c2))
+             for c1 in RANK_OF for c2 in RANK_OF}
+
+
+def hand_to_key(card1_int, card2_int):
+    """Convert two hole cards to canonical preflop key like 'AKs', 'QJo', '88'.
+
+    Keys are interned: there are only 169, and range lookups compare them often.
+    """
+    return _HAND_KEY[card1_int, card2_int]
+
+
+def describe_deal(hand, board=()):
+    """(hand display dicts, board display dicts, preflop key) for a deal.
+
+    One pass over the per-card tables; the dicts are shared and read-only.
+    """
+    return ([DICT_OF[c] for c in hand], [DICT_OF[c] for c in board],
+            _HAND_KEY[hand[0], hand[1]])
+
+
+# Packed card codes: one byte per card holding rank*4 + suit + 1 (0 = no card),
+# first card in the lowest byte. Hole cards plus a full board fit in 56 bits.
+_SUIT_ORDER = (1, 2, 4, 8)
+_CODE_TO_INT = [0] + [Card.new(RANK_MAP[r] + SUIT_MAP[s])
+                      for r in range(13) for s in _SUIT_ORDER]
+_INT_TO_CODE = {c: code for code, c in enumerate(_CODE_TO_INT) if code}
+_CODE_TO_DICT = [None] + [DICT_OF[c] for c in _CODE_TO_INT[1:]]
+
+
+def pack_cards(card_ints):
+    """Pack treys card ints into a single int, one byte per card."""
+    packed = 0
+    for i, c in enumerate(card_ints):
+        packed |= _INT_TO_CODE[c] << (8 * i)
+    return packed
+
+
+def first_cards(packed, n):
+    """Keep only the first n cards of a packed card int."""
+    return packed & ((1 << (8 * n)) - 1)
+
+
+def unpack_card_ints(packed):
+    """Unpack a packed card int into treys card ints."""
+    cards = []
+    while packed:
+        cards.append(_CODE_TO_INT[packed & 0xFF])
+        packed >>= 8
+    return cards
+
+
+def unpack_cards(packed):
+    """Unpack a packed card int into card display dicts (shared, read-only)."""
+    cards = []
+    while packed:
+        cards.append(_CODE_TO_DICT[packed & 0xFF])
+        packed >>= 8
+    return cards
+
+
 def deal_hand(num_board=0):
     """Deal hole cards and optional board cards."""
     deck = Deck()
@@ -1,5 +1,8 @@
 """Check user answers and generate feedback."""
 
+import sys
+from functools import lru_cache
+
 from engine.abstraction import BUCKET_EXAMPLES
 from engine.postflop import get_correct_actions
 from engine.range_analysis import compute_range_vs_range
@@ -14,17 +17,29 @@ def evaluate_preflop(user_action, scenario):
     borderline hands.
     """
     correct = scenario['correct_action']
-    hand_key = scenario['hand_key']
+    hand_key = sys.intern(scenario['hand_key'])
     position = scenario['position']
     is_correct = user_action == correct
 
+    # Ranges arrive as lists; one set each serves the checks below and the
+    # 169-cell range grid the feedback template renders from them. Keys are
+    # interned like hand_to_key's, so lookups mostly match on identity.
+    full_range = frozenset(map(sys.intern, scenario.get('range') or ()))
+    raise_range = scenario.get('raise_range')
+    call_range = scenario.get('call_range')
+    if raise_range is not None:
+        raise_range = frozenset(map(sys.intern, raise_range))
+    if call_range is not None:
+        call_range = frozenset(map(sys.intern, call_range))
+
+    # Preflop scenarios are either RFI or facing an open
+    is_facing = scenario['type'] == 'preflop_facing'
+
     # Mixed strategy logic for facing-open scenarios
     is_acceptable = False
-    if scenario['type'] == 'preflop_facing':
-        raise_range = scenario.get('raise_range') or []
-        call_range = scenario.get('call_range') or []
-        in_raise = hand_key in raise_range
-        in_call = hand_key in call_range
+    if is_facing:
+        in_raise = hand_key in (raise_range or ())
+        in_call = hand_key in (call_range or ())
         in_range = in_raise or in_call
 
         if not is_correct:
@@ -33,7 +48,7 @@ def evaluate_preflop(user_action, scenario):
                 is_acceptable = True
             # Folding an in-range hand is wrong, raising/calling a fold hand is wrong
 
-    if scenario['type'] == 'preflop_rfi':
+    if not is_facing:
         if is_correct:
             explanation = (f"Correct! {hand_key} is a "
                           f"{correct} from {position}.")
@@ -66,9 +81,9 @@ def evaluate_preflop(user_action, scenario):
         'correct_action': correct,
         'explanation': explanation,
         'hand_key': hand_key,
-        'range': scenario.get('range', []),
-        'raise_range': scenario.get('raise_range'),
-        'call_range': scenario.get('call_range'),
+        'range': full_range,
+        'raise_range': raise_range,
+        'call_range': call_range,
     }
 
 
@@ -112,10 +127,44 @@ _BUCKET_THEORY = {
 }
 
 
-def generate_explanation(position, texture, bucket, strategy, rvr, facing_bet):
+# The texture / position / bucket theory points, titled once per context
+_TEXTURE_POINTS = {
+    texture: {
+        'title': f"{texture.replace('_', ' ').title()} board texture",
+        'body': body,
+        'category': 'texture',
+        'color': 'amber',
+    }
+    for texture, body in _TEXTURE_THEORY.items()
+}
+
+_POSITION_POINTS = {
+    (position, facing_bet): {
+        'title': f'Playing {position}' + (' facing a bet' if facing_bet else ''),
+        'body': body,
+        'category': 'position',
+        'color': 'blue',
+    }
+    for position, body in _POSITION_THEORY.items()
+    for facing_bet in (False, True)
+}
+
+_BUCKET_POINTS = {
+    bucket: {
+        'title': f'{bucket.replace("_", " ").title()} hand',
+        'body': body,
+        'category': 'hand_strength',
+        'color': 'purple',
+    }
+    for bucket, body in _BUCKET_THEORY.items()
+}
+
+def generate_explanation(position, texture, bucket, strategy, rvr, facing_bet,
+                         sorted_strat=None):
     """Generate theory explanation points for a postflop spot.
 
-    Returns a list of dicts with {title, body, category, color}.
+    ``sorted_strat`` is the strategy's items by frequency, if the caller
+    already has them. Returns a list of dicts with {title, body, category, color}.
     """
     points = []
 
@@ -141,38 +190,23 @@ def generate_explanation(position, texture, bucket, strategy, rvr, facing_bet):
             })
 
     # 2. Board texture
-    tex_theory = _TEXTURE_THEORY.get(texture)
-    if tex_theory:
-        tex_label = texture.replace('_', ' ').title()
-        points.append({
-            'title': f'{tex_label} board texture',
-            'body': tex_theory,
-            'category': 'texture',
-            'color': 'amber',
-        })
+    tex_point = _TEXTURE_POINTS.get(texture)
+    if tex_point:
+        points.append(dict(tex_point))
 
     # 3. Position
-    pos_theory = _POSITION_THEORY.get(position)
-    if pos_theory:
-        points.append({
-            'title': f'Playing {position}' + (' facing a bet' if facing_bet else ''),
-            'body': pos_theory,
-            'category': 'position',
-            'color': 'blue',
-        })
+    pos_point = _POSITION_POINTS.get((position, bool(facing_bet)))
+    if pos_point:
+        points.append(dict(pos_point))
 
     # 4. Hand strength
-    bucket_theory = _BUCKET_THEORY.get(bucket)
-    if bucket_theory:
-        points.append({
-            'title': f'{bucket.replace("_", " ").title()} hand',
-            'body': bucket_theory,
-            'category': 'hand_strength',
-            'color': 'purple',
-        })
+    bucket_point = _BUCKET_POINTS.get(bucket)
+    if bucket_point:
+        points.append(dict(bucket_point))
 
     # 5. Strategy type (pure vs mixed)
-    sorted_strat = sorted(strategy.items(), key=lambda x: -x[1])
+    if sorted_strat is None:
+        sorted_strat = _by_frequency(tuple(strategy.items()))
     top_freq = sorted_strat[0][1] if sorted_strat else 0
     if top_freq >= 0.95:
         points.append({
@@ -196,38 +230,68 @@ def generate_explanation(position, texture, bucket, strategy, rvr, facing_bet):
     return points
 
 
+@lru_cache(maxsize=1024)
+def _by_frequency(strategy_items):
+    """Strategy (action, freq) items, most frequent first."""
+    return tuple(sorted(strategy_items, key=lambda x: -x[1]))
+
+
+@lru_cache(maxsize=1024)
+def _strategy_text(strategy_items, label_items):
+    """(summary, labels) for a strategy: the 'Bet 66%: 55%, Check: 45%'
+    string, most frequent first, and each of its actions' display label."""
+    labels = dict(label_items)
+    action_labels = {a: labels.get(a, a) for a, _ in strategy_items}
+    summary = ', '.join(f"{action_labels[a]}: {p:.0%}"
+                        for a, p in _by_frequency(strategy_items))
+    return summary, action_labels
+
+
+@lru_cache(maxsize=1024)
+def _explanation_points(position, texture, bucket, sorted_strat, facing_bet):
+    """generate_explanation for one spot, built once per distinct input.
+
+    Range-vs-range depends only on (texture, position), so the key covers
+    every input. The point dicts are shared between calls; treat them as
+    read-only.
+    """
+    rvr = compute_range_vs_range(texture, position)
+    return tuple(generate_explanation(position, texture, bucket, dict(sorted_strat),
+                                      rvr, facing_bet, sorted_strat))
+
+
 def evaluate_postflop(user_action, scenario):
     """Evaluate a postflop answer."""
     strategy = scenario['strategy']
-    correct_actions = get_correct_actions(strategy)
+    # Worked out when the scenario was built and carried in its state
+    correct_actions = scenario.get('correct_actions') or get_correct_actions(strategy)
     is_correct = user_action in correct_actions
 
     # Also accept actions with >15% frequency as "acceptable"
     is_acceptable = False
+    user_freq = 0
     if not is_correct:
         user_freq = strategy.get(user_action, 0)
         if user_freq >= 0.15:
             is_acceptable = True
 
-    sorted_strat = sorted(strategy.items(), key=lambda x: -x[1])
-    strat_str = ', '.join(
-        f"{scenario['action_labels'].get(a, a)}: {p:.0%}"
-        for a, p in sorted_strat
-    )
+    strategy_items = tuple(strategy.items())
+    sorted_strat = _by_frequency(strategy_items)
+    strat_str, labels = _strategy_text(strategy_items,
+                                       tuple(scenario['action_labels'].items()))
 
     if is_correct:
         explanation = (f"Good play! With a {scenario['bucket']} hand "
                       f"on a {scenario['texture'].replace('_', ' ')} board. "
                       f"Strategy: {strat_str}")
     elif is_acceptable:
-        user_freq = strategy.get(user_action, 0)
-        best = scenario['action_labels'].get(correct_actions[0], correct_actions[0])
-        user_label = scenario['action_labels'].get(user_action, user_action)
+        best = labels.get(correct_actions[0], correct_actions[0])
+        user_label = labels[user_action]  # in the strategy, as user_freq > 0
         explanation = (f"Mixed spot. {user_label} at {user_freq:.0%} frequency "
                       f"is reasonable, but {best} is preferred. "
                       f"Strategy: {strat_str}")
     else:
-        best = scenario['action_labels'].get(correct_actions[0], correct_actions[0])
+        best = labels.get(correct_actions[0], correct_actions[0])
         explanation = (f"With a {scenario['bucket']} hand "
                       f"on a {scenario['texture'].replace('_', ' ')} board, "
                       f"prefer {best}. Strategy: {strat_str}")
@@ -238,10 +302,10 @@ def evaluate_postflop(user_action, scenario):
 
     # Generate explanation points
     facing_bet = scenario.get('facing_bet', False)
-    explanation_points = generate_explanation(
+    explanation_points = list(_explanation_points(
         position, scenario['texture'], scenario['bucket'],
-        strategy, rvr, facing_bet
-    )
+        sorted_strat, bool(facing_bet)
+    ))
 
     return {
         'is_correct': is_correct or is_acceptable,
@@ -5,10 +5,15 @@ generated by `python -m solve.generate`. Falls back to hand-tuned defaults
 if the JSON file doesn't exist.
 """
 
-import json
+import heapq
 import os
-from collections import Counter
-from treys import Card
+from bisect import bisect
+from functools import lru_cache
+from itertools import accumulate
+from operator import itemgetter
+
+import orjson
+from engine.cards import SUIT_OF
 
 # Board textures
 MONOTONE = 'monotone'
@@ -38,29 +43,45 @@ ACTION_LABELS = {
 }
 
 
+# One 4-bit counter per suit: summing a board's entries yields every suit
+# count in a single int (a board has at most 5 cards, so nibbles never carry)
+_SUIT_NIBBLE = {c: 1 << (4 * (SUIT_OF[c].bit_length() - 1)) for c in SUIT_OF}
+
+
+def _board_masks(board):
+    """(13-bit rank mask, packed suit counts) for a board of treys ints."""
+    rank_mask = 0
+    suit_nibbles = 0
+    for c in board:
+        rank_mask |= (c >> 16) & 0x1FFF  # treys keeps a one-hot rank at bit 16
+        suit_nibbles += _SUIT_NIBBLE[c]
+    return rank_mask, suit_nibbles
+
+
+def _is_connected(rank_mask):
+    """No gap of more than 2 between neighbouring ranks."""
+    spread = rank_mask >> ((rank_mask & -rank_mask).bit_length() - 1)
+    missing = ~spread & ((1 << spread.bit_length()) - 1)
+    return not missing & (missing >> 1)
+
+
 def classify_texture(board):
     """Classify board into one of 5 texture categories."""
-    ranks = [Card.get_rank_int(c) for c in board]
-    suits = [Card.get_suit_int(c) for c in board]
-
-    suit_counts = Counter(suits)
-    rank_counts = Counter(ranks)
+    rank_mask, suit_nibbles = _board_masks(board)
 
-    if max(suit_counts.values()) >= 3:
+    if (suit_nibbles + 0x1111) & 0x4444:  # some suit count >= 3
         return MONOTONE
 
-    if max(rank_counts.values()) >= 2:
+    if rank_mask.bit_count() < len(board):
         return PAIRED
 
-    sorted_ranks = sorted(ranks)
-    is_two_tone = max(suit_counts.values()) >= 2
-    max_gap = max(sorted_ranks[i + 1] - sorted_ranks[i] for i in range(len(sorted_ranks) - 1))
-    is_connected = max_gap <= 2
+    is_two_tone = (suit_nibbles + 0x2222) & 0x4444  # some suit count >= 2
+    is_connected = _is_connected(rank_mask)
 
     if is_two_tone and is_connected:
         return WET
 
-    high_count = sum(1 for r in ranks if r >= 8)  # T+
+    high_count = (rank_mask >> 8).bit_count()  # T+
     if high_count >= 2:
         return HIGH_DRY
     return LOW_DRY
@@ -281,22 +302,64 @@ FACING_BET = {
 }
 
 
+# Fallback strategies for contexts missing from the tables; shared, so treat
+# them as read-only (plain dicts, as scenario state serializes them)
+_DEFAULT_FACING = {'fold': 0.5, 'call': 0.5}
+_DEFAULT_CHECK = {'check': 1.0}
+
+
 def get_strategy(position, texture, bucket, facing_bet=False):
     """Look up strategy for a given context."""
     if facing_bet:
-        return FACING_BET.get((texture, bucket), {'fold': 0.5, 'call': 0.5})
+        return FACING_BET.get((texture, bucket), _DEFAULT_FACING)
     if position == 'OOP':
-        return OOP_STRATEGY.get(('OOP', texture, bucket), {'check': 1.0})
-    return IP_VS_CHECK.get(('IP', texture, bucket), {'check': 1.0})
+        return OOP_STRATEGY.get(('OOP', texture, bucket), _DEFAULT_CHECK)
+    return IP_VS_CHECK.get(('IP', texture, bucket), _DEFAULT_CHECK)
+
+
+@lru_cache(maxsize=None)
+def _strategy_cdf(position, texture, bucket, facing_bet):
+    """(actions, cumulative weights) of a strategy, for bisect sampling."""
+    strategy = get_strategy(position, texture, bucket, facing_bet=facing_bet)
+    return tuple(strategy), tuple(accumulate(strategy.values()))
+
+
+def sample_action(position, texture, bucket, facing_bet, u):
+    """Draw an action from a context's strategy, given uniform u in [0, 1).
+
+    Returns None when the strategy has no weight.
+    """
+    actions, cum_weights = _strategy_cdf(position, texture, bucket, facing_bet)
+    if not cum_weights or cum_weights[-1] == 0:
+        return None
+    return actions[bisect(cum_weights, u * cum_weights[-1], 0, len(actions) - 1)]
 
 
 def get_correct_actions(strategy):
     """Determine acceptable actions from a mixed strategy."""
-    sorted_actions = sorted(strategy.items(), key=lambda x: -x[1])
+    return list(_correct_actions(tuple(strategy.items())))
+
+
+def get_correct_actions_for(position, texture, bucket, facing_bet=False):
+    """get_correct_actions for the strategy get_strategy returns for a context."""
+    return list(_context_correct_actions(position, texture, bucket, facing_bet))
+
+
+@lru_cache(maxsize=None)
+def _context_correct_actions(position, texture, bucket, facing_bet):
+    strategy = get_strategy(position, texture, bucket, facing_bet=facing_bet)
+    return _correct_actions(tuple(strategy.items()))
+
+
+@lru_cache(maxsize=512)
+def _correct_actions(strategy_items):
+    """get_correct_actions on a strategy's items; there are only a few
+    hundred distinct strategies, so each is sorted once."""
+    sorted_actions = heapq.nlargest(2, strategy_items, key=itemgetter(1))
     best_action, best_prob = sorted_actions[0]
 
     if best_prob >= 0.50:
-        return [best_action]
+        return (best_action,)
 
     # Mixed — accept top two if both substantial
     correct = [best_action]
@@ -304,7 +367,7 @@ def get_correct_actions(strategy):
         second_action, second_prob = sorted_actions[1]
         if second_prob >= 0.25:
             correct.append(second_action)
-    return correct
+    return tuple(correct)
 
 
 # ================================================================
@@ -314,8 +377,8 @@ def get_correct_actions(strategy):
 _DATA_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'strategies.json')
 
 if os.path.exists(_DATA_PATH):
-    with open(_DATA_PATH) as _f:
-        _SOLVED = json.load(_f)
+    with open(_DATA_PATH, 'rb') as _f:
+        _SOLVED = orjson.loads(_f.read())
 
     _strats = _SOLVED.get('strategies', {})
 
@@ -1,20 +1,36 @@
 """Range vs Range analysis using precomputed bucket probabilities and equity matrix."""
 
-import json
 import os
+from functools import lru_cache
+
+import orjson
 
 _DATA_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'strategies.json')
 _BUCKET_PROBS = {}
 _EQUITY_MATRIX = {}
 
 try:
-    with open(_DATA_PATH) as f:
-        _data = json.load(f)
+    with open(_DATA_PATH, 'rb') as f:
+        _data = orjson.loads(f.read())
     _BUCKET_PROBS = _data.get('bucket_probs', {})
     _EQUITY_MATRIX = _data.get('equity_matrix', {})
 except FileNotFoundError:
     pass
 
+# Per texture, the (hero bucket, villain bucket, equity) cells of the equity
+# matrix in the order the bucket distributions iterate, so the equity sum is
+# one flat loop with no membership tests
+_MATCHUPS = {
+    texture: tuple(
+        (hb, vb, _EQUITY_MATRIX[texture][hb][vb])
+        for hb in base_dist
+        for vb in base_dist
+        if hb in _EQUITY_MATRIX[texture] and vb in _EQUITY_MATRIX[texture].get(hb, {})
+    )
+    for texture, base_dist in _BUCKET_PROBS.items()
+    if texture in _EQUITY_MATRIX
+}
+
 # Positional tightness multipliers: tighter positions have more strong hands
 # Values represent how to skew the base distribution
 _POSITION_SKEW = {
@@ -37,6 +53,22 @@ def _apply_skew(base_dist, position):
     return adjusted
 
 
+# Skewed distribution per (texture, position), worked out once at load
+_SKEWED_DISTS = {
+    (texture, position): _apply_skew(base_dist, position)
+    for texture, base_dist in _BUCKET_PROBS.items()
+    for position in _POSITION_SKEW
+}
+
+
+def _skewed_dist(texture, position):
+    dist = _SKEWED_DISTS.get((texture, position))
+    if dist is None:
+        dist = _apply_skew(_BUCKET_PROBS[texture], position)
+    return dist
+
+
+@lru_cache(maxsize=32)
 def compute_range_vs_range(texture, hero_position):
     """Compute range vs range analysis for a given texture and position.
 
@@ -46,25 +78,22 @@ def compute_range_vs_range(texture, hero_position):
 
     Returns:
         dict with hero_dist, villain_dist, hero_equity, advantage_label, advantage_magnitude
-        or None if data unavailable
+        or None if data unavailable. Results are cached and shared between
+        callers, so treat them as read-only.
     """
-    if texture not in _BUCKET_PROBS or texture not in _EQUITY_MATRIX:
+    matchups = _MATCHUPS.get(texture)
+    if matchups is None:
         return None
 
-    base_dist = _BUCKET_PROBS[texture]
     villain_position = 'IP' if hero_position == 'OOP' else 'OOP'
 
-    hero_dist = _apply_skew(base_dist, hero_position)
-    villain_dist = _apply_skew(base_dist, villain_position)
-    equity_matrix = _EQUITY_MATRIX[texture]
+    hero_dist = _skewed_dist(texture, hero_position)
+    villain_dist = _skewed_dist(texture, villain_position)
 
     # Compute weighted equity: sum over all hero_bucket x villain_bucket matchups
     hero_equity = 0.0
-    for hb, hp in hero_dist.items():
-        for vb, vp in villain_dist.items():
-            if hb in equity_matrix and vb in equity_matrix.get(hb, {}):
-                eq = equity_matrix[hb][vb]
-                hero_equity += hp * vp * eq
+    for hb, vb, eq in matchups:
+        hero_equity += hero_dist[hb] * villain_dist[vb] * eq
 
     # Determine advantage
     diff = hero_equity - 0.5
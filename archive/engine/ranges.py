@@ -241,6 +241,15 @@ FACING_OPEN = {
     },
 }
 
+# Freeze the tables: they are shared by every module that reads them, and
+# every facing-open entry gets both keys so lookups need no set() default
+RFI_RANGES = {pos: frozenset(hands) for pos, hands in RFI_RANGES.items()}
+FACING_OPEN = {
+    matchup: {'raise': frozenset(r.get('raise', ())),
+              'call': frozenset(r.get('call', ()))}
+    for matchup, r in FACING_OPEN.items()
+}
+
 # 13x13 grid for display
 RANKS_DISPLAY = ['A', 'K', 'Q', 'J', 'T', '9', '8', '7', '6', '5', '4', '3', '2']
 
@@ -1,16 +1,81 @@
 """Random scenario generators for all game modes."""
 
+import os
 import random
+import threading
+from collections import deque
+from functools import lru_cache
+import orjson
 from treys import Card, Deck
-from engine.cards import hand_to_key, card_to_dict
+from engine.cards import describe_deal, pack_cards, unpack_card_ints
 from engine.ranges import POSITIONS, RFI_RANGES, FACING_OPEN
 from engine.abstraction import classify_hand, BUCKET_LABELS, BUCKETS
 from engine.postflop import (
-    classify_texture, get_strategy, get_correct_actions,
-    ACTION_LABELS, TEXTURE_LABELS,
+    classify_texture, get_strategy, get_correct_actions_for,
+    ACTION_LABELS, TEXTURE_LABELS, TEXTURES,
 )
 
 POSITION_ORDER = ['UTG', 'MP', 'CO', 'BTN', 'SB', 'BB']
+_POSITION_INDEX = {pos: i for i, pos in enumerate(POSITION_ORDER)}
+
+# Shared read-only deck; random.sample deals k distinct cards from it
+# without building and shuffling a treys Deck() per scenario.
+_FULL_DECK = tuple(Deck.GetFullDeck())
+
+# Choice pools and per-spot action lists/labels, shared by every scenario
+# (read-only; plain lists/dicts, as scenario state serializes them)
+_RFI_POSITIONS = ('UTG', 'MP', 'CO', 'BTN', 'SB')
+_HERO_POSITIONS = ('OOP', 'IP')
+_OOP_SEATS = ('UTG', 'MP', 'SB', 'BB')
+_IP_SEATS = ('CO', 'BTN')
+_POT_SIZES = (6, 8, 10, 12, 15, 20)
+_BET_SIZES = (3, 4, 5, 6, 7)
+
+_RFI_ACTIONS = ['raise', 'fold']
+_RFI_LABELS = {'raise': 'Raise', 'fold': 'Fold'}
+_FACING_OPEN_ACTIONS = ['raise', 'call', 'fold']
+_FACING_OPEN_LABELS = {'raise': '3-Bet', 'call': 'Call', 'fold': 'Fold'}
+_FACING_BET_ACTIONS = ['fold', 'call', 'raise']
+_FACING_BET_LABELS = {'fold': 'Fold', 'call': 'Call', 'raise': 'Raise'}
+_BET_ACTIONS = ['check', 'bet_s', 'bet_m', 'bet_l']
+_BET_LABELS = {'check': 'Check', 'bet_s': 'Bet 33%', 'bet_m': 'Bet 66%', 'bet_l': 'Bet 100%'}
+
+# Coin flips draw raw bits rather than a float: _rand_bits(1) is a 50/50
+# pick and _rand_bits(10) < 307 is true 307/1024 (~30%) of the time
+_rand_bits = random.getrandbits
+
+# Sorted range lists as scenarios carry them, built once per position /
+# matchup. Scenarios share these lists, so treat them as read-only.
+_RFI_SORTED = {pos: sorted(rng) for pos, rng in RFI_RANGES.items()}
+_FACING_SORTED = {
+    matchup: {
+        'raise': sorted(r['raise']),
+        'call': sorted(r['call']),
+        'combined': sorted(r['raise'] | r['call']),
+        'size': len(r['raise']) + len(r['call']),
+    }
+    for matchup, r in FACING_OPEN.items()
+}
+
+# Facing-open matchups per hero position, in FACING_OPEN order
+_FACING_BY_HERO = {}
+for _matchup in FACING_OPEN:
+    _FACING_BY_HERO.setdefault(_matchup[0], []).append(_matchup)
+_FACING_BY_HERO = {hero: tuple(m) for hero, m in _FACING_BY_HERO.items()}
+_ALL_MATCHUPS = tuple(FACING_OPEN)
+
+
+def seat_of(hero_position, position):
+    """Seat index of ``position`` in the layout built by ``build_seats``."""
+    return (_POSITION_INDEX[position] - _POSITION_INDEX[hero_position]) % 6
+
+
+# Per hero position: the positions clockwise from the hero (seat 0 first) and
+# the BTN's seat index
+_SEAT_TEMPLATES = {}
+for _hero in POSITION_ORDER:
+    _order = tuple(POSITION_ORDER[(_POSITION_INDEX[_hero] + i) % 6] for i in range(6))
+    _SEAT_TEMPLATES[_hero] = (_order, _order.index('BTN'))
 
 
 def build_seats(hero_position, hero_hand_cards=None, active_positions=None):
@@ -27,25 +92,16 @@ def build_seats(hero_position, hero_hand_cards=None, active_positions=None):
         seats_list is 6 dicts: {position, is_hero, is_active, cards}
         dealer_seat_index is the index (0-5) of the BTN seat
     """
-    hero_idx = POSITION_ORDER.index(hero_position)
-    # Seats go clockwise from hero: seat 0=hero, 1=next clockwise, ...
-    seats = []
-    dealer_seat = 0
-    for i in range(6):
-        pos = POSITION_ORDER[(hero_idx + i) % 6]
-        is_hero = (i == 0)
-        if active_positions is not None:
-            is_active = pos in active_positions
-        else:
-            is_active = True
-        seats.append({
-            'position': pos,
-            'is_hero': is_hero,
-            'is_active': is_active or is_hero,
-            'cards': hero_hand_cards if is_hero else None,
-        })
-        if pos == 'BTN':
-            dealer_seat = i
+    order, dealer_seat = _SEAT_TEMPLATES[hero_position]
+    seats = [{
+        'position': pos,
+        'is_hero': False,
+        'is_active': active_positions is None or pos in active_positions,
+        'cards': None,
+    } for pos in order]
+    hero_seat = seats[0]
+    hero_seat['is_hero'] = hero_seat['is_active'] = True
+    hero_seat['cards'] = hero_hand_cards
     return seats, dealer_seat
 
 
@@ -54,15 +110,13 @@ def generate_preflop_rfi(position=None):
     if position and position in RFI_RANGES:
         pass  # use specified position
     else:
-        position = random.choice(['UTG', 'MP', 'CO', 'BTN', 'SB'])
-    deck = Deck()
-    hand = deck.draw(2)
-    hand_key = hand_to_key(hand[0], hand[1])
+        position = random.choice(_RFI_POSITIONS)
+    hand = random.sample(_FULL_DECK, 2)
+    hand_cards, _, hand_key = describe_deal(hand)
 
     is_raise = hand_key in RFI_RANGES[position]
     correct = 'raise' if is_raise else 'fold'
 
-    hand_cards = [card_to_dict(c) for c in hand]
     seats, dealer_seat = build_seats(position, hand_cards)
 
     return {
@@ -73,12 +127,12 @@ def generate_preflop_rfi(position=None):
         'hand': hand_cards,
         'hand_key': hand_key,
         'correct_action': correct,
-        'range': sorted(RFI_RANGES[position]),
+        'range': _RFI_SORTED[position],
         'raise_range': None,
         'call_range': None,
         'range_size': len(RFI_RANGES[position]),
-        'actions': ['raise', 'fold'],
-        'action_labels': {'raise': 'Raise', 'fold': 'Fold'},
+        'actions': _RFI_ACTIONS,
+        'action_labels': _RFI_LABELS,
         'seats': seats,
         'dealer_seat': dealer_seat,
         'board': [],
@@ -87,26 +141,21 @@ def generate_preflop_rfi(position=None):
 
 def generate_preflop_facing(position=None):
     """Generate a facing-open scenario."""
-    matchups = list(FACING_OPEN.keys())
-    if position:
-        filtered = [(h, o) for h, o in matchups if h == position]
-        if filtered:
-            matchups = filtered
+    matchups = _FACING_BY_HERO.get(position) or _ALL_MATCHUPS
     hero_pos, opener_pos = random.choice(matchups)
 
-    deck = Deck()
-    hand = deck.draw(2)
-    hand_key = hand_to_key(hand[0], hand[1])
+    hand = random.sample(_FULL_DECK, 2)
+    hand_cards, _, hand_key = describe_deal(hand)
 
     ranges = FACING_OPEN[(hero_pos, opener_pos)]
-    if hand_key in ranges.get('raise', set()):
+    if hand_key in ranges['raise']:
         correct = 'raise'
-    elif hand_key in ranges.get('call', set()):
+    elif hand_key in ranges['call']:
         correct = 'call'
     else:
         correct = 'fold'
 
-    hand_cards = [card_to_dict(c) for c in hand]
+    sorted_ranges = _FACING_SORTED[(hero_pos, opener_pos)]
     active = {hero_pos, opener_pos}
     seats, dealer_seat = build_seats(hero_pos, hand_cards, active)
 
@@ -118,12 +167,12 @@ def generate_preflop_facing(position=None):
         'hand': hand_cards,
         'hand_key': hand_key,
         'correct_action': correct,
-        'raise_range': sorted(ranges.get('raise', set())),
-        'call_range': sorted(ranges.get('call', set())),
-        'range': sorted(ranges.get('raise', set()) | ranges.get('call', set())),
-        'range_size': len(ranges.get('raise', set())) + len(ranges.get('call', set())),
-        'actions': ['raise', 'call', 'fold'],
-        'action_labels': {'raise': '3-Bet', 'call': 'Call', 'fold': 'Fold'},
+        'raise_range': sorted_ranges['raise'],
+        'call_range': sorted_ranges['call'],
+        'range': sorted_ranges['combined'],
+        'range_size': sorted_ranges['size'],
+        'actions': _FACING_OPEN_ACTIONS,
+        'action_labels': _FACING_OPEN_LABELS,
         'seats': seats,
         'dealer_seat': dealer_seat,
         'board': [],
@@ -132,77 +181,218 @@ def generate_preflop_facing(position=None):
 
 def generate_preflop(position=None):
     """Generate a random preflop scenario (RFI or facing open)."""
-    if random.random() < 0.5:
+    if _rand_bits(1):
         return generate_preflop_rfi(position)
     return generate_preflop_facing(position)
 
 
+# --- Scenario pools ---
+# Each filter keeps a queue of ready scenarios. Requests take one from the
+# front and it is never served again; a background thread per process tops
+# the queue back up, so drills see the same unbounded random stream as
+# generating per request, while batch generation stays off the request path.
+POOL_SIZE = 1024
+_REFILL_BELOW = POOL_SIZE * 3 // 4   # top up once a quarter has been served
+_preflop_pools = {}
+_postflop_pools = {}
+
+_refill_wanted = threading.Event()
+_refill_lock = threading.Lock()
+_refill_pid = None   # process the refill thread runs in; threads don't survive fork
+
+# JSON-valued fields each drill form carries in its ``_state`` hidden input
+PREFLOP_STATE_KEYS = ('range', 'raise_range', 'call_range')
+POSTFLOP_STATE_KEYS = (
+    'strategy', 'correct_actions', 'action_labels', 'range_breakdown',
+    'hand', 'board', 'seats',
+)
+
+
+def encode_state(scenario, keys):
+    """Serialize the ``_state`` payload once so templates can emit it as-is."""
+    scenario['_state'] = orjson.dumps({k: scenario[k] for k in keys}).decode()
+    return scenario
+
+
+def _preflop_batch(n, position):
+    return [encode_state(generate_preflop(position), PREFLOP_STATE_KEYS)
+            for _ in range(n)]
+
+
+def _postflop_batch(n, key):
+    return [encode_state(scenario, POSTFLOP_STATE_KEYS)
+            for scenario in generate_postflop_batch(n, *key)]
+
+
+def _take(pools, key, make_batch):
+    """Pop the next scenario for ``key``, generating inline if its pool is dry."""
+    pool = pools.get(key)
+    if pool is None:
+        pool = pools.setdefault(key, deque(make_batch(POOL_SIZE, key)))
+    try:
+        scenario = pool.popleft()
+    except IndexError:
+        scenario = make_batch(1, key)[0]
+    if len(pool) < _REFILL_BELOW:
+        _start_refill_thread()
+        _refill_wanted.set()
+    return scenario
+
+
+def _start_refill_thread():
+    global _refill_pid
+    if _refill_pid == os.getpid():
+        return
+    with _refill_lock:
+        if _refill_pid != os.getpid():
+            threading.Thread(target=_refill_loop, name='scenario-refill',
+                             daemon=True).start()
+            _refill_pid = os.getpid()
+
+
+def _refill_loop():
+    """Top every pool back up to POOL_SIZE whenever one runs low."""
+    while True:
+        _refill_wanted.wait()
+        _refill_wanted.clear()
+        for pools, make_batch in ((_preflop_pools, _preflop_batch),
+                                  (_postflop_pools, _postflop_batch)):
+            for key, pool in list(pools.items()):
+                missing = POOL_SIZE - len(pool)
+                if missing > 0:
+                    pool.extend(make_batch(missing, key))
+
+
+def pooled_preflop(position=None):
+    """Return a fresh random preflop scenario for this filter.
+
+    Unknown filter values fall back to the unfiltered pool, so the set of
+    pools stays fixed no matter what clients send.
+    """
+    if position not in POSITIONS:
+        position = None
+    return _take(_preflop_pools, position, _preflop_batch)
+
+
+def pooled_postflop(position=None, texture=None):
+    """Return a fresh random postflop scenario for this filter.
+
+    As in pooled_preflop, unknown filter values mean "no filter".
+    """
+    if position not in _HERO_POSITIONS:
+        position = None
+    if texture not in TEXTURES:
+        texture = None
+    return _take(_postflop_pools, (position, texture), _postflop_batch)
+
+
+def warm_pools():
+    """Fill every filter's pool up front (call once at app startup)."""
+    for position in (None, *POSITIONS):
+        _preflop_pools.setdefault(position, deque(_preflop_batch(POOL_SIZE, position)))
+    for position in (None, *_HERO_POSITIONS):
+        for texture in (None, *TEXTURES):
+            key = (position, texture)
+            _postflop_pools.setdefault(key, deque(_postflop_batch(POOL_SIZE, key)))
+
+
 # --- Position-to-OOP/IP mapping for play mode ---
-IP_POSITIONS = {'BTN', 'CO'}
-OOP_POSITIONS = {'UTG', 'MP', 'SB', 'BB'}
+IP_POSITIONS = frozenset({'BTN', 'CO'})
+OOP_POSITIONS = frozenset({'UTG', 'MP', 'SB', 'BB'})
+
+
+@lru_cache(maxsize=2 * len(TEXTURES) * 2)  # position x texture x facing_bet
+def _range_breakdown(position, texture, facing_bet):
+    """Strategy per bucket for one spot, shared between scenarios (read-only)."""
+    return {b: get_strategy(position, texture, b, facing_bet=facing_bet)
+            for b in BUCKETS}
 
 
 def generate_postflop(position=None, texture=None):
     """Generate a postflop decision scenario."""
     if position not in ('OOP', 'IP'):
-        position = random.choice(['OOP', 'IP'])
+        position = random.choice(_HERO_POSITIONS)
 
     # Deal hand + board, retry up to 100 times for texture match
     for _ in range(100):
-        deck = Deck()
-        hand = deck.draw(2)
-        board = deck.draw(3)
+        cards = random.sample(_FULL_DECK, 5)
+        hand = cards[:2]
+        board = cards[2:]
         actual_texture = classify_texture(board)
         if texture is None or actual_texture == texture:
             break
-    texture = actual_texture
+    return _postflop_scenario(position, hand, board, actual_texture)
+
+
+def generate_postflop_batch(n, position=None, texture=None):
+    """Generate n postflop scenarios, as n generate_postflop calls would.
+
+    Deals are drawn in one pass and filtered by texture as they come, so a
+    rare texture costs one classify_texture per rejected deal rather than a
+    retry loop per scenario. As in generate_postflop, a texture that is not
+    dealt within 100 tries per scenario is given up on.
+    """
+    deals = []
+    for _ in range(100 * n if texture is not None else n):
+        cards = random.sample(_FULL_DECK, 5)
+        board = cards[2:]
+        actual_texture = classify_texture(board)
+        if texture is None or actual_texture == texture:
+            deals.append((cards[:2], board, actual_texture))
+            if len(deals) == n:
+                break
+    while len(deals) < n:
+        cards = random.sample(_FULL_DECK, 5)
+        deals.append((cards[:2], cards[2:], classify_texture(cards[2:])))
+
+    fixed = position if position in ('OOP', 'IP') else None
+    return [_postflop_scenario(fixed or random.choice(_HERO_POSITIONS), hand, board, tex)
+            for hand, board, tex in deals]
+
+
+def _postflop_scenario(position, hand, board, texture):
+    """Build a postflop scenario for a dealt hand and board."""
     bucket = classify_hand(hand, board, texture)
 
     # Randomly decide if facing a bet or acting first
-    facing_bet = random.random() < 0.3
+    facing_bet = _rand_bits(10) < 307
     strategy = get_strategy(position, texture, bucket, facing_bet=facing_bet)
-    correct_actions = get_correct_actions(strategy)
+    correct_actions = get_correct_actions_for(position, texture, bucket, facing_bet)
 
     if facing_bet:
-        actions = ['fold', 'call', 'raise']
-        action_labels = {'fold': 'Fold', 'call': 'Call', 'raise': 'Raise'}
+        actions = _FACING_BET_ACTIONS
+        action_labels = _FACING_BET_LABELS
         situation = f'{position} facing bet on {texture.replace("_", " ")} board'
     elif position == 'OOP':
-        actions = ['check', 'bet_s', 'bet_m', 'bet_l']
-        action_labels = {'check': 'Check', 'bet_s': 'Bet 33%', 'bet_m': 'Bet 66%', 'bet_l': 'Bet 100%'}
+        actions = _BET_ACTIONS
+        action_labels = _BET_LABELS
         situation = f'OOP first to act on {texture.replace("_", " ")} board'
     else:
-        actions = ['check', 'bet_s', 'bet_m', 'bet_l']
-        action_labels = {'check': 'Check', 'bet_s': 'Bet 33%', 'bet_m': 'Bet 66%', 'bet_l': 'Bet 100%'}
+        actions = _BET_ACTIONS
+        action_labels = _BET_LABELS
         situation = f'IP after check on {texture.replace("_", " ")} board'
 
     # Build range breakdown for all buckets
-    range_breakdown = {}
-    for b in BUCKETS:
-        s = get_strategy(position, texture, b, facing_bet=facing_bet)
-        range_breakdown[b] = s
+    range_breakdown = _range_breakdown(position, texture, facing_bet)
 
     # Map OOP/IP to table positions for visual
-    hand_cards = [card_to_dict(c) for c in hand]
-    board_cards = [card_to_dict(c) for c in board]
+    hand_cards, board_cards, hand_key = describe_deal(hand, board)
     if position == 'OOP':
-        hero_pos = random.choice(['UTG', 'MP', 'SB', 'BB'])
-        villain_pos = random.choice(['CO', 'BTN'])
+        hero_pos = random.choice(_OOP_SEATS)
+        villain_pos = random.choice(_IP_SEATS)
     else:
-        hero_pos = random.choice(['CO', 'BTN'])
-        villain_pos = random.choice(['UTG', 'MP', 'SB', 'BB'])
+        hero_pos = random.choice(_IP_SEATS)
+        villain_pos = random.choice(_OOP_SEATS)
     active = {hero_pos, villain_pos}
     seats, dealer_seat = build_seats(hero_pos, hand_cards, active)
-    pot = random.choice([6, 8, 10, 12, 15, 20])
+    villain_idx = seat_of(hero_pos, villain_pos)
+    pot = random.choice(_POT_SIZES)
 
     # Chip bets: show villain's bet when facing a bet
     bets = None
     if facing_bet:
-        villain_seat_idx = next(
-            i for i, s in enumerate(seats) if s['position'] == villain_pos
-        )
-        bet_size = random.choice([3, 4, 5, 6, 7])
-        bets = {villain_seat_idx: f'{bet_size} BB'}
+        bet_size = random.choice(_BET_SIZES)
+        bets = {villain_idx: f'{bet_size} BB'}
 
     return {
         'type': 'postflop',
@@ -210,7 +400,7 @@ def generate_postflop(position=None, texture=None):
         'situation': situation,
         'facing_bet': facing_bet,
         'hand': hand_cards,
-        'hand_key': hand_to_key(hand[0], hand[1]),
+        'hand_key': hand_key,
         'board': board_cards,
         'texture': texture,
         'texture_label': TEXTURE_LABELS[texture],
@@ -224,6 +414,7 @@ def generate_postflop(position=None, texture=None):
         'pot': pot,
         'seats': seats,
         'dealer_seat': dealer_seat,
+        'villain_idx': villain_idx,
         'bets': bets,
     }
 
@@ -233,51 +424,61 @@ def dict_to_card_int(card_dict):
     return Card.new(card_dict['str'])
 
 
-def compute_street_data(hand_dicts, board_dicts, position):
+def compute_street_data(hand_packed, board_packed, position):
     """Compute postflop strategy data for a given board length.
 
     Works for flop (3 cards), turn (4 cards), or river (5 cards).
 
     Args:
-        hand_dicts: list of 2 card display dicts
-        board_dicts: list of 3-5 card display dicts
+        hand_packed: the 2 hole cards as a packed card int (see engine.cards)
+        board_packed: the 3-5 visible board cards as a packed card int
         position: 'OOP' or 'IP'
 
     Returns:
         dict with texture, bucket, strategy, actions, etc.
     """
-    hand_ints = [dict_to_card_int(c) for c in hand_dicts]
-    board_ints = [dict_to_card_int(c) for c in board_dicts]
+    facing_bet = _rand_bits(10) < 307
+    data = _street_data(hand_packed, board_packed, position, facing_bet)
+
+    # Generate bet chip data for facing-bet scenarios
+    bets = None
+    if facing_bet:
+        bet_size = random.choice(_BET_SIZES)
+        bets = {'bet_size': bet_size}  # Seat index assigned by caller
+    data['bets_info'] = bets
+    return data
+
+
+def _street_data(hand_packed, board_packed, position, facing_bet):
+    """Deterministic part of compute_street_data, as a fresh dict.
+
+    Not cached: the key would include the visible board, which differs on
+    every street, so a hand never repeats one. The per-spot parts that do
+    repeat (range breakdown, strategy tables) are shared already; treat the
+    nested values as read-only.
+    """
+    hand_ints = unpack_card_ints(hand_packed)
+    board_ints = unpack_card_ints(board_packed)
 
     texture = classify_texture(board_ints)
     bucket = classify_hand(hand_ints, board_ints, texture)
-    facing_bet = random.random() < 0.3
     strategy = get_strategy(position, texture, bucket, facing_bet=facing_bet)
-    correct_actions = get_correct_actions(strategy)
+    correct_actions = get_correct_actions_for(position, texture, bucket, facing_bet)
 
     if facing_bet:
-        actions = ['fold', 'call', 'raise']
-        action_labels = {'fold': 'Fold', 'call': 'Call', 'raise': 'Raise'}
+        actions = _FACING_BET_ACTIONS
+        action_labels = _FACING_BET_LABELS
         situation = f'{position} facing bet'
     elif position == 'OOP':
-        actions = ['check', 'bet_s', 'bet_m', 'bet_l']
-        action_labels = {'check': 'Check', 'bet_s': 'Bet 33%', 'bet_m': 'Bet 66%', 'bet_l': 'Bet 100%'}
+        actions = _BET_ACTIONS
+        action_labels = _BET_LABELS
         situation = 'OOP first to act'
     else:
-        actions = ['check', 'bet_s', 'bet_m', 'bet_l']
-        action_labels = {'check': 'Check', 'bet_s': 'Bet 33%', 'bet_m': 'Bet 66%', 'bet_l': 'Bet 100%'}
+        actions = _BET_ACTIONS
+        action_labels = _BET_LABELS
         situation = 'IP after check'
 
-    range_breakdown = {}
-    for b in BUCKETS:
-        s = get_strategy(position, texture, b, facing_bet=facing_bet)
-        range_breakdown[b] = s
-
-    # Generate bet chip data for facing-bet scenarios
-    bets = None
-    if facing_bet:
-        bet_size = random.choice([3, 4, 5, 6, 7])
-        bets = {'bet_size': bet_size}  # Seat index assigned by caller
+    range_breakdown = _range_breakdown(position, texture, facing_bet)
 
     return {
         'texture': texture,
@@ -291,7 +492,6 @@ def compute_street_data(hand_dicts, board_dicts, position):
         'postflop_situation': situation,
         'range_breakdown': range_breakdown,
         'facing_bet': facing_bet,
-        'bets_info': bets,
     }
 
 
@@ -301,13 +501,11 @@ def generate_play_scenario(position=None):
     Deals hand + board upfront, computes both preflop and postflop data.
     Board is stored but hidden during preflop, revealed for postflop.
     """
-    deck = Deck()
-    hand = deck.draw(2)
-    board = deck.draw(5)  # Deal all 5 cards upfront; reveal incrementally
+    cards = random.sample(_FULL_DECK, 7)
+    hand = cards[:2]
+    board = cards[2:]  # Deal all 5 cards upfront; reveal incrementally
 
-    hand_cards = [card_to_dict(c) for c in hand]
-    board_cards = [card_to_dict(c) for c in board]
-    hand_key = hand_to_key(hand[0], hand[1])
+    hand_cards, _, hand_key = describe_deal(hand)
 
     # Pick a random position for hero (or use specified)
     if position and position in POSITION_ORDER:
@@ -315,27 +513,32 @@ def generate_play_scenario(position=None):
     else:
         position = random.choice(POSITION_ORDER)
 
+    # Both coin flips from one draw: bit 0 picks facing-open vs RFI, the
+    # 10 bits above it decide facing_bet (< 307 of 1024, ~30%)
+    flips = _rand_bits(11)
+
     # --- Preflop data ---
     # Determine if this is RFI or facing open based on position
     # Try facing open first (more interesting), fall back to RFI
-    facing_matchups = [(h, o) for h, o in FACING_OPEN.keys() if h == position]
-    if facing_matchups and random.random() < 0.5:
+    facing_matchups = _FACING_BY_HERO.get(position, ())
+    if facing_matchups and flips & 1:
         hero_pos, opener_pos = random.choice(facing_matchups)
         ranges = FACING_OPEN[(hero_pos, opener_pos)]
-        if hand_key in ranges.get('raise', set()):
+        if hand_key in ranges['raise']:
             preflop_correct = 'raise'
-        elif hand_key in ranges.get('call', set()):
+        elif hand_key in ranges['call']:
             preflop_correct = 'call'
         else:
             preflop_correct = 'fold'
         preflop_type = 'preflop_facing'
         preflop_situation = f'{hero_pos} vs {opener_pos} open'
-        preflop_actions = ['raise', 'call', 'fold']
-        preflop_action_labels = {'raise': '3-Bet', 'call': 'Call', 'fold': 'Fold'}
-        preflop_range = sorted(ranges.get('raise', set()) | ranges.get('call', set()))
-        preflop_raise_range = sorted(ranges.get('raise', set()))
-        preflop_call_range = sorted(ranges.get('call', set()))
-        preflop_range_size = len(ranges.get('raise', set())) + len(ranges.get('call', set()))
+        preflop_actions = _FACING_OPEN_ACTIONS
+        preflop_action_labels = _FACING_OPEN_LABELS
+        sorted_ranges = _FACING_SORTED[(hero_pos, opener_pos)]
+        preflop_range = sorted_ranges['combined']
+        preflop_raise_range = sorted_ranges['raise']
+        preflop_call_range = sorted_ranges['call']
+        preflop_range_size = sorted_ranges['size']
     else:
         # RFI (BB can't RFI, use SB for check)
         rfi_pos = position if position in RFI_RANGES else 'SB'
@@ -343,9 +546,9 @@ def generate_play_scenario(position=None):
         preflop_correct = 'raise' if is_raise else 'fold'
         preflop_type = 'preflop_rfi'
         preflop_situation = f'RFI from {rfi_pos}'
-        preflop_actions = ['raise', 'fold']
-        preflop_action_labels = {'raise': 'Raise', 'fold': 'Fold'}
-        preflop_range = sorted(RFI_RANGES[rfi_pos])
+        preflop_actions = _RFI_ACTIONS
+        preflop_action_labels = _RFI_LABELS
+        preflop_range = _RFI_SORTED[rfi_pos]
         preflop_raise_range = None
         preflop_call_range = None
         preflop_range_size = len(RFI_RANGES[rfi_pos])
@@ -356,45 +559,44 @@ def generate_play_scenario(position=None):
     flop = board[:3]  # Use raw ints for initial computation
     texture = classify_texture(flop)
     bucket = classify_hand(hand, flop, texture)
-    facing_bet = random.random() < 0.3
+    facing_bet = (flips >> 1) < 307
     strategy = get_strategy(postflop_position, texture, bucket, facing_bet=facing_bet)
-    correct_actions = get_correct_actions(strategy)
+    correct_actions = get_correct_actions_for(postflop_position, texture, bucket, facing_bet)
 
     if facing_bet:
-        post_actions = ['fold', 'call', 'raise']
-        post_action_labels = {'fold': 'Fold', 'call': 'Call', 'raise': 'Raise'}
+        post_actions = _FACING_BET_ACTIONS
+        post_action_labels = _FACING_BET_LABELS
         post_situation = f'{postflop_position} facing bet'
     elif postflop_position == 'OOP':
-        post_actions = ['check', 'bet_s', 'bet_m', 'bet_l']
-        post_action_labels = {'check': 'Check', 'bet_s': 'Bet 33%', 'bet_m': 'Bet 66%', 'bet_l': 'Bet 100%'}
+        post_actions = _BET_ACTIONS
+        post_action_labels = _BET_LABELS
         post_situation = 'OOP first to act'
     else:
-        post_actions = ['check', 'bet_s', 'bet_m', 'bet_l']
-        post_action_labels = {'check': 'Check', 'bet_s': 'Bet 33%', 'bet_m': 'Bet 66%', 'bet_l': 'Bet 100%'}
+        post_actions = _BET_ACTIONS
+        post_action_labels = _BET_LABELS
         post_situation = 'IP after check'
 
-    range_breakdown = {}
-    for b in BUCKETS:
-        s = get_strategy(postflop_position, texture, b, facing_bet=facing_bet)
-        range_breakdown[b] = s
+    range_breakdown = _range_breakdown(postflop_position, texture, facing_bet)
 
     # Build seats — for play mode, show villain in a logical position
     if postflop_position == 'IP':
-        villain_pos_pick = random.choice(['UTG', 'MP', 'SB', 'BB'])
+        villain_pos_pick = random.choice(_OOP_SEATS)
     else:
-        villain_pos_pick = random.choice(['CO', 'BTN'])
+        villain_pos_pick = random.choice(_IP_SEATS)
     active = {position, villain_pos_pick}
     seats, dealer_seat = build_seats(position, hand_cards, active)
-    pot = random.choice([6, 8, 10, 12, 15, 20])
+    villain_idx = seat_of(position, villain_pos_pick)
+    pot = random.choice(_POT_SIZES)
 
     return {
         # Shared
-        'hand': hand_cards,
+        'hand_packed': pack_cards(hand),
         'hand_key': hand_key,
-        'board': board_cards,
+        'board_packed': pack_cards(board),
         'position': position,
         'seats': seats,
         'dealer_seat': dealer_seat,
+        'villain_idx': villain_idx,
         'pot': pot,
 
         # Preflop phase
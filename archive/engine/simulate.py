@@ -1,24 +1,73 @@
 """Simulate mode — heads-up session with imperfect AI villain."""
 
 import random
-from treys import Card, Deck
-from engine.cards import hand_to_key, card_to_dict, EVALUATOR
+from dataclasses import dataclass, field
+
+from treys import Deck
+from engine.cards import hand_to_key, EVALUATOR, STR_OF, INT_OF, DICT_OF
 from engine.ranges import RFI_RANGES, FACING_OPEN
-from engine.abstraction import classify_hand
+from engine.abstraction import classify_hand, make_board_ctx
 from engine.postflop import (
-    classify_texture, get_strategy, get_correct_actions,
+    get_correct_actions_for, sample_action,
     ACTION_LABELS, TEXTURE_LABELS,
 )
 
 
-def _card_str_to_int(s):
-    """Convert '8h' to treys card int."""
-    return Card.new(s)
-
+@dataclass(slots=True)
+class SimState:
+    """State of the current simulate-mode hand plus the running session log.
 
-def _card_int_to_str(c):
-    """Convert treys card int to '8h' string."""
-    return Card.int_to_str(c)
+    Slotted, so the handlers' field reads and writes are attribute accesses
+    rather than dict lookups. orjson serializes it natively for the hidden
+    ``sim_state`` form field; rebuild it with ``SimState(**decoded)``.
+    """
+    hero_stack: float
+    villain_stack: float
+    pot: float
+    hand_number: int
+    hero_is_sb: bool
+    hero_position: str
+    villain_position: str
+    villain_postflop_position: str
+    hero_hand_strs: list
+    villain_hand_strs: list
+    board_strs: list
+    hero_hand: list
+    villain_hand: list
+    board_cards: list
+    hero_hand_key: str
+    villain_hand_key: str
+    street: str = 'preflop'
+    board_visible: int = 0
+    visible_board_strs: list = field(default_factory=list)  # board_strs[:board_visible]
+    street_to_act: str = 'hero'
+    street_bet: float = 0.0
+    hero_street_invested: float = 0.0
+    villain_street_invested: float = 0.0
+    hero_total_invested: float = 0.0
+    villain_total_invested: float = 0.0
+    sim_phase: str = 'preflop_decision'
+    villain_last_action: str | None = None
+    # Session log, reduced as hands finish (see log_hand): running
+    # [hands, total, best, worst] results plus the top mistakes; nothing
+    # else is ever reviewed
+    session_stats: list = field(default_factory=lambda: [0, 0.0, 0.0, 0.0])
+    session_mistakes: list = field(default_factory=list)
+    current_hand_actions: list = field(default_factory=list)
+    hand_over: bool = False
+    winner: str | None = None
+
+
+# Heads-up there is no real opener seat to look up: a player facing a raise
+# plays the first FACING_OPEN matchup listed for their position.
+FACING_RANGES_BY_POS = {}
+for (_pos, _opener), _ranges in FACING_OPEN.items():
+    FACING_RANGES_BY_POS.setdefault(_pos, _ranges)
+
+
+# Shared read-only deck; random.sample deals from it without building and
+# shuffling a treys Deck() per hand, and without any per-thread state.
+_FULL_DECK = tuple(Deck.GetFullDeck())
 
 
 def generate_sim_hand(hero_stack, villain_stack, hand_number, hero_is_sb):
@@ -28,18 +77,18 @@ def generate_sim_hand(hero_stack, villain_stack, hand_number, hero_is_sb):
     - SB = BTN = posts 0.5 BB, acts first preflop, acts last postflop (IP)
     - BB = posts 1.0 BB, acts last preflop, acts first postflop (OOP)
     """
-    deck = Deck()
-    hero_hand = deck.draw(2)
-    villain_hand = deck.draw(2)
-    board = deck.draw(5)
+    cards = random.sample(_FULL_DECK, 9)
+    hero_hand = cards[0:2]
+    villain_hand = cards[2:4]
+    board = cards[4:9]
 
-    hero_hand_strs = [_card_int_to_str(c) for c in hero_hand]
-    villain_hand_strs = [_card_int_to_str(c) for c in villain_hand]
-    board_strs = [_card_int_to_str(c) for c in board]
+    hero_hand_strs = [STR_OF[c] for c in hero_hand]
+    villain_hand_strs = [STR_OF[c] for c in villain_hand]
+    board_strs = [STR_OF[c] for c in board]
 
-    hero_hand_cards = [card_to_dict(c) for c in hero_hand]
-    villain_hand_cards = [card_to_dict(c) for c in villain_hand]
-    board_cards = [card_to_dict(c) for c in board]
+    hero_hand_cards = [DICT_OF[c] for c in hero_hand]
+    villain_hand_cards = [DICT_OF[c] for c in villain_hand]
+    board_cards = [DICT_OF[c] for c in board]
 
     hero_hand_key = hand_to_key(hero_hand[0], hero_hand[1])
     villain_hand_key = hand_to_key(villain_hand[0], villain_hand[1])
@@ -60,37 +109,41 @@ def generate_sim_hand(hero_stack, villain_stack, hand_number, hero_is_sb):
 
     pot = sb_amount + bb_amount
 
-    return {
-        'hero_stack': hero_stack - hero_invested,
-        'villain_stack': villain_stack - villain_invested,
-        'pot': pot,
-        'hand_number': hand_number,
-        'hero_is_sb': hero_is_sb,
-        'hero_position': hero_position,
-        'villain_position': villain_position,
-        'hero_hand_strs': hero_hand_strs,
-        'villain_hand_strs': villain_hand_strs,
-        'board_strs': board_strs,
-        'hero_hand': hero_hand_cards,
-        'villain_hand': villain_hand_cards,
-        'board_cards': board_cards,
-        'hero_hand_key': hero_hand_key,
-        'villain_hand_key': villain_hand_key,
-        'street': 'preflop',
-        'board_visible': 0,
-        'street_to_act': 'hero' if hero_is_sb else 'villain',
-        'street_bet': 0.0,
-        'hero_street_invested': 0.0,
-        'villain_street_invested': 0.0,
-        'hero_total_invested': hero_invested,
-        'villain_total_invested': villain_invested,
-        'sim_phase': 'preflop_decision',
-        'villain_last_action': None,
-        'session_log': [],
-        'current_hand_actions': [],
-        'hand_over': False,
-        'winner': None,
-    }
+    return SimState(
+        hero_stack=hero_stack - hero_invested,
+        villain_stack=villain_stack - villain_invested,
+        pot=pot,
+        hand_number=hand_number,
+        hero_is_sb=hero_is_sb,
+        hero_position=hero_position,
+        villain_position=villain_position,
+        # Postflop the SB/BTN is IP, so the villain is OOP when hero is SB
+        villain_postflop_position='OOP' if hero_is_sb else 'IP',
+        hero_hand_strs=hero_hand_strs,
+        villain_hand_strs=villain_hand_strs,
+        board_strs=board_strs,
+        hero_hand=hero_hand_cards,
+        villain_hand=villain_hand_cards,
+        board_cards=board_cards,
+        hero_hand_key=hero_hand_key,
+        villain_hand_key=villain_hand_key,
+        street='preflop',
+        board_visible=0,
+        visible_board_strs=[],
+        street_to_act='hero' if hero_is_sb else 'villain',
+        street_bet=0.0,
+        hero_street_invested=0.0,
+        villain_street_invested=0.0,
+        hero_total_invested=hero_invested,
+        villain_total_invested=villain_invested,
+        sim_phase='preflop_decision',
+        villain_last_action=None,
+        session_stats=[0, 0.0, 0.0, 0.0],
+        session_mistakes=[],
+        current_hand_actions=[],
+        hand_over=False,
+        winner=None,
+    )
 
 
 def villain_preflop_act(hand_key, position, facing_raise=False, noise=0.30):
@@ -108,18 +161,11 @@ def villain_preflop_act(hand_key, position, facing_raise=False, noise=0.30):
     # GTO action
     if facing_raise:
         # Villain facing a raise — check FACING_OPEN
-        if position == 'BB':
-            matchups = [(h, o) for h, o in FACING_OPEN.keys() if h == 'BB']
-        else:
-            matchups = [(h, o) for h, o in FACING_OPEN.keys() if h == position]
-
-        if matchups:
-            hero_pos, opener_pos = matchups[0]
-            ranges = FACING_OPEN[(hero_pos, opener_pos)]
-            if hand_key in ranges.get('raise', set()):
-                return 'raise'
-            elif hand_key in ranges.get('call', set()):
-                return 'call'
+        ranges = FACING_RANGES_BY_POS.get(position, {})
+        if hand_key in ranges.get('raise', ()):
+            return 'raise'
+        elif hand_key in ranges.get('call', ()):
+            return 'call'
         return 'fold'
     else:
         # Villain RFI — check if hand is in RFI range for position
@@ -134,13 +180,12 @@ def villain_postflop_act(hand_strs, board_strs, position, facing_bet=False, nois
 
     position: 'OOP' or 'IP'
     """
-    hand_ints = [_card_str_to_int(s) for s in hand_strs]
-    board_ints = [_card_str_to_int(s) for s in board_strs]
-
-    texture = classify_texture(board_ints)
-    bucket = classify_hand(hand_ints, board_ints, texture)
-    strategy = get_strategy(position, texture, bucket, facing_bet=facing_bet)
+    hand_ints = [INT_OF[s] for s in hand_strs]
+    board_ints = [INT_OF[s] for s in board_strs]
 
+    board_ctx = make_board_ctx(board_ints)
+    texture = board_ctx.texture
+    bucket = classify_hand(hand_ints, board_ints, board_ctx=board_ctx)
     if random.random() < noise:
         # Noise: random action
         if facing_bet:
@@ -149,13 +194,9 @@ def villain_postflop_act(hand_strs, board_strs, position, facing_bet=False, nois
             return random.choice(['check', 'bet_m'])
 
     # Sample from GTO distribution
-    actions = list(strategy.keys())
-    probs = list(strategy.values())
-    total = sum(probs)
-    if total == 0:
+    chosen = sample_action(position, texture, bucket, facing_bet, random.random())
+    if chosen is None:
         return 'check' if not facing_bet else 'fold'
-    probs = [p / total for p in probs]
-    chosen = random.choices(actions, weights=probs, k=1)[0]
 
     # Map bet sizes to a single 'bet' action for simplicity
     if chosen in ('bet_s', 'bet_m', 'bet_l'):
@@ -168,9 +209,9 @@ def resolve_showdown(hero_hand_strs, villain_hand_strs, board_strs):
 
     Returns 'hero', 'villain', or 'split'.
     """
-    hero_ints = [_card_str_to_int(s) for s in hero_hand_strs]
-    villain_ints = [_card_str_to_int(s) for s in villain_hand_strs]
-    board_ints = [_card_str_to_int(s) for s in board_strs]
+    hero_ints = [INT_OF[s] for s in hero_hand_strs]
+    villain_ints = [INT_OF[s] for s in villain_hand_strs]
+    board_ints = [INT_OF[s] for s in board_strs]
 
     hero_score = EVALUATOR.evaluate(board_ints, hero_ints)
     villain_score = EVALUATOR.evaluate(board_ints, villain_ints)
@@ -186,14 +227,11 @@ def get_hero_gto_action(hand_key, position, street, hand_strs=None, board_strs=N
     """Get the GTO-correct action for hero (for deviation tracking)."""
     if street == 'preflop':
         if facing_bet:
-            matchups = [(h, o) for h, o in FACING_OPEN.keys() if h == position]
-            if matchups:
-                _, opener = matchups[0]
-                ranges = FACING_OPEN[(position, opener)]
-                if hand_key in ranges.get('raise', set()):
-                    return 'raise'
-                elif hand_key in ranges.get('call', set()):
-                    return 'call'
+            ranges = FACING_RANGES_BY_POS.get(position, {})
+            if hand_key in ranges.get('raise', ()):
+                return 'raise'
+            elif hand_key in ranges.get('call', ()):
+                return 'call'
             return 'fold'
         else:
             rfi_pos = position if position in RFI_RANGES else 'BTN'
@@ -203,13 +241,13 @@ def get_hero_gto_action(hand_key, position, street, hand_strs=None, board_strs=N
     else:
         # Postflop
         if hand_strs and board_strs:
-            hand_ints = [_card_str_to_int(s) for s in hand_strs]
-            board_ints = [_card_str_to_int(s) for s in board_strs]
+            hand_ints = [INT_OF[s] for s in hand_strs]
+            board_ints = [INT_OF[s] for s in board_strs]
             postflop_pos = 'IP' if position in ('SB', 'BTN') else 'OOP'
-            texture = classify_texture(board_ints)
-            bucket = classify_hand(hand_ints, board_ints, texture)
-            strategy = get_strategy(postflop_pos, texture, bucket, facing_bet=facing_bet)
-            correct = get_correct_actions(strategy)
+            board_ctx = make_board_ctx(board_ints)
+            texture = board_ctx.texture
+            bucket = classify_hand(hand_ints, board_ints, board_ctx=board_ctx)
+            correct = get_correct_actions_for(postflop_pos, texture, bucket, facing_bet)
             return correct[0] if correct else 'check'
     return 'check'
 
@@ -229,12 +267,51 @@ def compute_deviation(hero_action, gto_action, strategy=None):
     return 1.0
 
 
-def compute_session_review(session_log):
-    """Compute session review stats from the hand log.
+# Deviations above this count as mistakes in the session review
+MISTAKE_THRESHOLD = 0.3
+TOP_MISTAKES = 5
+
+
+def log_hand(sim_state, result_bb):
+    """Append a finished hand to the session log on ``sim_state``.
+
+    The result is folded into the running session stats and only significant
+    deviations are kept, trimmed to the worst ``TOP_MISTAKES`` as it goes (a
+    stable sort keeps earlier hands first among ties), so the log stays a
+    fixed size however long the session runs.
+    """
+    stats = sim_state.session_stats
+    if stats[0]:
+        stats[2] = max(stats[2], result_bb)
+        stats[3] = min(stats[3], result_bb)
+    else:
+        stats[2] = stats[3] = result_bb
+    stats[0] += 1
+    stats[1] += result_bb
+    mistakes = sim_state.session_mistakes
+    for action_record in sim_state.current_hand_actions:
+        dev = action_record.get('deviation', 0)
+        if dev > MISTAKE_THRESHOLD:
+            mistakes.append({
+                'hand_num': sim_state.hand_number,
+                'hero_hand': sim_state.hero_hand_key,
+                'street': action_record.get('street', '?'),
+                'hero_action': action_record.get('action', '?'),
+                'gto_action': action_record.get('gto_action', '?'),
+                'deviation': dev,
+            })
+    if len(mistakes) > TOP_MISTAKES:
+        mistakes.sort(key=lambda x: -x['deviation'])
+        del mistakes[TOP_MISTAKES:]
+
+
+def compute_session_review(session_stats, session_mistakes):
+    """Compute session review stats from the reduced hand log.
 
     Returns dict with stats and top mistakes.
     """
-    if not session_log:
+    hands_played, total_pl, biggest_win, biggest_loss = session_stats
+    if not hands_played:
         return {
             'total_pl': 0,
             'hands_played': 0,
@@ -244,32 +321,10 @@ def compute_session_review(session_log):
             'top_mistakes': [],
         }
 
-    total_pl = sum(h.get('result_bb', 0) for h in session_log)
-    hands_played = len(session_log)
-    bb_per_hand = total_pl / hands_played if hands_played > 0 else 0
-
-    results = [h.get('result_bb', 0) for h in session_log]
-    biggest_win = max(results) if results else 0
-    biggest_loss = min(results) if results else 0
-
-    # Collect all deviations from all hands
-    all_deviations = []
-    for hand in session_log:
-        for action_record in hand.get('actions', []):
-            dev = action_record.get('deviation', 0)
-            if dev > 0.3:  # Only track significant deviations
-                all_deviations.append({
-                    'hand_num': hand.get('hand_num', 0),
-                    'hero_hand': hand.get('hero_hand_key', '?'),
-                    'street': action_record.get('street', '?'),
-                    'hero_action': action_record.get('action', '?'),
-                    'gto_action': action_record.get('gto_action', '?'),
-                    'deviation': dev,
-                })
+    bb_per_hand = total_pl / hands_played
 
     # Top 5 worst mistakes
-    all_deviations.sort(key=lambda x: -x['deviation'])
-    top_mistakes = all_deviations[:5]
+    top_mistakes = sorted(session_mistakes, key=lambda x: -x['deviation'])
 
     return {
         'total_pl': round(total_pl, 1),
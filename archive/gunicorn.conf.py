@@ -0,0 +1,12 @@
+"""Gunicorn settings. Run from this directory: gunicorn api.index:app"""
+import multiprocessing
+import os
+
+bind = os.environ.get('BIND', '0.0.0.0:8000')
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count()))
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+
+# Import the app once in the master so the warmed scenario pools and strategy
+# tables are shared copy-on-write by every forked worker.
+preload_app = True
@@ -2,9 +2,10 @@
 Classifies hands into 13 strength buckets.
 """
 
-from collections import Counter
-from treys import Card
-from engine.cards import EVALUATOR
+from functools import lru_cache
+from typing import NamedTuple
+
+from engine.cards import EVALUATOR, RANK_OF, SUIT_OF
 
 # 13 buckets — ordered strongest to weakest
 PREMIUM = 'premium'
@@ -24,6 +25,9 @@ AIR = 'air'
 BUCKETS = [PREMIUM, NUT, STRONG, TWO_PAIR, TOP_PAIR, OVERPAIR,
            MID_PAIR, UNDERPAIR, NUT_DRAW, DRAW, WEAK_MADE, GUTSHOT, AIR]
 
+# Small-int code per bucket (its strength rank) for array-indexed consumers
+BUCKET_IDS = {b: i for i, b in enumerate(BUCKETS)}
+
 BUCKET_LABELS = {
     PREMIUM: 'Premium (full house+, nut flush, top set dry)',
     NUT: 'Nut (set, K/Q-high flush)',
@@ -41,42 +45,64 @@ BUCKET_LABELS = {
 }
 
 
-def classify_hand(hand, board, texture=None):
-    """Classify hand into one of 13 buckets."""
-    if texture is None:
-        from engine.postflop import classify_texture
-        texture = classify_texture(board)
+class BoardCtx(NamedTuple):
+    """Board-level features shared by every hand classified on one board."""
+    ranks: tuple        # board ranks, highest first
+    top: int
+    second: int         # -1 when the board is shorter
+    third: int
+    rank_mask: int      # bit r set for each board rank r
+    suit_counts: list   # see _suit_counts
+    max_suit: int       # most board cards of one suit
+
+
+def make_board_ctx(board):
+    ranks = tuple(sorted([RANK_OF[c] for c in board], reverse=True))
+    suit_counts = _suit_counts(board)
+    return BoardCtx(ranks, ranks[0],
+                    ranks[1] if len(ranks) > 1 else -1,
+                    ranks[2] if len(ranks) > 2 else -1,
+                    _rank_mask(ranks),
+                    suit_counts, max(suit_counts))
+
+
+def classify_hand(hand, board, texture=None, board_ctx=None):
+    """Classify hand into one of 13 buckets.
+
+    The 13-bucket split ignores texture. Pass ``board_ctx`` (make_board_ctx)
+    when classifying several hands on one board.
+    """
+    if board_ctx is None:
+        board_ctx = make_board_ctx(board)
 
     score = EVALUATOR.evaluate(board, hand)
-    rank_class = EVALUATOR.get_rank_class(score)
+    return _DISPATCH[EVALUATOR.get_rank_class(score)](hand, board_ctx)
 
-    if rank_class <= 1:
-        return PREMIUM
-    if rank_class == 2:
-        return PREMIUM
-    if rank_class == 3:
-        return PREMIUM
-    if rank_class == 4:
-        return _classify_flush(hand, board)
-    if rank_class == 5:
-        return _classify_straight(hand, board)
-    if rank_class == 6:
-        return _classify_trips(hand, board)
-    if rank_class == 7:
-        return TWO_PAIR
-    if rank_class == 8:
-        return _classify_pair(hand, board)
-    return _classify_unmade(hand, board)
-
-
-def _classify_flush(hand, board):
-    all_cards = hand + board
-    suits = [Card.get_suit_int(c) for c in all_cards]
-    suit_counts = Counter(suits)
-    flush_suit = max(suit_counts, key=suit_counts.get)
-
-    hero_flush_ranks = [Card.get_rank_int(c) for c in hand
-                        if Card.get_suit_int(c) == flush_suit]
+
+def classify_range(board, hands, texture=None):
+    """Bucket every hole-card pair in hands against one board.
+
+    Builds the board context once; returns buckets in the order of hands
+    (pass an (N, 2) card array as ``arr.tolist()``).
+    """
+    board_ctx = make_board_ctx(board)
+    return [classify_hand(list(hand), board, texture, board_ctx) for hand in hands]
+
+
+def _classify_premium(hand, ctx):
+    return PREMIUM
+
+
+def _classify_two_pair(hand, ctx):
+    return TWO_PAIR
+
+
+def _classify_flush(hand, ctx):
+    suit_counts = _suit_counts(hand, ctx.suit_counts)
+    flush_suit = suit_counts.index(max(suit_counts))
+
+    hero_flush_ranks = [RANK_OF[c] for c in hand
+                        if SUIT_OF[c] == flush_suit]
 
     if not hero_flush_ranks:
         return MID_PAIR  # Board flush, shared equity
@@ -89,20 +115,18 @@ def _classify_flush(hand, board):
     return STRONG
 
 
-def _classify_straight(hand, board):
-    hand_ranks = sorted([Card.get_rank_int(c) for c in hand], reverse=True)
-    board_ranks = sorted([Card.get_rank_int(c) for c in board], reverse=True)
-    uses_both = not any(hr in board_ranks for hr in hand_ranks)
+def _classify_straight(hand, ctx):
+    mask = ctx.rank_mask
+    uses_both = not ((mask >> RANK_OF[hand[0]]) | (mask >> RANK_OF[hand[1]])) & 1
 
     if uses_both:
         return STRONG
     return TWO_PAIR  # One-card straight, similar strength to two pair
 
 
-def _classify_trips(hand, board):
-    hand_ranks = [Card.get_rank_int(c) for c in hand]
-    board_ranks = sorted([Card.get_rank_int(c) for c in board], reverse=True)
-    top_board = board_ranks[0]
+def _classify_trips(hand, ctx):
+    hand_ranks = [RANK_OF[c] for c in hand]
+    top_board = ctx.top
     is_set = hand_ranks[0] == hand_ranks[1]
 
     if is_set:
@@ -113,12 +137,15 @@ def _classify_trips(hand, board):
     return STRONG  # Trips
 
 
-def _classify_pair(hand, board):
-    hand_ranks = sorted([Card.get_rank_int(c) for c in hand], reverse=True)
-    board_ranks = sorted([Card.get_rank_int(c) for c in board], reverse=True)
-    top_board = board_ranks[0]
-    second_board = board_ranks[1] if len(board_ranks) > 1 else -1
-    third_board = board_ranks[2] if len(board_ranks) > 2 else -1
+# Draws that outrank a middle pair
+_PAIR_PLUS_DRAW = frozenset((DRAW, NUT_DRAW))
+
+
+def _classify_pair(hand, ctx):
+    hand_ranks = _ranks_desc(hand)
+    top_board = ctx.top
+    second_board = ctx.second
+    third_board = ctx.third
 
     # Overpair
     if hand_ranks[0] == hand_ranks[1] and hand_ranks[0] > top_board:
@@ -138,8 +165,8 @@ def _classify_pair(hand, board):
 
     # Middle pair
     if hand_ranks[0] == second_board or hand_ranks[1] == second_board:
-        draw = _check_draws(hand, board)
-        if draw == DRAW or draw == NUT_DRAW:
+        draw = _check_draws(hand, ctx)
+        if draw in _PAIR_PLUS_DRAW:
             return draw
         return MID_PAIR
 
@@ -153,33 +180,44 @@ def _classify_pair(hand, board):
             return UNDERPAIR
         return WEAK_MADE
 
-    draw = _check_draws(hand, board)
+    draw = _check_draws(hand, ctx)
     if draw:
         return draw
     return WEAK_MADE
 
 
-def _classify_unmade(hand, board):
-    draw = _check_draws(hand, board)
+def _classify_unmade(hand, ctx):
+    draw = _check_draws(hand, ctx)
     if draw:
         return draw
 
-    hand_ranks = sorted([Card.get_rank_int(c) for c in hand], reverse=True)
-    board_ranks = sorted([Card.get_rank_int(c) for c in board], reverse=True)
-    if hand_ranks[0] > board_ranks[0]:
+    hand_ranks = _ranks_desc(hand)
+    if hand_ranks[0] > ctx.top:
         return GUTSHOT if hand_ranks[0] >= 11 else AIR
     return AIR
 
 
-def _check_draws(hand, board):
-    all_cards = hand + board
-    suits = [Card.get_suit_int(c) for c in all_cards]
-    ranks = sorted(set(Card.get_rank_int(c) for c in all_cards))
+# Sub-classifier per treys rank class (0 = royal flush ... 9 = high card).
+_DISPATCH = (_classify_premium, _classify_premium, _classify_premium,
+             _classify_premium, _classify_flush, _classify_straight,
+             _classify_trips, _classify_two_pair, _classify_pair,
+             _classify_unmade)
+
 
-    suit_counts = Counter(suits)
-    has_flush_draw = any(count == 4 for count in suit_counts.values())
-    has_oesd = _has_open_ended(ranks)
-    has_gutshot = _has_gutshot(ranks)
+def _check_draws(hand, ctx):
+    rank_mask = ctx.rank_mask
+    for c in hand:
+        rank_mask |= 1 << RANK_OF[c]
+
+    # Suit totals for the hole cards' suits, read off the board counts. A
+    # 4-suited board only matters when we hold none of that suit (holding one
+    # is a made flush, which never reaches here); likewise a monotone flop.
+    s0, s1 = SUIT_OF[hand[0]], SUIT_OF[hand[1]]
+    paired = s0 == s1
+    t0 = ctx.suit_counts[s0] + 1 + paired
+    t1 = ctx.suit_counts[s1] + 1 + paired
+    has_flush_draw = t0 == 4 or t1 == 4 or ctx.max_suit == 4
+    has_oesd, has_gutshot = _straight_draws(rank_mask)
 
     if has_flush_draw and (has_oesd or has_gutshot):
         return NUT_DRAW
@@ -190,13 +228,44 @@ def _check_draws(hand, board):
     if has_gutshot:
         return GUTSHOT
 
-    if len(board) == 3:
-        if any(count == 3 for count in suit_counts.values()):
+    if len(ctx.ranks) == 3:
+        if t0 == 3 or t1 == 3 or ctx.max_suit == 3:
             return GUTSHOT
 
     return None
 
 
+def _ranks_desc(hand):
+    """Hole-card ranks, highest first: a two-element sort without sorted()."""
+    a, b = RANK_OF[hand[0]], RANK_OF[hand[1]]
+    return (a, b) if a >= b else (b, a)
+
+
+def _suit_counts(cards, base=None):
+    """Cards per suit, indexed by treys suit bit (1, 2, 4, 8) read off the int.
+
+    ``base`` seeds the counts, e.g. with a BoardCtx's board counts.
+    """
+    counts = list(base) if base else [0] * 9
+    for c in cards:
+        counts[(c >> 12) & 0xF] += 1
+    return counts
+
+
+def _rank_mask(ranks):
+    mask = 0
+    for r in ranks:
+        mask |= 1 << r
+    return mask
+
+
+@lru_cache(maxsize=None)
+def _straight_draws(rank_mask):
+    """(open-ended, gutshot) for a 13-bit rank mask."""
+    ranks = [r for r in range(13) if rank_mask >> r & 1]
+    return _has_open_ended(ranks), _has_gutshot(ranks)
+
+
 def _has_open_ended(sorted_ranks):
     extended = sorted_ranks[:]
     if 12 in extended:
@@ -8,10 +8,15 @@ SUIT_MAP = {1: 's', 2: 'h', 4: 'd', 8: 'c'}
 SUIT_SYMBOLS = {1: '\u2660', 2: '\u2665', 4: '\u2666', 8: '\u2663'}
 SUIT_COLORS = {1: 'black', 2: 'red', 4: 'red', 8: 'black'}
 
+# Rank (0-12) and suit bit (1, 2, 4, 8) per treys card int; a dict lookup is
+# cheaper than the Card.get_*_int calls in the classifier hot paths.
+RANK_OF = {c: Card.get_rank_int(c) for c in Deck.GetFullDeck()}
+SUIT_OF = {c: Card.get_suit_int(c) for c in Deck.GetFullDeck()}
+
 
 def card_to_dict(card_int):
-    rank_int = Card.get_rank_int(card_int)
-    suit_int = Card.get_suit_int(card_int)
+    rank_int = RANK_OF[card_int]
+    suit_int = SUIT_OF[card_int]
     return {
         'rank': RANK_MAP[rank_int],
         'suit': SUIT_MAP[suit_int],
@@ -21,11 +26,11 @@ def card_to_dict(card_int):
     }
 
 
-def hand_to_key(card1_int, card2_int):
-    r1 = Card.get_rank_int(card1_int)
-    r2 = Card.get_rank_int(card2_int)
-    s1 = Card.get_suit_int(card1_int)
-    s2 = Card.get_suit_int(card2_int)
+def _hand_key(card1_int, card2_int):
+    r1 = RANK_OF[card1_int]
+    r2 = RANK_OF[card2_int]
+    s1 = SUIT_OF[card1_int]
+    s2 = SUIT_OF[card2_int]
     high, low = max(r1, r2), min(r1, r2)
     high_c = RANK_MAP[high]
     low_c = RANK_MAP[low]
@@ -37,6 +42,14 @@ def hand_to_key(card1_int, card2_int):
         return f"{high_c}{low_c}o"
 
 
+# Preflop key for every ordered pair of card ints (52 * 52 entries)
+_HAND_KEY = {(c1, c2): _hand_key(c1, c2) for c1 in RANK_OF for c2 in RANK_OF}
+
+
+def hand_to_key(card1_int, card2_int):
+    return _HAND_KEY[card1_int, card2_int]
+
+
 def deal_hand(num_board=0):
     deck = Deck()
     hand = deck.draw(2)
@@ -2,10 +2,17 @@
 Strategy tables loaded from pre-computed JSON, falls back to generated defaults.
 """
 
-import json
+import heapq
 import os
-from collections import Counter
-from treys import Card
+from functools import lru_cache
+from operator import itemgetter
+
+try:
+    import orjson as _json
+except ImportError:  # orjson is optional here; stdlib json takes bytes too
+    import json as _json
+
+from engine.cards import SUIT_OF
 
 # Board textures — 8 categories
 MONOTONE = 'monotone'
@@ -20,6 +27,9 @@ LOW_DRY = 'low_dry'
 TEXTURES = [MONOTONE, PAIRED, WET_CONNECTED, WET_TWOTONE,
             HIGH_DRY_A, HIGH_DRY_K, MEDIUM_DRY, LOW_DRY]
 
+# Small-int code per texture, for the array-indexed strategy lookup
+TEXTURE_IDS = {t: i for i, t in enumerate(TEXTURES)}
+
 TEXTURE_LABELS = {
     MONOTONE: 'Monotone (3+ same suit)',
     PAIRED: 'Paired board',
@@ -37,31 +47,44 @@ ACTION_LABELS = {
 }
 
 
+# One 4-bit counter per suit: summing a board's entries yields every suit
+# count in a single int (a board has at most 5 cards, so nibbles never carry)
+_SUIT_NIBBLE = {c: 1 << (4 * (SUIT_OF[c].bit_length() - 1)) for c in SUIT_OF}
+
+
+def _board_masks(board):
+    """(13-bit rank mask, packed suit counts) for a board of treys ints."""
+    rank_mask = 0
+    suit_nibbles = 0
+    for c in board:
+        rank_mask |= (c >> 16) & 0x1FFF  # treys keeps a one-hot rank at bit 16
+        suit_nibbles += _SUIT_NIBBLE[c]
+    return rank_mask, suit_nibbles
+
+
+def _is_connected(rank_mask):
+    """No gap of more than 2 between neighbouring ranks."""
+    spread = rank_mask >> ((rank_mask & -rank_mask).bit_length() - 1)
+    missing = ~spread & ((1 << spread.bit_length()) - 1)
+    return not missing & (missing >> 1)
+
+
 def classify_texture(board):
     """Classify board into one of 8 texture categories."""
-    ranks = [Card.get_rank_int(c) for c in board]
-    suits = [Card.get_suit_int(c) for c in board]
+    rank_mask, suit_nibbles = _board_masks(board)
 
-    suit_counts = Counter(suits)
-    rank_counts = Counter(ranks)
-
-    if max(suit_counts.values()) >= 3:
+    if (suit_nibbles + 0x1111) & 0x4444:  # some suit count >= 3
         return MONOTONE
-    if max(rank_counts.values()) >= 2:
+    if rank_mask.bit_count() < len(board):
         return PAIRED
 
-    sorted_ranks = sorted(ranks)
-    max_gap = max(sorted_ranks[i + 1] - sorted_ranks[i] for i in range(len(sorted_ranks) - 1))
-    is_connected = max_gap <= 2
-    is_two_tone = max(suit_counts.values()) >= 2
-
-    if is_connected:
+    if _is_connected(rank_mask):
         return WET_CONNECTED
-    if is_two_tone:
+    if (suit_nibbles + 0x2222) & 0x4444:  # some suit count >= 2
         return WET_TWOTONE
 
     # Rainbow, not connected
-    highest = max(ranks)
+    highest = rank_mask.bit_length() - 1
     if highest == 12:
         return HIGH_DRY_A
     if highest >= 10:
@@ -75,6 +98,12 @@ def classify_texture(board):
 # Default strategy generation for 13 buckets × 8 textures
 # ================================================================
 
+# Fallback strategies for contexts missing from the tables; shared, so treat
+# them as read-only (plain dicts, as scenario state serializes them)
+_DEFAULT_FACING = {'fold': 0.5, 'call': 0.5}
+_DEFAULT_CHECK = {'check': 1.0}
+
+
 _OOP_DEFAULTS = {
     'premium':  {'check': 0.25, 'bet_m': 0.25, 'bet_l': 0.50},
     'nut':      {'check': 0.20, 'bet_m': 0.30, 'bet_l': 0.50},
@@ -125,16 +154,18 @@ _FB_DEFAULTS = {
 
 
 def _build_default_tables():
-    """Generate strategy tables for all texture/bucket combinations."""
+    """Generate strategy tables for all texture/bucket combinations.
+
+    Defaults do not vary by texture, so every texture's cell for a bucket
+    shares one (read-only) dict.
+    """
     from engine.abstraction import BUCKETS
-    oop = {}
-    ip = {}
-    fb = {}
-    for tex in TEXTURES:
-        for bkt in BUCKETS:
-            oop[('OOP', tex, bkt)] = dict(_OOP_DEFAULTS.get(bkt, {'check': 1.0}))
-            ip[('IP', tex, bkt)] = dict(_IP_DEFAULTS.get(bkt, {'check': 1.0}))
-            fb[(tex, bkt)] = dict(_FB_DEFAULTS.get(bkt, {'fold': 0.5, 'call': 0.5}))
+    oop = {('OOP', tex, bkt): _OOP_DEFAULTS.get(bkt, _DEFAULT_CHECK)
+           for tex in TEXTURES for bkt in BUCKETS}
+    ip = {('IP', tex, bkt): _IP_DEFAULTS.get(bkt, _DEFAULT_CHECK)
+          for tex in TEXTURES for bkt in BUCKETS}
+    fb = {(tex, bkt): _FB_DEFAULTS.get(bkt, _DEFAULT_FACING)
+          for tex in TEXTURES for bkt in BUCKETS}
     return oop, ip, fb
 
 
@@ -143,25 +174,45 @@ OOP_STRATEGY, IP_VS_CHECK, FACING_BET = _build_default_tables()
 
 def get_strategy(position, texture, bucket, facing_bet=False):
     """Look up strategy for a given context."""
+    tex_idx = TEXTURE_IDS.get(texture)
+    bkt_idx = _BUCKET_IDS.get(bucket)
+    if tex_idx is not None and bkt_idx is not None:
+        return get_strategy_fast(position == 'OOP', tex_idx, bkt_idx, facing_bet)
     if facing_bet:
-        return FACING_BET.get((texture, bucket), {'fold': 0.5, 'call': 0.5})
+        return FACING_BET.get((texture, bucket), _DEFAULT_FACING)
     if position == 'OOP':
-        return OOP_STRATEGY.get(('OOP', texture, bucket), {'check': 1.0})
-    return IP_VS_CHECK.get(('IP', texture, bucket), {'check': 1.0})
+        return OOP_STRATEGY.get(('OOP', texture, bucket), _DEFAULT_CHECK)
+    return IP_VS_CHECK.get(('IP', texture, bucket), _DEFAULT_CHECK)
+
+
+def get_strategy_fast(pos_is_oop, tex_idx, bkt_idx, facing_bet=False):
+    """get_strategy by TEXTURE_IDS / BUCKET_IDS codes, skipping key hashing."""
+    if facing_bet:
+        return _FB_ARR[tex_idx][bkt_idx]
+    if pos_is_oop:
+        return _OOP_ARR[tex_idx][bkt_idx]
+    return _IP_ARR[tex_idx][bkt_idx]
 
 
 def get_correct_actions(strategy):
     """Determine acceptable actions from a mixed strategy."""
-    sorted_actions = sorted(strategy.items(), key=lambda x: -x[1])
+    return list(_correct_actions(tuple(strategy.items())))
+
+
+@lru_cache(maxsize=512)
+def _correct_actions(strategy_items):
+    """get_correct_actions on a strategy's items; there are only a few
+    hundred distinct strategies, so each is sorted once."""
+    sorted_actions = heapq.nlargest(2, strategy_items, key=itemgetter(1))
     best_action, best_prob = sorted_actions[0]
     if best_prob >= 0.50:
-        return [best_action]
+        return (best_action,)
     correct = [best_action]
     if len(sorted_actions) > 1:
         second_action, second_prob = sorted_actions[1]
         if second_prob >= 0.25:
             correct.append(second_action)
-    return correct
+    return tuple(correct)
 
 
 # ================================================================
@@ -171,8 +222,8 @@ def get_correct_actions(strategy):
 _DATA_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'strategies.json')
 
 if os.path.exists(_DATA_PATH):
-    with open(_DATA_PATH) as _f:
-        _SOLVED = json.load(_f)
+    with open(_DATA_PATH, 'rb') as _f:
+        _SOLVED = _json.loads(_f.read())
 
     _strats = _SOLVED.get('strategies', {})
 
@@ -191,3 +242,15 @@ if os.path.exists(_DATA_PATH):
             bkt, strat = bkt_strat
             if strat and len(strat) > 0:
                 FACING_BET[(tex, bkt)] = strat
+
+
+def _build_strategy_arrays():
+    """[tex_idx][bkt_idx] views of the final (post-JSON) strategy tables."""
+    from engine.abstraction import BUCKETS, BUCKET_IDS
+    oop = [[OOP_STRATEGY[('OOP', tex, bkt)] for bkt in BUCKETS] for tex in TEXTURES]
+    ip = [[IP_VS_CHECK[('IP', tex, bkt)] for bkt in BUCKETS] for tex in TEXTURES]
+    fb = [[FACING_BET[(tex, bkt)] for bkt in BUCKETS] for tex in TEXTURES]
+    return oop, ip, fb, BUCKET_IDS
+
+
+_OOP_ARR, _IP_ARR, _FB_ARR, _BUCKET_IDS = _build_strategy_arrays()
@@ -0,0 +1,70 @@
+"""Batched card dealing and hand ranking for the Monte Carlo solvers.
+
+One NumPy call shuffles a whole block of decks, replacing a treys Deck()
+(a Python-level 52-card shuffle) per sample; another ranks a whole block
+of hands, replacing a treys evaluate() call per hand.
+"""
+
+from itertools import combinations
+
+import numpy as np
+from treys import Deck
+
+from engine.cards import EVALUATOR
+
+DECK52 = np.array(Deck.GetFullDeck(), dtype=np.int64)
+
+# treys suit bit (1, 2, 4, 8) -> 0-3
+_SUIT_INDEX = np.array([0, 0, 1, 0, 2, 0, 0, 0, 3])
+
+
+def _five_card_lookup():
+    """treys' flush/unsuited 5-card tables as one sorted array pair.
+
+    Keyed by prime product * 2 + flush flag: the flush table keys are the
+    rank primes multiplied together too, so one key space covers both.
+    """
+    table = EVALUATOR.table
+    keys = ([p * 2 + 1 for p in table.flush_lookup]
+            + [p * 2 for p in table.unsuited_lookup])
+    ranks = list(table.flush_lookup.values()) + list(table.unsuited_lookup.values())
+    order = np.argsort(keys)
+    return np.array(keys, dtype=np.int64)[order], np.array(ranks, dtype=np.int64)[order]
+
+
+_LOOKUP_KEYS, _LOOKUP_RANKS = _five_card_lookup()
+
+
+def deal_batch(n, n_cards=9, rng=None):
+    """Deal n rows of n_cards distinct treys card ints, a fresh deck per row."""
+    if rng is None:
+        rng = np.random.default_rng()
+    decks = rng.permuted(np.broadcast_to(DECK52, (n, 52)), axis=1)
+    return decks[:, :n_cards]
+
+
+def iter_deals(n_cards, rng=None, batch=4096):
+    """Endless stream of n_cards-card deals (lists of ints), dealt in batches."""
+    if rng is None:
+        rng = np.random.default_rng()
+    while True:
+        yield from deal_batch(batch, n_cards, rng).tolist()
+
+
+def card_indices(cards):
+    """Dense 0-51 index (rank * 4 + suit) of each treys card int in an array."""
+    cards = np.asarray(cards, dtype=np.int64)
+    return ((cards >> 8) & 0xF) * 4 + _SUIT_INDEX[(cards >> 12) & 0xF]
+
+
+def rank_batch(cards):
+    """treys rank (1 = royal flush ... 7462) of each row of 5-7 treys card ints.
+
+    Same result as EVALUATOR.evaluate per row: every 5-card subset of every
+    row is looked up at once and the best (lowest) rank kept.
+    """
+    cards = np.asarray(cards, dtype=np.int64)
+    subsets = cards[:, list(combinations(range(cards.shape[1]), 5))]
+    flush = (np.bitwise_and.reduce(subsets, axis=2) & 0xF000) != 0
+    keys = np.prod(subsets & 0xFF, axis=2) * 2 + flush
+    return _LOOKUP_RANKS[np.searchsorted(_LOOKUP_KEYS, keys)].min(axis=1)
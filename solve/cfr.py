@@ -18,6 +18,14 @@ RAISE = 'raise'
 BET_SIZES = {BET_S: 0.33, BET_M: 0.66, BET_L: 1.0}
 RAISE_MULT = 2.5  # raise = 2.5x the bet
 
+INITIAL_POT = 1.0  # normalized pot
+BLIND = 0.5        # each player's share of the initial pot
+
+# Node kinds in the flattened tree
+INTERIOR = 0
+SHOWDOWN = 1
+FOLDED = 2
+
 # Players
 OOP = 0  # out of position (acts first)
 IP = 1   # in position
@@ -25,39 +33,210 @@ IP = 1   # in position
 N_BUCKETS = len(BUCKETS)
 
 
+# -- Game tree rules, on tuples of actions --
+def _acting_player(history):
+    """Who acts next given the history."""
+    if len(history) == 0:
+        return OOP  # OOP acts first
+
+    if len(history) == 1:
+        # OOP acted, now IP's turn
+        return IP
+
+    if len(history) == 2:
+        # OOP acted, IP acted
+        first, second = history
+        if first == CHECK:
+            # OOP checked, IP acted
+            if second in (BET_S, BET_M, BET_L):
+                return OOP  # OOP faces bet
+            # IP checked → showdown (handled elsewhere)
+        else:
+            # OOP bet, IP responded
+            if second == RAISE:
+                return OOP  # OOP faces raise
+            # fold/call → terminal
+
+    if len(history) == 3:
+        # Three actions deep
+        first, second, third = history
+        if first == CHECK and second in (BET_S, BET_M, BET_L):
+            # OOP checked, IP bet, OOP responded
+            if third == RAISE:
+                return IP  # IP faces raise
+        # OOP bet, IP raised, OOP responded — terminal
+
+    # Default (shouldn't reach here for valid histories)
+    return OOP
+
+
+def _get_actions(history):
+    """Return available actions, or None if terminal/showdown."""
+    if _is_showdown(history):
+        return None
+
+    n = len(history)
+
+    if n == 0:
+        # OOP acts first
+        return [CHECK, BET_S, BET_M, BET_L]
+
+    if n == 1:
+        first = history[0]
+        if first == CHECK:
+            # IP acts after check
+            return [CHECK, BET_S, BET_M, BET_L]
+        else:
+            # IP faces OOP bet
+            return [FOLD, CALL, RAISE]
+
+    if n == 2:
+        first, second = history
+        if first == CHECK and second in (BET_S, BET_M, BET_L):
+            # OOP faces IP bet after check-bet
+            return [FOLD, CALL, RAISE]
+        if first in (BET_S, BET_M, BET_L) and second == RAISE:
+            # OOP faces raise after bet-raise
+            return [FOLD, CALL]
+
+    if n == 3:
+        first, second, third = history
+        if first == CHECK and second in (BET_S, BET_M, BET_L) and third == RAISE:
+            # IP faces raise after check-bet-raise
+            return [FOLD, CALL]
+
+    return None  # Terminal
+
+
+def _is_showdown(history):
+    """Check if history reaches showdown."""
+    n = len(history)
+    if n < 2:
+        return False
+
+    if n == 2:
+        first, second = history
+        if first == CHECK and second == CHECK:
+            return True
+        if first in (BET_S, BET_M, BET_L) and second == CALL:
+            return True
+        return False
+
+    if n == 3:
+        first, second, third = history
+        if first == CHECK and second in (BET_S, BET_M, BET_L) and third == CALL:
+            return True
+        if first in (BET_S, BET_M, BET_L) and second == RAISE and third == CALL:
+            return True
+        return False
+
+    if n == 4:
+        first, second, third, fourth = history
+        if (first == CHECK and second in (BET_S, BET_M, BET_L)
+                and third == RAISE and fourth == CALL):
+            return True
+        return False
+
+    return False
+
+
+# -- Packed histories --
+# A history packs into one int: a 3-bit code per action (1-7, so an empty
+# slot reads 0), first action in the top slot, and the depth above the 12
+# action bits. The traversal branches on table lookups by packed history.
+ACTIONS = (CHECK, BET_S, BET_M, BET_L, FOLD, CALL, RAISE)
+ACTION_CODE = {a: i + 1 for i, a in enumerate(ACTIONS)}
+MAX_DEPTH = 4
+ROOT = 0  # the empty history
+
+
+def pack_history(history):
+    """Pack a tuple of actions into its int form."""
+    hist = ROOT
+    for depth, action in enumerate(history):
+        hist += (ACTION_CODE[action] << (9 - 3 * depth)) + (1 << 12)
+    return hist
+
+
+def unpack_history(hist):
+    """Inverse of pack_history."""
+    return tuple(ACTIONS[((hist >> (9 - 3 * i)) & 7) - 1]
+                 for i in range(hist >> 12))
+
+
+def _build_history_tables():
+    """Walk the game tree once, tabulating the rules above per packed history."""
+    size = (MAX_DEPTH + 1) << 12
+    actions_at = [None] * size   # available actions, None if terminal
+    children = [None] * size     # packed child history per action
+    acting = [OOP] * size
+    showdown = [False] * size
+    stack = [()]
+    while stack:
+        history = stack.pop()
+        hist = pack_history(history)
+        showdown[hist] = _is_showdown(history)
+        actions = _get_actions(history)
+        if actions is None:
+            continue
+        actions_at[hist] = actions
+        acting[hist] = _acting_player(history)
+        children[hist] = tuple(pack_history(history + (a,)) for a in actions)
+        stack.extend(history + (a,) for a in actions)
+    return actions_at, children, acting, showdown
+
+
+_ACTIONS_AT, _CHILDREN, _ACTING, _SHOWDOWN = _build_history_tables()
+
+
 class InfoSet:
-    """One information set: (player, bucket, action_history).
+    """One decision node for one player: (player, packed action history).
 
-    Stores cumulative regrets and strategy sums for CFR+.
+    Stores cumulative regrets and strategy sums for CFR+, one row per bucket
+    of the acting player, so a traversal can update every bucket at once.
     """
 
     def __init__(self, actions):
         self.n_actions = len(actions)
         self.actions = actions
-        self.cumulative_regret = np.zeros(self.n_actions)
-        self.strategy_sum = np.zeros(self.n_actions)
+        self.cumulative_regret = np.zeros((N_BUCKETS, self.n_actions))
+        self.strategy_sum = np.zeros((N_BUCKETS, self.n_actions))
+        self._uniform = 1.0 / self.n_actions
+        self._strategy = np.empty((N_BUCKETS, self.n_actions))  # scratch
 
     def get_strategy(self):
-        """Regret-matching: normalize positive regrets into a strategy."""
-        positive = np.maximum(self.cumulative_regret, 0)
-        total = positive.sum()
-        if total > 0:
-            return positive / total
-        else:
-            return np.ones(self.n_actions) / self.n_actions
+        """Regret-matching: normalize positive regrets into a strategy.
+
+        Returns one row per bucket, in a buffer the next call overwrites.
+        """
+        positive = np.maximum(self.cumulative_regret, 0, out=self._strategy)
+        total = positive.sum(1, keepdims=True)
+        np.divide(positive, total, out=positive, where=total > 0)
+        positive[total[:, 0] == 0] = self._uniform
+        return positive
 
     def get_average_strategy(self):
-        """Average strategy over all iterations (the Nash equilibrium output)."""
-        total = self.strategy_sum.sum()
-        if total > 0:
-            avg = self.strategy_sum / total
-            # Clean up tiny values
-            avg[avg < 0.005] = 0
-            total2 = avg.sum()
-            if total2 > 0:
-                return avg / total2
-            return np.ones(self.n_actions) / self.n_actions
-        return np.ones(self.n_actions) / self.n_actions
+        """Average strategy over all iterations (the Nash equilibrium output).
+
+        One row per bucket; rows never reached stay uniform.
+        """
+        return _average_strategy(self.strategy_sum)
+
+
+def _average_strategy(strategy_sum):
+    """Normalize strategy sums along the last axis, dropping tiny frequencies.
+
+    Works on one InfoSet's (N_BUCKETS, n_actions) sums or on a stack of
+    them; all-zero rows come back uniform.
+    """
+    uniform = 1.0 / strategy_sum.shape[-1]
+    total = strategy_sum.sum(-1, keepdims=True)
+    avg = np.divide(strategy_sum, total,
+                    out=np.full_like(strategy_sum, uniform), where=total > 0)
+    # Clean up tiny values
+    avg[avg < 0.005] = 0
+    total = avg.sum(-1, keepdims=True)
+    return np.divide(avg, total, out=np.full_like(avg, uniform), where=total > 0)
 
 
 class CFRSolver:
@@ -87,141 +266,158 @@ class CFRSolver:
             equity_matrix: {hero_bkt: {villain_bkt: equity}}
             bucket_probs: {bucket: probability}
         """
-        self.equity = equity_matrix  # [hero_bkt][villain_bkt] = P(hero wins)
+        # [hero_idx, villain_idx] = P(hero wins); a showdown reads one column
+        self.equity = np.array(
+            [[equity_matrix[h][v] for v in BUCKETS] for h in BUCKETS])
         self.bucket_probs = bucket_probs  # P(each bucket)
-        self.info_sets = {}  # key -> InfoSet
+        self.info_sets = {}  # (player, packed history) -> InfoSet
+        self.active_buckets = np.array([], dtype=int)  # set by train()
+        self.active_probs = np.array([])
+        self._build_tree()
 
-    def _get_info_set(self, player, bucket_idx, history, actions):
+    def _get_info_set(self, player, hist, actions):
         """Get or create an info set."""
-        key = (player, bucket_idx, history)
+        key = (player, hist)
         if key not in self.info_sets:
             self.info_sets[key] = InfoSet(actions)
         return self.info_sets[key]
 
-    def _showdown_value(self, hero_bkt_idx, villain_bkt_idx, pot, hero_invested):
-        """Expected value for hero at showdown."""
-        hero_bkt = BUCKETS[hero_bkt_idx]
-        vill_bkt = BUCKETS[villain_bkt_idx]
-        eq = self.equity[hero_bkt][vill_bkt]
-        return pot * eq - hero_invested
+    def _build_tree(self):
+        """Flatten the game tree, breadth-first, into per-node arrays.
 
-    def _cfr(self, history, opp_bucket_idx, hero_bucket_idx,
-             player, pot, oop_invested, ip_invested,
-             reach_opp, iteration):
-        """Recursive CFR+ traversal.
+        None of it depends on the iteration: pots, investments, terminal
+        kinds and fold payoffs are worked out here once. A node's children
+        are contiguous, node_children[n] = (start, end), and always come
+        after it, so a reversed sweep visits children before parents.
+        """
+        hists = [ROOT]
+        pots = [INITIAL_POT]
+        oop_inv = [BLIND]
+        ip_inv = [BLIND]
+        kinds = [INTERIOR]
+        folder = [None]
+        self.node_children = []
+        self.node_acting = []
+        self.node_info_set = []
+        self.decision_nodes = []
+
+        node = 0
+        while node < len(hists):
+            hist = hists[node]
+            actions = _ACTIONS_AT[hist] if kinds[node] == INTERIOR else None
+            if actions is None:
+                self.node_children.append(None)
+                self.node_acting.append(None)
+                self.node_info_set.append(None)
+                node += 1
+                continue
 
-        We traverse for one player at a time (external sampling style).
-        The traversing player's strategy is used to compute counterfactual values.
+            acting_player = _ACTING[hist]
+            self.decision_nodes.append(node)
+            self.node_acting.append(acting_player)
+            self.node_info_set.append(
+                self._get_info_set(acting_player, hist, actions))
+            self.node_children.append((len(hists), len(hists) + len(actions)))
+
+            for action, child in zip(actions, _CHILDREN[hist]):
+                new_pot, new_oop_inv, new_ip_inv, terminal_value = \
+                    self._apply_action(action, hist, pots[node], oop_inv[node],
+                                       ip_inv[node], acting_player)
+                hists.append(child)
+                pots.append(new_pot)
+                oop_inv.append(new_oop_inv)
+                ip_inv.append(new_ip_inv)
+                if terminal_value is not None:
+                    kinds.append(FOLDED)
+                    folder.append(acting_player)
+                elif _SHOWDOWN[child]:
+                    kinds.append(SHOWDOWN)
+                    folder.append(None)
+                else:
+                    kinds.append(INTERIOR)
+                    folder.append(None)
+            node += 1
+
+        self.n_nodes = len(hists)
+        self.node_pot = np.array(pots)
+        # Investment per node, indexed by player
+        self.node_invested = (np.array(oop_inv), np.array(ip_inv))
+        kinds = np.array(kinds)
+        self.showdown_nodes = np.flatnonzero(kinds == SHOWDOWN)
+        self.fold_nodes = np.flatnonzero(kinds == FOLDED)
+        # Fold payoff per fold node, indexed by traversing player
+        self.fold_values = tuple(
+            np.array([self._terminal_fold_value(FOLD, folder[n], player, pots[n],
+                                                oop_inv[n], ip_inv[n])
+                      for n in self.fold_nodes])
+            for player in (OOP, IP))
+
+    def _traverse(self, player, opp_buckets, reach_opp):
+        """One vector-form CFR+ pass for one player against every opponent bucket.
+
+        Values are carried for all of the traversing player's buckets
+        against each opponent bucket at once, as an (N_BUCKETS, n_opp)
+        matrix per node. A top-down sweep fixes each decision node's
+        strategies and the opponent's reach; a bottom-up sweep computes
+        values from the leaves, summing the traverser's regrets over
+        opponent buckets and accumulating the opponent's strategy sums.
 
         Args:
-            history: tuple of actions taken so far
-            opp_bucket_idx: opponent's bucket index (known for traversal)
-            hero_bucket_idx: hero's bucket index
-            player: whose turn it is (OOP=0, IP=1)
-            pot: current pot size
-            oop_invested: how much OOP has put in
-            ip_invested: how much IP has put in
-            reach_opp: opponent's reach probability
-            iteration: current iteration number
+            player: the traversing player (OOP=0, IP=1)
+            opp_buckets: array of the opponent bucket indices to traverse
+            reach_opp: opponent's reach probability at the root, per bucket
 
         Returns:
-            Expected value for the traversing player (OOP)
+            Expected value for the traversing player, (N_BUCKETS, n_opp)
         """
-        # Determine available actions based on history
-        actions = self._get_actions(history)
-
-        if actions is None:
-            # Terminal: showdown
-            return self._showdown_value(
-                hero_bucket_idx=0,  # placeholder
-                villain_bkt_idx=0,
-                pot=pot,
-                hero_invested=oop_invested
-            )
-
-        # Determine which player is acting
-        acting_player = self._acting_player(history)
-        if acting_player == OOP:
-            acting_bkt_idx = hero_bucket_idx if player == OOP else opp_bucket_idx
-        else:
-            acting_bkt_idx = hero_bucket_idx if player == IP else opp_bucket_idx
-
-        is_traversing = (acting_player == player)
-
-        info_set = self._get_info_set(acting_player, acting_bkt_idx, history, actions)
-        strategy = info_set.get_strategy()
-
-        action_values = np.zeros(len(actions))
-        node_value = 0.0
-
-        for i, action in enumerate(actions):
-            new_history = history + (action,)
-            new_pot, new_oop_inv, new_ip_inv, terminal_value = \
-                self._apply_action(action, history, pot, oop_invested, ip_invested, acting_player)
-
-            if terminal_value is not None:
-                # Terminal: fold
-                if acting_player == OOP:
-                    # OOP folded → IP wins. Value for OOP = -oop_invested
-                    if action == FOLD:
-                        child_val = -oop_invested if player == OOP else -ip_invested
-                    else:
-                        child_val = terminal_value  # won't reach here
-                elif acting_player == IP:
-                    if action == FOLD:
-                        child_val = new_pot - oop_invested if player == OOP else -ip_invested
-                    else:
-                        child_val = terminal_value
-
-                # Actually let me redo this more cleanly
-                child_val = self._terminal_fold_value(
-                    action, acting_player, player, pot, oop_invested, ip_invested
-                )
-            elif self._is_showdown(new_history):
-                # Showdown
-                if player == OOP:
-                    child_val = self._showdown_value(
-                        hero_bucket_idx, opp_bucket_idx,
-                        new_pot, new_oop_inv
-                    )
-                else:
-                    child_val = self._showdown_value(
-                        hero_bucket_idx, opp_bucket_idx,
-                        new_pot, new_ip_inv
-                    )
+        n_opp = len(opp_buckets)
+        values = np.empty((self.n_nodes, N_BUCKETS, n_opp))
+        showdown = self.showdown_nodes
+        values[showdown] = (self.node_pot[showdown, None, None]
+                            * self.equity[:, opp_buckets]
+                            - self.node_invested[player][showdown, None, None])
+        values[self.fold_nodes] = self.fold_values[player][:, None, None]
+
+        # Top-down: strategies, and the opponent's reach at each node
+        strategies = [None] * self.n_nodes
+        reach = np.empty((self.n_nodes, n_opp))
+        reach[0] = reach_opp
+        for node in self.decision_nodes:
+            start, end = self.node_children[node]
+            info_set = self.node_info_set[node]
+            if self.node_acting[node] == player:
+                strategies[node] = info_set.get_strategy()
+                reach[start:end] = reach[node]
             else:
-                # Recurse
-                if is_traversing:
-                    child_val = self._cfr(
-                        new_history, opp_bucket_idx, hero_bucket_idx,
-                        player, new_pot, new_oop_inv, new_ip_inv,
-                        reach_opp * strategy[i] if not is_traversing else reach_opp,
-                        iteration
-                    )
-                else:
-                    child_val = self._cfr(
-                        new_history, opp_bucket_idx, hero_bucket_idx,
-                        player, new_pot, new_oop_inv, new_ip_inv,
-                        reach_opp * strategy[i],
-                        iteration
-                    )
-
-            action_values[i] = child_val
-            node_value += strategy[i] * child_val
-
-        # Update regrets for traversing player only
-        if is_traversing:
-            for i in range(len(actions)):
-                regret = action_values[i] - node_value
+                strategy = info_set.get_strategy()[opp_buckets]  # (n_opp, n_actions)
+                strategies[node] = strategy
+                reach[start:end] = reach[node] * strategy.T
+
+        # Bottom-up: values, regrets and strategy sums
+        for node in reversed(self.decision_nodes):
+            start, end = self.node_children[node]
+            action_values = values[start:end]  # (n_actions, N_BUCKETS, n_opp)
+            info_set = self.node_info_set[node]
+            strategy = strategies[node]
+
+            if self.node_acting[node] == player:
+                node_value = np.einsum('ha,aho->ho', strategy, action_values)
+                # Regrets summed over opponent buckets, applied once per pass.
+                # Flooring the summed update (rather than after each opponent
+                # bucket) is a different CFR+ schedule and converges to
+                # different strategies than the per-opponent floor did.
+                regret = info_set.cumulative_regret
+                np.add(regret, (action_values - node_value).sum(2).T, out=regret)
                 # CFR+: floor regrets at 0
-                info_set.cumulative_regret[i] = max(
-                    info_set.cumulative_regret[i] + regret, 0
-                )
-        else:
-            # Accumulate strategy sum for averaging
-            info_set.strategy_sum += reach_opp * strategy
+                np.maximum(regret, 0, out=regret)
+            else:
+                node_value = np.einsum('oa,aho->ho', strategy, action_values)
+                # Accumulate strategy sum for averaging
+                info_set.strategy_sum[opp_buckets] += reach[node][:, None] * strategy
 
-        return node_value
+            values[node] = node_value
+
+        return values[0]
 
     def _terminal_fold_value(self, action, acting_player, traversing_player,
                              pot, oop_invested, ip_invested):
@@ -242,114 +438,7 @@ class CFRSolver:
             else:
                 return -ip_invested
 
-    def _acting_player(self, history):
-        """Who acts next given the history."""
-        if len(history) == 0:
-            return OOP  # OOP acts first
-
-        last = history[-1]
-
-        if len(history) == 1:
-            # OOP acted, now IP's turn
-            return IP
-
-        if len(history) == 2:
-            # OOP acted, IP acted
-            first, second = history
-            if first == CHECK:
-                # OOP checked, IP acted
-                if second in (BET_S, BET_M, BET_L):
-                    return OOP  # OOP faces bet
-                # IP checked → showdown (handled elsewhere)
-            else:
-                # OOP bet, IP responded
-                if second == RAISE:
-                    return OOP  # OOP faces raise
-                # fold/call → terminal
-
-        if len(history) == 3:
-            # Three actions deep
-            first, second, third = history
-            if first == CHECK and second in (BET_S, BET_M, BET_L):
-                # OOP checked, IP bet, OOP responded
-                if third == RAISE:
-                    return IP  # IP faces raise
-            elif first in (BET_S, BET_M, BET_L) and second == RAISE:
-                # OOP bet, IP raised, OOP responded — terminal
-                pass
-
-        # Default (shouldn't reach here for valid histories)
-        return OOP
-
-    def _get_actions(self, history):
-        """Return available actions, or None if terminal/showdown."""
-        if self._is_showdown(history):
-            return None
-
-        n = len(history)
-
-        if n == 0:
-            # OOP acts first
-            return [CHECK, BET_S, BET_M, BET_L]
-
-        if n == 1:
-            first = history[0]
-            if first == CHECK:
-                # IP acts after check
-                return [CHECK, BET_S, BET_M, BET_L]
-            else:
-                # IP faces OOP bet
-                return [FOLD, CALL, RAISE]
-
-        if n == 2:
-            first, second = history
-            if first == CHECK and second in (BET_S, BET_M, BET_L):
-                # OOP faces IP bet after check-bet
-                return [FOLD, CALL, RAISE]
-            if first in (BET_S, BET_M, BET_L) and second == RAISE:
-                # OOP faces raise after bet-raise
-                return [FOLD, CALL]
-
-        if n == 3:
-            first, second, third = history
-            if first == CHECK and second in (BET_S, BET_M, BET_L) and third == RAISE:
-                # IP faces raise after check-bet-raise
-                return [FOLD, CALL]
-
-        return None  # Terminal
-
-    def _is_showdown(self, history):
-        """Check if history reaches showdown."""
-        n = len(history)
-        if n < 2:
-            return False
-
-        if n == 2:
-            first, second = history
-            if first == CHECK and second == CHECK:
-                return True
-            if first in (BET_S, BET_M, BET_L) and second == CALL:
-                return True
-            return False
-
-        if n == 3:
-            first, second, third = history
-            if first == CHECK and second in (BET_S, BET_M, BET_L) and third == CALL:
-                return True
-            if first in (BET_S, BET_M, BET_L) and second == RAISE and third == CALL:
-                return True
-            return False
-
-        if n == 4:
-            first, second, third, fourth = history
-            if (first == CHECK and second in (BET_S, BET_M, BET_L)
-                    and third == RAISE and fourth == CALL):
-                return True
-            return False
-
-        return False
-
-    def _apply_action(self, action, history, pot, oop_invested, ip_invested, acting_player):
+    def _apply_action(self, action, hist, pot, oop_invested, ip_invested, acting_player):
         """Apply action, return (new_pot, new_oop_inv, new_ip_inv, terminal_value).
 
         terminal_value is not None only for fold actions.
@@ -384,7 +473,7 @@ class CFRSolver:
         if action == RAISE:
             # Find the last bet amount
             last_bet_action = None
-            for h in reversed(history):
+            for h in reversed(unpack_history(hist)):
                 if h in (BET_S, BET_M, BET_L):
                     last_bet_action = h
                     break
@@ -418,44 +507,16 @@ class CFRSolver:
         if total > 0:
             bucket_prob_array /= total
 
-        initial_pot = 1.0  # normalized pot
+        # Buckets that can actually occur on this texture, found once
+        self.active_buckets = np.flatnonzero(bucket_prob_array >= 1e-6)
+        self.active_probs = bucket_prob_array[self.active_buckets]
 
         for t in range(n_iterations):
-            # For each pair of bucket assignments, traverse
-            for opp_idx in range(N_BUCKETS):
-                if bucket_prob_array[opp_idx] < 1e-6:
-                    continue
-                for hero_idx in range(N_BUCKETS):
-                    if bucket_prob_array[hero_idx] < 1e-6:
-                        continue
-
-                    reach = bucket_prob_array[opp_idx]
-
-                    # Traverse for OOP
-                    self._cfr(
-                        history=(),
-                        opp_bucket_idx=opp_idx,
-                        hero_bucket_idx=hero_idx,
-                        player=OOP,
-                        pot=initial_pot,
-                        oop_invested=0.5,  # blinds
-                        ip_invested=0.5,
-                        reach_opp=reach,
-                        iteration=t
-                    )
-
-                    # Traverse for IP
-                    self._cfr(
-                        history=(),
-                        opp_bucket_idx=hero_idx,  # swap roles
-                        hero_bucket_idx=opp_idx,
-                        player=IP,
-                        pot=initial_pot,
-                        oop_invested=0.5,
-                        ip_invested=0.5,
-                        reach_opp=bucket_prob_array[hero_idx],
-                        iteration=t
-                    )
+            # One pass per player covers every (hero, opponent) bucket pair;
+            # IP's pass already sees OOP's updated regrets. All hero buckets
+            # update against the same opponent strategy within a pass.
+            for player in (OOP, IP):
+                self._traverse(player, self.active_buckets, self.active_probs)
 
     def get_strategies(self):
         """Extract converged strategies organized by position and bucket.
@@ -472,37 +533,49 @@ class CFRSolver:
         # Key: bucket -> list of strategy dicts
         fb_collected = defaultdict(list)
 
-        for (player, bucket_idx, history), info_set in self.info_sets.items():
-            bucket = BUCKETS[bucket_idx]
-            avg = info_set.get_average_strategy()
-            strat = {}
-            for i, a in enumerate(info_set.actions):
-                if avg[i] > 0:
-                    strat[a] = round(float(avg[i]), 3)
-
-            if not strat:
-                continue
+        # Average all info sets with the same number of actions in one pass
+        groups = defaultdict(list)
+        for key, info_set in self.info_sets.items():
+            groups[info_set.n_actions].append(key)
+        averages = {}
+        for keys in groups.values():
+            stacked = np.stack([self.info_sets[k].strategy_sum for k in keys])
+            averages.update(zip(keys, _average_strategy(stacked).tolist()))
+
+        for (player, hist), info_set in self.info_sets.items():
+            history = unpack_history(hist)
+            avg_rows = averages[player, hist]
+            for bucket_idx in self.active_buckets.tolist():
+                bucket = BUCKETS[bucket_idx]
+                avg = avg_rows[bucket_idx]
+                strat = {}
+                for i, a in enumerate(info_set.actions):
+                    if avg[i] > 0:
+                        strat[a] = round(avg[i], 3)
+
+                if not strat:
+                    continue
 
-            # Normalize to sum to 1
-            total = sum(strat.values())
-            if total > 0:
-                strat = {a: round(v / total, 3) for a, v in strat.items()}
+                # Normalize to sum to 1
+                total = sum(strat.values())
+                if total > 0:
+                    strat = {a: round(v / total, 3) for a, v in strat.items()}
 
-            if player == OOP and history == ():
-                oop_first[bucket] = strat
+                if player == OOP and history == ():
+                    oop_first[bucket] = strat
 
-            elif player == IP and history == (CHECK,):
-                ip_vs_check[bucket] = strat
+                elif player == IP and history == (CHECK,):
+                    ip_vs_check[bucket] = strat
 
-            elif player == OOP and len(history) == 2:
-                first, second = history
-                if first == CHECK and second in (BET_S, BET_M, BET_L):
-                    fb_collected[bucket].append(strat)
+                elif player == OOP and len(history) == 2:
+                    first, second = history
+                    if first == CHECK and second in (BET_S, BET_M, BET_L):
+                        fb_collected[bucket].append(strat)
 
-            elif player == IP and len(history) == 1:
-                first = history[0]
-                if first in (BET_S, BET_M, BET_L):
-                    fb_collected[bucket].append(strat)
+                elif player == IP and len(history) == 1:
+                    first = history[0]
+                    if first in (BET_S, BET_M, BET_L):
+                        fb_collected[bucket].append(strat)
 
         # Average all facing-bet strategies per bucket, then normalize
         facing_bet = {}
@@ -2,18 +2,40 @@
 
 import random
 import time
-from collections import Counter, defaultdict
+from itertools import combinations, permutations
 from multiprocessing import Pool, cpu_count
 
-from treys import Card, Deck, Evaluator
+import numpy as np
 
-from engine.abstraction import classify_hand, BUCKETS
-from engine.postflop import classify_texture, TEXTURES
+from engine.abstraction import classify_hand, classify_range, BUCKETS, BUCKET_IDS
+from engine.postflop import classify_texture, TEXTURES, TEXTURE_IDS
+from engine.sim_batch import DECK52, card_indices, deal_batch, rank_batch
 
+N_BUCKETS = len(BUCKETS)
 
-def _make_evaluator():
-    """Each worker process needs its own Evaluator instance."""
-    return Evaluator()
+# Decks shuffled per NumPy call in the equity worker
+_DEAL_BATCH = 4096
+
+
+def _board_codes(boards):
+    """Texture-table index of each row of an (n, 3) treys-int board array."""
+    idx = card_indices(boards)
+    return (idx[:, 0] * 52 + idx[:, 1]) * 52 + idx[:, 2]
+
+
+def _build_texture_table():
+    """TEXTURE_IDS code of every flop, stored under all 6 card orders."""
+    boards = np.array(list(combinations(DECK52.tolist(), 3)))
+    textures = np.array([TEXTURE_IDS[classify_texture(b)] for b in boards.tolist()],
+                        dtype=np.uint8)
+    table = np.zeros(52 ** 3, dtype=np.uint8)
+    for order in permutations(range(3)):
+        table[_board_codes(boards[:, order])] = textures
+    return table
+
+
+# Flop texture by _board_codes: one array read instead of classify_texture
+TEXTURE_TABLE = _build_texture_table()
 
 
 def compute_bucket_probs(n_samples=50_000):
@@ -25,25 +47,26 @@ def compute_bucket_probs(n_samples=50_000):
     print(f"  Computing bucket distributions ({n_samples:,} samples)...")
     t0 = time.time()
 
-    counts = {tex: Counter() for tex in TEXTURES}
-    tex_totals = Counter()
-
-    for _ in range(n_samples):
-        deck = Deck()
-        hand = deck.draw(2)
-        board = deck.draw(3)
-        tex = classify_texture(board)
-        bkt = classify_hand(hand, board, tex)
-        counts[tex][bkt] += 1
-        tex_totals[tex] += 1
+    # Bucket count per (texture, bucket), from one bincount over flat codes
+    rng = np.random.default_rng()
+    codes = []
+    for start in range(0, n_samples, _DEAL_BATCH):
+        cards = deal_batch(min(_DEAL_BATCH, n_samples - start), 5, rng)
+        tex_ids = TEXTURE_TABLE[_board_codes(cards[:, 2:])].tolist()
+        for row, tex_id in zip(cards.tolist(), tex_ids):
+            bkt = classify_hand(row[:2], row[2:], TEXTURES[tex_id])
+            codes.append(tex_id * N_BUCKETS + BUCKET_IDS[bkt])
+    counts = np.bincount(codes, minlength=len(TEXTURES) * N_BUCKETS)
+    counts = counts.reshape(len(TEXTURES), N_BUCKETS)
+    tex_totals = counts.sum(1)
 
     probs = {}
-    for tex in TEXTURES:
-        total = tex_totals[tex]
+    for tex_id, tex in enumerate(TEXTURES):
+        total = tex_totals[tex_id]
         if total == 0:
             probs[tex] = {b: 1.0 / len(BUCKETS) for b in BUCKETS}
         else:
-            probs[tex] = {b: counts[tex][b] / total for b in BUCKETS}
+            probs[tex] = dict(zip(BUCKETS, (counts[tex_id] / total).tolist()))
 
     elapsed = time.time() - t0
     print(f"  Done in {elapsed:.1f}s")
@@ -60,108 +83,71 @@ def compute_bucket_probs(n_samples=50_000):
     return probs
 
 
+# Hands dealt per matching board, every pair of them scored as a matchup:
+# the 30:1 board rejection is paid once per 28 matchups
+_HANDS_PER_BOARD = 8
+# Deal layout: board (0-2), turn/river (3-4), then the hands two cards each
+_DEAL_CARDS = 5 + 2 * _HANDS_PER_BOARD
+_HAND_COLS = tuple((5 + 2 * i, 6 + 2 * i) for i in range(_HANDS_PER_BOARD))
+# Per board, the 7 cards each hand plays: board, turn/river, then the hand
+_SEVEN_COLS = [[0, 1, 2, 3, 4, c0, c1] for c0, c1 in _HAND_COLS]
+# Hand pairs scored on each board, as two index arrays
+_PAIR_A, _PAIR_B = np.array(list(combinations(range(_HANDS_PER_BOARD), 2))).T
+
+
 def _equity_worker(args):
     """Worker: compute equity matchups for one texture.
 
-    Strategy: deal random 10-card chunks from a deck. First 3 are the board.
-    If board matches target texture, use cards 4-5 as hand1, 6-7 as hand2,
-    8-9 as turn+river. This avoids multiple Deck() instantiations per sample.
-    For each matching board, run multiple hand pairs to maximize data.
+    Strategy: deal random 21-card chunks, shuffled in NumPy batches. First 3
+    are the board. If board matches target texture, cards 4-5 are the
+    turn+river and the rest are 8 hands; every pair of those hands is a
+    matchup, maximizing data per qualifying board. The matching boards of a
+    batch are ranked and tallied together, into dense
+    [hero_idx, villain_idx] arrays.
     """
     texture, n_matchups, seed = args
-    random.seed(seed)
-    evaluator = _make_evaluator()
+    rng = np.random.default_rng(seed)
 
-    ALL_CARDS = list(range(52))  # treys uses 0-51? No, treys uses special ints
-
-    wins = defaultdict(lambda: defaultdict(float))
-    totals = defaultdict(lambda: defaultdict(int))
+    # [hero_idx, villain_idx]; a tie is half a win for each side
+    wins = np.zeros((N_BUCKETS, N_BUCKETS))
+    totals = np.zeros((N_BUCKETS, N_BUCKETS), dtype=np.int64)
 
     matchups_done = 0
     max_attempts = n_matchups * 30
-
-    for _ in range(max_attempts):
-        if matchups_done >= n_matchups:
-            break
-
-        deck = Deck()
-        # Draw board + 2 hands + turn/river = 9 cards
-        cards = deck.draw(9)
-        board = cards[:3]
-        tex = classify_texture(board)
-
-        if tex != texture:
+    dealt = 0
+
+    while matchups_done < n_matchups and dealt < max_attempts:
+        cards = deal_batch(_DEAL_BATCH, _DEAL_CARDS, rng)[:max_attempts - dealt]
+        dealt += len(cards)
+
+        matching = np.flatnonzero(
+            TEXTURE_TABLE[_board_codes(cards[:, :3])] == TEXTURE_IDS[texture])
+        # Each board yields len(_PAIR_A) matchups; stop once we have enough
+        n_boards = -(-(n_matchups - matchups_done) // len(_PAIR_A))
+        cards = cards[matching[:n_boards]]
+        if not len(cards):
             continue
 
-        hand1 = cards[3:5]
-        hand2 = cards[5:7]
-        turn_river = cards[7:9]
-        full_board = board + turn_river
+        # One 7-card row per (board, hand): board + turn/river, then the hand
+        seven = cards[:, _SEVEN_COLS].reshape(-1, 7)
+        scores = rank_batch(seven).reshape(len(cards), _HANDS_PER_BOARD)
 
-        bkt1 = classify_hand(hand1, board, tex)
-        bkt2 = classify_hand(hand2, board, tex)
+        bkts = np.array([
+            [BUCKET_IDS[b] for b in classify_range(
+                row[:3], [row[c0:c1 + 1] for c0, c1 in _HAND_COLS], texture)]
+            for row in cards.tolist()])
 
-        score1 = evaluator.evaluate(full_board, hand1)
-        score2 = evaluator.evaluate(full_board, hand2)
+        # Every pairing on every board at once: (n_boards, n_pairs) arrays
+        ba, bb = bkts[:, _PAIR_A], bkts[:, _PAIR_B]
+        sa, sb = scores[:, _PAIR_A], scores[:, _PAIR_B]
+        tie = 0.5 * (sa == sb)
+        np.add.at(wins, (ba, bb), (sa < sb) + tie)
+        np.add.at(wins, (bb, ba), (sa > sb) + tie)
+        np.add.at(totals, (ba, bb), 1)
+        np.add.at(totals, (bb, ba), 1)
+        matchups_done += ba.size
 
-        if score1 < score2:
-            wins[bkt1][bkt2] += 1.0
-        elif score1 > score2:
-            wins[bkt2][bkt1] += 1.0
-        else:
-            wins[bkt1][bkt2] += 0.5
-            wins[bkt2][bkt1] += 0.5
-
-        totals[bkt1][bkt2] += 1
-        totals[bkt2][bkt1] += 1
-        matchups_done += 1
-
-        # Reuse this board for extra matchups with different hands
-        # Draw more hands from remaining deck for same board
-        remaining = deck.draw(4)
-        if len(remaining) >= 4:
-            hand3 = remaining[:2]
-            hand4 = remaining[2:4]
-
-            bkt3 = classify_hand(hand3, board, tex)
-            bkt4 = classify_hand(hand4, board, tex)
-
-            score3 = evaluator.evaluate(full_board, hand3)
-            score4 = evaluator.evaluate(full_board, hand4)
-
-            if score3 < score4:
-                wins[bkt3][bkt4] += 1.0
-            elif score3 > score4:
-                wins[bkt4][bkt3] += 1.0
-            else:
-                wins[bkt3][bkt4] += 0.5
-                wins[bkt4][bkt3] += 0.5
-
-            totals[bkt3][bkt4] += 1
-            totals[bkt4][bkt3] += 1
-            matchups_done += 1
-
-            # Cross matchups for more data
-            for ha, hb, ba, bb in [(hand1, hand3, bkt1, bkt3),
-                                    (hand1, hand4, bkt1, bkt4),
-                                    (hand2, hand3, bkt2, bkt3),
-                                    (hand2, hand4, bkt2, bkt4)]:
-                sa = evaluator.evaluate(full_board, ha)
-                sb = evaluator.evaluate(full_board, hb)
-                if sa < sb:
-                    wins[ba][bb] += 1.0
-                elif sa > sb:
-                    wins[bb][ba] += 1.0
-                else:
-                    wins[ba][bb] += 0.5
-                    wins[bb][ba] += 0.5
-                totals[ba][bb] += 1
-                totals[bb][ba] += 1
-                matchups_done += 1
-
-    # Convert defaultdicts to regular dicts for pickling
-    return texture, {k: dict(v) for k, v in wins.items()}, \
-           {k: dict(v) for k, v in totals.items()}, matchups_done
+    return texture, wins, totals, matchups_done
 
 
 def compute_equity_matrix(n_matchups_per_texture=30_000):
@@ -184,27 +170,18 @@ def compute_equity_matrix(n_matchups_per_texture=30_000):
     with Pool(n_workers) as pool:
         results = pool.map(_equity_worker, tasks)
 
+    # No data for a pair — use ordinal heuristic (buckets are strongest first)
+    idx = np.arange(N_BUCKETS)
+    heuristic = np.where(idx[:, None] < idx, 0.75,
+                         np.where(idx[:, None] > idx, 0.25, 0.50))
+
     equity_matrix = {}
-    for texture, wins_dict, totals_dict, n_done in results:
-        matrix = {}
-        for hero_bkt in BUCKETS:
-            matrix[hero_bkt] = {}
-            for vill_bkt in BUCKETS:
-                w = wins_dict.get(hero_bkt, {}).get(vill_bkt, 0)
-                t = totals_dict.get(hero_bkt, {}).get(vill_bkt, 0)
-                if t > 0:
-                    matrix[hero_bkt][vill_bkt] = w / t
-                else:
-                    # No data — use ordinal heuristic
-                    hero_idx = BUCKETS.index(hero_bkt)
-                    vill_idx = BUCKETS.index(vill_bkt)
-                    if hero_idx < vill_idx:
-                        matrix[hero_bkt][vill_bkt] = 0.75
-                    elif hero_idx > vill_idx:
-                        matrix[hero_bkt][vill_bkt] = 0.25
-                    else:
-                        matrix[hero_bkt][vill_bkt] = 0.50
-        equity_matrix[texture] = matrix
+    for texture, wins, totals, n_done in results:
+        matrix = np.where(totals > 0, wins / np.maximum(totals, 1), heuristic)
+        equity_matrix[texture] = {
+            hero_bkt: dict(zip(BUCKETS, row))
+            for hero_bkt, row in zip(BUCKETS, matrix.tolist())
+        }
         print(f"    {texture:12s}: {n_done:,} matchups computed")
 
     elapsed = time.time() - t0
@@ -1,20 +1,33 @@
 """Orchestrator: run equity → CFR → export JSON."""
 
+import argparse
+import hashlib
 import json
 import os
 import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import cpu_count
 
+import numpy as np
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; stdlib json writes the same data
+    orjson = None
+
+from engine import abstraction, postflop, sim_batch
 from engine.abstraction import BUCKETS
 from engine.postflop import TEXTURES, OOP_STRATEGY, IP_VS_CHECK, FACING_BET
+from solve import equity
 from solve.equity import compute_bucket_probs, compute_equity_matrix
-from solve.cfr import CFRSolver
+from solve.cfr import ACTIONS, CFRSolver
 
 
 DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'data')
 OUTPUT_PATH = os.path.join(DATA_DIR, 'strategies.json')
 
 
-def main():
+def main(verbose=False, force_equity=False):
     t_start = time.time()
     print("=" * 60)
     print("LiveGTO Solver — Pre-computation Pipeline")
@@ -23,43 +36,48 @@ def main():
     # Phase 1: Monte Carlo equity
     print("\n[Phase 1] Monte Carlo Equity Engine")
     print("-" * 40)
-    bucket_probs = compute_bucket_probs(n_samples=150_000)
-    equity_matrix = compute_equity_matrix(n_matchups_per_texture=100_000)
+    n_samples, n_matchups = 150_000, 100_000
+    cache_path = _equity_cache_path(n_samples, n_matchups)
+    if os.path.exists(cache_path) and not force_equity:
+        with open(cache_path, 'rb') as f:
+            cached = _loads(f.read())
+        bucket_probs, equity_matrix = cached['bucket_probs'], cached['equity_matrix']
+        print(f"  Loaded from {cache_path} (--force-equity to recompute)")
+    else:
+        bucket_probs = compute_bucket_probs(n_samples=n_samples)
+        equity_matrix = compute_equity_matrix(n_matchups_per_texture=n_matchups)
+        os.makedirs(DATA_DIR, exist_ok=True)
+        with open(cache_path, 'wb') as f:
+            f.write(_dumps({'bucket_probs': bucket_probs, 'equity_matrix': equity_matrix}))
 
     # Phase 2: CFR+ Solver
     print("\n[Phase 2] CFR+ Solver")
     print("-" * 40)
 
     n_iterations = 25_000
+    # Textures fill in as their solves finish; keep TEXTURES order for export
     all_strategies = {
-        'OOP': {},
-        'IP': {},
-        'FACING_BET': {},
+        key: dict.fromkeys(TEXTURES) for key in ('OOP', 'IP', 'FACING_BET')
     }
 
-    for tex in TEXTURES:
-        print(f"\n  Solving {tex}...")
-        t0 = time.time()
-
-        solver = CFRSolver(
-            equity_matrix=equity_matrix[tex],
-            bucket_probs=bucket_probs[tex],
-        )
-        solver.train(n_iterations=n_iterations)
-
-        oop_first, ip_vs_check, facing_bet = solver.get_strategies()
-
-        all_strategies['OOP'][tex] = {}
-        all_strategies['IP'][tex] = {}
-        all_strategies['FACING_BET'][tex] = {}
-
-        for bkt in BUCKETS:
-            all_strategies['OOP'][tex][bkt] = oop_first.get(bkt, {})
-            all_strategies['IP'][tex][bkt] = ip_vs_check.get(bkt, {})
-            all_strategies['FACING_BET'][tex][bkt] = facing_bet.get(bkt, {})
-
-        elapsed = time.time() - t0
-        print(f"    {tex} solved in {elapsed:.1f}s ({len(solver.info_sets)} info sets)")
+    n_workers = min(cpu_count(), len(TEXTURES))
+    print(f"  Solving {len(TEXTURES)} textures ({n_workers} workers)...")
+    with ProcessPoolExecutor(max_workers=n_workers) as pool:
+        futures = {
+            pool.submit(_solve_texture, equity_matrix[tex], bucket_probs[tex],
+                        n_iterations): tex
+            for tex in TEXTURES
+        }
+        for future in as_completed(futures):
+            tex = futures[future]
+            oop_first, ip_vs_check, facing_bet, n_info_sets, elapsed = future.result()
+
+            all_strategies['OOP'][tex] = {bkt: oop_first.get(bkt, {}) for bkt in BUCKETS}
+            all_strategies['IP'][tex] = {bkt: ip_vs_check.get(bkt, {}) for bkt in BUCKETS}
+            all_strategies['FACING_BET'][tex] = {bkt: facing_bet.get(bkt, {})
+                                                 for bkt in BUCKETS}
+
+            print(f"    {tex} solved in {elapsed:.1f}s ({n_info_sets} info sets)")
 
     # Phase 3: Export
     print("\n[Phase 3] Export")
@@ -71,13 +89,13 @@ def main():
         'buckets': BUCKETS,
         'textures': TEXTURES,
         'bucket_probs': bucket_probs,
-        'equity_matrix': equity_matrix,
+        'equity_matrix': _compact_equity(equity_matrix),
         'strategies': all_strategies,
     }
 
     os.makedirs(DATA_DIR, exist_ok=True)
-    with open(OUTPUT_PATH, 'w') as f:
-        json.dump(output, f, indent=2)
+    with open(OUTPUT_PATH, 'wb') as f:
+        f.write(_dumps(output))
 
     file_size = os.path.getsize(OUTPUT_PATH)
     print(f"  Written to {OUTPUT_PATH}")
@@ -87,42 +105,38 @@ def main():
     print("\n[Phase 4] Strategy Comparison (old hand-tuned vs CFR-solved)")
     print("-" * 40)
 
-    biggest_changes = []
-
-    for tex in TEXTURES:
-        for bkt in BUCKETS:
-            # OOP comparison
-            old_key = ('OOP', tex, bkt)
-            old_strat = OOP_STRATEGY.get(old_key, {})
-            new_strat = all_strategies['OOP'][tex].get(bkt, {})
-            diff = _strategy_diff(old_strat, new_strat)
-            if diff > 0.15:
-                biggest_changes.append(('OOP', tex, bkt, diff, old_strat, new_strat))
-
-            # IP comparison
-            old_key = ('IP', tex, bkt)
-            old_strat = IP_VS_CHECK.get(old_key, {})
-            new_strat = all_strategies['IP'][tex].get(bkt, {})
-            diff = _strategy_diff(old_strat, new_strat)
-            if diff > 0.15:
-                biggest_changes.append(('IP', tex, bkt, diff, old_strat, new_strat))
-
-            # FACING_BET comparison
-            old_key = (tex, bkt)
-            old_strat = FACING_BET.get(old_key, {})
-            new_strat = all_strategies['FACING_BET'][tex].get(bkt, {})
-            diff = _strategy_diff(old_strat, new_strat)
-            if diff > 0.15:
-                biggest_changes.append(('FACING', tex, bkt, diff, old_strat, new_strat))
-
-    biggest_changes.sort(key=lambda x: -x[3])
-
-    if biggest_changes:
-        print(f"  {len(biggest_changes)} strategies changed significantly (>15% diff):")
-        for ctx, tex, bkt, diff, old, new in biggest_changes[:20]:
-            print(f"\n    {ctx}/{tex}/{bkt} (diff={diff:.0%}):")
-            print(f"      OLD: {_fmt_strat(old)}")
-            print(f"      NEW: {_fmt_strat(new)}")
+    # One (cell, context, action) array per side; cells run texture-major so
+    # argwhere yields changes in the same order the per-cell loop did.
+    contexts = ('OOP', 'IP', 'FACING')
+    cells = [(tex, bkt) for tex in TEXTURES for bkt in BUCKETS]
+    old_strats = [
+        (OOP_STRATEGY.get(('OOP', tex, bkt), {}),
+         IP_VS_CHECK.get(('IP', tex, bkt), {}),
+         FACING_BET.get((tex, bkt), {}))
+        for tex, bkt in cells
+    ]
+    new_strats = [
+        tuple(all_strategies[key][tex].get(bkt, {})
+              for key in ('OOP', 'IP', 'FACING_BET'))
+        for tex, bkt in cells
+    ]
+    diffs = np.abs(_strategy_array(old_strats) - _strategy_array(new_strats)).sum(-1) / 2
+
+    # Only indices are kept; the top 20 look their dicts up when printed.
+    # A stable sort keeps ties in texture-major order.
+    changed = np.argwhere(diffs > 0.15)
+    top = changed[np.argsort(-diffs[tuple(changed.T)], kind='stable')[:20]]
+
+    if len(changed):
+        print(f"  {len(changed)} strategies changed significantly (>15% diff):")
+        if verbose:
+            lines = []
+            for i, c in top:
+                tex, bkt = cells[i]
+                lines.append(f"\n    {contexts[c]}/{tex}/{bkt} (diff={diffs[i, c]:.0%}):")
+                lines.append(f"      OLD: {_fmt_strat(old_strats[i][c])}")
+                lines.append(f"      NEW: {_fmt_strat(new_strats[i][c])}")
+            print('\n'.join(lines))
     else:
         print("  All strategies within 15% of hand-tuned values")
 
@@ -132,20 +146,84 @@ def main():
     print(f"{'=' * 60}")
 
 
-def _strategy_diff(old, new):
-    """Total absolute difference between two strategy dicts."""
-    all_actions = set(list(old.keys()) + list(new.keys()))
-    return sum(abs(old.get(a, 0) - new.get(a, 0)) for a in all_actions) / 2
+def _compact_equity(equity_matrix, digits=4):
+    """equity_matrix with every entry rounded for export.
+
+    The web app and archive range analysis read it from strategies.json and
+    show equity to 0.1%, so full float repr only inflates the file.
+    """
+    return {
+        tex: {hb: {vb: round(eq, digits) for vb, eq in row.items()}
+              for hb, row in matrix.items()}
+        for tex, matrix in equity_matrix.items()
+    }
+
+
+def _dumps(obj):
+    """Indented JSON bytes: one orjson call when available, else stdlib json."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(obj, indent=2).encode()
+
+
+def _loads(data):
+    """Parse JSON bytes: orjson when available, else stdlib json."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _equity_cache_path(n_samples, n_matchups):
+    """Phase 1 cache file for these sample sizes.
+
+    The key also covers the source of the modules that define buckets,
+    textures and the equity sampler, so editing any of them invalidates it.
+    """
+    h = hashlib.blake2b(repr((BUCKETS, TEXTURES, n_samples, n_matchups)).encode(),
+                        digest_size=8)
+    for module in (abstraction, postflop, sim_batch, equity):
+        with open(module.__file__, 'rb') as f:
+            h.update(f.read())
+    return os.path.join(DATA_DIR, f'equity_{h.hexdigest()}.json')
+
+
+def _solve_texture(equity_matrix, bucket_probs, n_iterations):
+    """Run CFR+ for one texture (module level, so worker processes can run it).
+
+    Returns:
+        (oop_first, ip_vs_check, facing_bet, info set count, seconds)
+    """
+    t0 = time.time()
+    solver = CFRSolver(
+        equity_matrix=equity_matrix,
+        bucket_probs=bucket_probs,
+    )
+    solver.train(n_iterations=n_iterations)
+    oop_first, ip_vs_check, facing_bet = solver.get_strategies()
+    n_info_sets = len(solver.info_sets) * len(solver.active_buckets)
+    return oop_first, ip_vs_check, facing_bet, n_info_sets, time.time() - t0
+
+
+def _strategy_array(strategies):
+    """Rows of strategy dicts -> float array with a trailing ACTIONS axis."""
+    return np.array([[[strat.get(a, 0) for a in ACTIONS] for strat in row]
+                     for row in strategies], dtype=np.float64)
 
 
 def _fmt_strat(strat):
     """Format strategy dict for printing."""
     parts = []
-    for action in ['check', 'bet_s', 'bet_m', 'bet_l', 'fold', 'call', 'raise']:
+    for action in ACTIONS:
         if action in strat and strat[action] > 0.005:
             parts.append(f"{action}={strat[action]:.0%}")
     return ' '.join(parts)
 
 
 if __name__ == '__main__':
-    main()
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--verbose', action='store_true',
+                        help='print the 20 biggest strategy changes in Phase 4')
+    parser.add_argument('--force-equity', action='store_true',
+                        help='recompute Phase 1 equity instead of loading the cache')
+    args = parser.parse_args()
+    main(verbose=args.verbose, force_equity=args.force_equity)